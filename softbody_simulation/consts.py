@@ -17,6 +17,42 @@ FONT = os.path.join(PROJECT_PATH, ASSETS_PATH, "minecraft.ttf")
 
 FPS = 60
 WIN_SIZE = 800, 600
+WORLD_SIZE = 2400, 1800  # sandbox world; the camera shows a WIN_SIZE part of it
+STATE_DTYPE = "float64"  # sandbox particle, spring and obstacle arrays; "float32" halves them
 
 GRAVITY = -9.81 * 20
 DRAG_THRESHOLD_MS = 200
+FIXED_DELTA_TIME = 1 / FPS
+MAX_STEPS_PER_FRAME = 4
+MAX_SUBSTEPS = 16  # per fixed step, when stiff and light springs need it
+STABILITY_SAFETY = 0.5  # fraction of the explicit stability limit actually used
+COMPUTE_BACKEND = "auto"  # "numpy", "numba", or "auto" for Numba when installed and valid
+BACKEND_TOLERANCE = 1e-6  # relative error a compiled backend may show against NumPy
+BODY_RESTITUTION = 0.5  # bounciness of contacts between separate soft bodies
+CONTACT_SKIN = 2  # distance a point may drift before its obstacle contacts are searched for again
+CONTACT_RESTING_SPEED = 30  # obstacle approaches slower than this settle instead of bouncing
+CONTACT_ITERATIONS = 4  # Gauss-Seidel sweeps over points touching several obstacle edges
+FIELD_RADIUS = 400  # reach of attractors and repulsors
+FIELD_SOFTENING = 30  # distance over which an attractor's pull is smoothed near its centre
+FIELD_STRENGTH = 4e6  # attractor strength placed in the sandbox, about 2g at 100 px
+WIND_REGION_SIZE = 600, 400  # wind regions placed in the sandbox
+WIND_VELOCITY = 300, 0
+WIND_RATE = 2  # per second; how quickly points take on the wind's velocity
+MODAL_MODES = 12  # vibration modes kept by reduced-order bodies
+MODAL_LATTICE = 16  # nodes per side of the coarse lattice larger bodies' modes are computed on
+SPRING_TEAR_STRAIN = 2.0  # with tearing on (T), springs stretched past (1 + this) times their rest length break
+WATCHDOG_SPIKE_FACTOR = 10  # energy growth over the last good level treated as a blow-up
+WATCHDOG_ENERGY_FLOOR = 1e4  # energy per unit mass always tolerated on top of that
+WATCHDOG_MAX_BOOST = 8  # largest substep multiplier the watchdog escalates to
+WATCHDOG_COOLDOWN = 600  # healthy energy checks (one per tick) before it is halved again
+
+SNAPSHOT_INTERVAL = 10  # ticks between snapshots
+SNAPSHOT_CAPACITY = 120  # snapshots kept for rewinding
+
+REPLAY_LOG_PATH = "sandbox_replay.json"
+
+TEMPLATE_CACHE_SIZE = 32  # body templates kept by the template registry
+SPATIAL_CELL_SIZE = 32  # grid cell size of the picking index, in pixels
+CAMERA_MAX_ZOOM = 4
+CAMERA_ZOOM_STEP = 1.1  # zoom factor per mouse wheel notch
+TEXT_CACHE_SIZE = 256  # rendered text surfaces kept by the UI text cache
@@ -1,4 +1,9 @@
 from .game_object import *
+from .selection import *
+from .incidence import *
+from .particle_store import *
+from .spring_store import *
 from .mass_point import *
 from .spring import *
 from .polygon_obstacle import *
+from .obstacle_store import *
@@ -0,0 +1,103 @@
+import numpy as np
+
+
+class IncidenceMatrix:
+    """Signed springs x points incidence matrix `B` of a spring graph, in CSR form.
+
+    Row `s` holds -1 at column `a[s]` and +1 at column `b[s]`, so `B @ x`
+    is `x[b] - x[a]` per spring and `B.T @ y` sums per-spring values onto
+    their endpoints. The transposed (points x springs) index is kept next to
+    it for per-point queries, built on first use.
+    """
+
+    def __init__(self, a: np.ndarray, b: np.ndarray, point_count: int):
+        springs = len(a)
+        self.shape = (springs, point_count)
+        self.indptr = np.arange(0, 2 * springs + 1, 2)
+        self.indices = np.stack((a, b), axis=1).ravel().astype(np.intp)
+        self.data = np.tile(np.array([-1.0, 1.0]), springs)
+        self._transpose: tuple[np.ndarray, np.ndarray] | None = None
+        self._scatter_keys: dict[int, np.ndarray] = {}
+
+    def swap_remove(self, holes: np.ndarray, sources: np.ndarray, count: int) -> None:
+        """Follow a swap-remove: rows `sources` move into `holes`, `count` rows remain."""
+        if self._transpose is not None:
+            # Renumber the transpose in place of an argsort: entries of removed
+            # springs drop out, moved springs take their hole's number
+            renumber = np.arange(self.shape[0])
+            renumber[count:] = -1
+            renumber[holes] = -1
+            renumber[sources] = holes
+            indptr, springs = self._transpose
+            springs = renumber[springs]
+            keep = springs >= 0
+            kept = np.zeros(len(keep) + 1, dtype=np.intp)
+            np.cumsum(keep, out=kept[1:])
+            self._transpose = kept[indptr], springs[keep]
+
+        rows = self.indices.reshape(-1, 2)
+        rows[holes] = rows[sources]
+        self.shape = (count, self.shape[1])
+        self.indptr = self.indptr[:count + 1]
+        self.indices = self.indices[:2 * count]
+        self.data = self.data[:2 * count]
+        self._scatter_keys.clear()
+
+    @property
+    def transpose(self) -> tuple[np.ndarray, np.ndarray]:
+        """`(indptr, indices)` of the points x springs transpose."""
+        if self._transpose is None:
+            # Entries sorted by point; entry `e` belongs to spring `e // 2`
+            order = np.argsort(self.indices, kind="stable")
+            indptr = np.zeros(self.shape[1] + 1, dtype=np.intp)
+            np.cumsum(np.bincount(self.indices, minlength=self.shape[1]), out=indptr[1:])
+            self._transpose = indptr, order // 2
+        return self._transpose
+
+    def dot(self, x: np.ndarray) -> np.ndarray:
+        """`B @ x` for `(points, ...)` values: the difference across each spring."""
+        return x[self.indices[1::2]] - x[self.indices[0::2]]
+
+    def transpose_dot(self, y: np.ndarray) -> np.ndarray:
+        """`B.T @ y` for `(springs,)` or `(springs, k)` values, as one bincount."""
+        columns = 1 if y.ndim == 1 else y.shape[1]
+        keys = self._scatter_keys.get(columns)
+        if keys is None:
+            # All `a` entries, then all `b` entries: ordered runs scatter faster
+            ends = np.concatenate((self.indices[0::2], self.indices[1::2]))
+            keys = (ends[:, None] * columns + np.arange(columns)).ravel()
+            self._scatter_keys[columns] = keys
+        # Every row is (-1, +1), so the weights are just -y and y
+        weights = np.empty((2, len(y), columns))
+        np.negative(y.reshape(len(y), columns), out=weights[0])
+        weights[1] = y.reshape(len(y), columns)
+        out = np.bincount(keys, weights.ravel(), self.shape[1] * columns)
+        return out if y.ndim == 1 else out.reshape(-1, columns)
+
+    def degree(self, weights=1.0) -> np.ndarray:
+        """Each point's summed spring weights: the diagonal of `B.T @ diag(weights) @ B`."""
+        weights = np.broadcast_to(weights, self.shape[:1])
+        return np.bincount(self.indices, np.repeat(weights, 2), self.shape[1])
+
+    def incident(self, point: int) -> np.ndarray:
+        """Springs attached to `point`: the nonzeros of column `point`."""
+        indptr, springs = self.transpose
+        return springs[indptr[point]:indptr[point + 1]]
+
+    def components(self) -> np.ndarray:
+        """Connected-component label of every point (the smallest point row in it)."""
+        labels = np.arange(self.shape[1])
+        a, b = self.indices[0::2], self.indices[1::2]
+        while True:
+            # Hook each spring's larger label onto the smaller, then jump pointers
+            low = np.minimum(labels[a], labels[b])
+            previous = labels.copy()
+            np.minimum.at(labels, labels[a], low)
+            np.minimum.at(labels, labels[b], low)
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+            if np.array_equal(labels, previous):
+                return labels
@@ -1,15 +1,26 @@
+from functools import cache
 
 import pygame
 import numpy as np
 
 from .game_object import GameObject
+from .particle_store import ParticleStore
 from .polygon_obstacle import PolygonObstacle
 from softbody_simulation.consts import *
 from softbody_simulation.utils import *
 
 
+@cache
+def circle_sprite(radius: int, color) -> tuple[pygame.Surface, pygame.mask.Mask]:
+    """Shared sprite and mask for every mass point drawn with the same style."""
+    surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA, 32)
+    pygame.draw.circle(surface, color, (radius, radius), radius)
+    return surface, pygame.mask.from_surface(surface)
+
+
 class MassPoint(GameObject):
     RADIUS = 5
+    COLOR = RED
     BOUNCINESS = 1
 
     def __init__(
@@ -19,27 +30,100 @@ class MassPoint(GameObject):
         velocity: np.ndarray = np.array([0, 0]),
         use_gravity=True,
         damping=0,
+        particles: ParticleStore | None = None,
     ):
-        self.pos = pos.astype(np.float64)
-        self.initial_pos = pos
-        self.velocity = velocity
-        self.initial_velocity = velocity
-        self.previous_velocity = self.velocity
-        self.mass = mass
-        self.force = 0
-        self.use_gravity = use_gravity
-        self.damping = damping
-
-        self.surface = pygame.Surface(
-            (self.RADIUS * 2, self.RADIUS * 2), pygame.SRCALPHA, 32
-        )
-        pygame.draw.circle(self.surface, RED, (self.RADIUS, self.RADIUS), self.RADIUS)
-
-        self.mask = pygame.mask.from_surface(self.surface)
-        self.rect = self.surface.get_rect()
-        self.selected = False
-
-    def update(self, delta_time: float, obstacles=None, mass_points=None):
+        self.particles = particles if particles is not None else ParticleStore(capacity=1)
+        (self.index,) = self.particles.add(pos, mass, velocity, use_gravity, damping)
+        self.particles.handles.append(self)
+
+    @classmethod
+    def spawn_many(
+        cls,
+        particles: ParticleStore,
+        positions: np.ndarray,
+        mass: float,
+        velocity=(0, 0),
+        use_gravity=True,
+        damping=0,
+    ) -> list["MassPoint"]:
+        """Create one point per row of `positions` with a single store write."""
+        indices = particles.add(positions, mass, velocity, use_gravity, damping)
+        handles = [cls.__new__(cls) for _ in indices]
+        for handle, index in zip(handles, indices):
+            handle.__dict__.update(particles=particles, index=index)
+        particles.handles.extend(handles)
+        return handles
+
+    # --- Views into the particle store ---
+    @property
+    def pos(self) -> np.ndarray:
+        return self.particles.state[self.index, 0:2]
+
+    @pos.setter
+    def pos(self, value) -> None:
+        self.particles.state[self.index, 0:2] = value
+
+    @property
+    def velocity(self) -> np.ndarray:
+        return self.particles.state[self.index, 2:4]
+
+    @velocity.setter
+    def velocity(self, value) -> None:
+        self.particles.state[self.index, 2:4] = value
+
+    @property
+    def force(self) -> np.ndarray:
+        return self.particles.force[self.index]
+
+    @force.setter
+    def force(self, value) -> None:
+        self.particles.force[self.index] = value
+
+    @property
+    def mass(self) -> float:
+        return float(self.particles.mass[self.index])
+
+    @mass.setter
+    def mass(self, value: float) -> None:
+        self.particles.mass[self.index] = value
+
+    @property
+    def damping(self) -> float:
+        return float(self.particles.damping[self.index])
+
+    @damping.setter
+    def damping(self, value: float) -> None:
+        self.particles.damping[self.index] = value
+
+    @property
+    def use_gravity(self) -> bool:
+        return bool(self.particles.use_gravity[self.index])
+
+    @use_gravity.setter
+    def use_gravity(self, value: bool) -> None:
+        self.particles.use_gravity[self.index] = value
+
+    @property
+    def selected(self) -> bool:
+        return bool(self.particles.selected[self.index])
+
+    @selected.setter
+    def selected(self, value: bool) -> None:
+        self.particles.set_selected(self.index, value)
+
+    @property
+    def surface(self) -> pygame.Surface:
+        return circle_sprite(self.RADIUS, self.COLOR)[0]
+
+    @property
+    def mask(self) -> pygame.mask.Mask:
+        return circle_sprite(self.RADIUS, self.COLOR)[1]
+
+    @property
+    def rect(self) -> pygame.Rect:
+        return self.surface.get_rect(center=tuple(self.pos))
+
+    def update(self, delta_time: float, obstacles=None, mass_points=None, bounds=WIN_SIZE):
         if self.use_gravity:
             gravity_force = -np.array([0, 1]) * GRAVITY * self.mass  # gravity
             self.force += gravity_force
@@ -49,7 +133,7 @@ class MassPoint(GameObject):
 
         self.velocity = self.force * delta_time / self.mass + self.velocity
 
-        self.boundary_collision()
+        self.boundary_collision(bounds)
         # if mass_points:
         #     self.mass_point_collision(delta_time, mass_points)
         if obstacles:
@@ -78,19 +162,20 @@ class MassPoint(GameObject):
             if colliding_edge:
                 self.reflect(colliding_edge)
 
-    def boundary_collision(self):
+    def boundary_collision(self, bounds=WIN_SIZE):
+        """Bounce off the edges of the `bounds` sized world, like the kernels do."""
         if self.pos[0] - self.RADIUS <= 0:
             self.pos[0] = self.RADIUS
             self.velocity[0] = -self.velocity[0]
-        elif self.pos[0] + self.RADIUS >= WIN_SIZE[0]:
-            self.pos[0] = WIN_SIZE[0] - self.RADIUS
+        elif self.pos[0] + self.RADIUS >= bounds[0]:
+            self.pos[0] = bounds[0] - self.RADIUS
             self.velocity[0] = -self.velocity[0]
 
         if self.pos[1] - self.RADIUS <= 0:
             self.pos[1] = self.RADIUS
             self.velocity[1] = -self.velocity[1]
-        elif self.pos[1] + self.RADIUS >= WIN_SIZE[1]:
-            self.pos[1] = WIN_SIZE[1] - self.RADIUS
+        elif self.pos[1] + self.RADIUS >= bounds[1]:
+            self.pos[1] = bounds[1] - self.RADIUS
             self.velocity[1] = -self.velocity[1]
 
     def reflect(self, line):
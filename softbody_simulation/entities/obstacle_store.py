@@ -0,0 +1,64 @@
+import numpy as np
+
+from .selection import SelectionMask
+
+
+class ObstacleStore(SelectionMask):
+    """Ordered obstacles with their selection kept as a bool column.
+
+    Iterates and indexes like the list it replaces; `PolygonObstacle`
+    objects are handles holding an index into it, as mass points and
+    springs are for their stores.
+    """
+
+    def __init__(self, capacity: int = 16):
+        self.count = 0
+        self.handles: list = []
+        self.selected = np.zeros(max(capacity, 1), dtype=bool)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        return iter(self.handles)
+
+    def __getitem__(self, index):
+        return self.handles[index]
+
+    def reserve(self, count: int) -> None:
+        if count <= len(self.selected):
+            return
+        selected = self.selected
+        self.selected = np.zeros(max(count, 2 * len(selected)), dtype=bool)
+        self.selected[:self.count] = selected[:self.count]
+
+    def append(self, obstacle) -> None:
+        self.reserve(self.count + 1)
+        obstacle.store = self
+        obstacle.index = self.count
+        self.handles.append(obstacle)
+        self.selected[self.count] = False
+        self.count += 1
+
+    def remove(self, indices) -> None:
+        """Drop the given obstacles, keeping the order of the rest."""
+        keep = np.ones(self.count, dtype=bool)
+        keep[np.asarray(indices, dtype=np.intp)] = False
+        self.load([h for h, k in zip(self.handles, keep) if k], self.selection_mask[keep])
+
+    def clear(self) -> None:
+        self.load(())
+
+    def load(self, obstacles, selected=False) -> None:
+        """Replace the store's contents; the selection is cleared unless given."""
+        n = len(obstacles)
+        self.reserve(n)
+        for handle in self.handles:
+            handle.index = -1
+        self.handles = list(obstacles)
+        for index, handle in enumerate(self.handles):
+            handle.store = self
+            handle.index = index
+        self.selected[:n] = selected
+        self.count = n
+        self._recount_selection()
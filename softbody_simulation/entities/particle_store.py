@@ -0,0 +1,134 @@
+import numpy as np
+
+from .selection import SelectionMask
+
+
+class ParticleStore(SelectionMask):
+    """Structure-of-arrays storage shared by a group of mass points.
+
+    Positions and velocities live side by side in one `(capacity, 4)` state
+    array, so the whole dynamic state can be copied with a single memcpy.
+    Mass points are lightweight handles holding an index into the store.
+    """
+
+    FIELDS = ("state", "force", "mass", "damping", "use_gravity", "selected")
+
+    def __init__(self, capacity: int = 64, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.count = 0
+        self.handles: list = []
+        self._allocate(max(capacity, 1))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _allocate(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.state = np.zeros((capacity, 4), dtype=self.dtype)
+        self.force = np.zeros((capacity, 2), dtype=self.dtype)
+        self.mass = np.zeros(capacity, dtype=self.dtype)
+        self.damping = np.zeros(capacity, dtype=self.dtype)
+        self.use_gravity = np.zeros(capacity, dtype=bool)
+        self.selected = np.zeros(capacity, dtype=bool)
+
+    def reserve(self, count: int) -> None:
+        if count <= self.capacity:
+            return
+        old = {name: getattr(self, name) for name in self.FIELDS}
+        self._allocate(max(count, 2 * self.capacity))
+        for name, array in old.items():
+            getattr(self, name)[:self.count] = array[:self.count]
+
+    # --- Live views over the used rows ---
+    @property
+    def positions(self) -> np.ndarray:
+        return self.state[:self.count, 0:2]
+
+    @property
+    def velocities(self) -> np.ndarray:
+        return self.state[:self.count, 2:4]
+
+    @property
+    def forces(self) -> np.ndarray:
+        return self.force[:self.count]
+
+    @property
+    def masses(self) -> np.ndarray:
+        return self.mass[:self.count]
+
+    @property
+    def dampings(self) -> np.ndarray:
+        return self.damping[:self.count]
+
+    @property
+    def gravity_mask(self) -> np.ndarray:
+        return self.use_gravity[:self.count]
+
+    # --- Allocation ---
+    def add(self, positions, mass, velocity=(0, 0), use_gravity=True, damping=0) -> range:
+        """Append `len(positions)` particles in one go and return their indices."""
+        positions = np.asarray(positions, dtype=self.dtype).reshape(-1, 2)
+        start, n = self.count, len(positions)
+        self.reserve(start + n)
+        stop = start + n
+
+        self.state[start:stop, 0:2] = positions
+        self.state[start:stop, 2:4] = velocity
+        self.force[start:stop] = 0
+        self.mass[start:stop] = mass
+        self.damping[start:stop] = damping
+        self.use_gravity[start:stop] = use_gravity
+        self.selected[start:stop] = False
+        self.count = stop
+        return range(start, stop)
+
+    def remove(self, indices) -> np.ndarray:
+        """Compact the arrays, dropping the given rows and detaching their handles.
+
+        Returns the keep mask so dependent springs can be remapped.
+        """
+        keep = np.ones(self.count, dtype=bool)
+        keep[np.asarray(indices, dtype=np.intp)] = False
+        if keep.all():
+            return keep
+
+        n = int(keep.sum())
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[:n] = array[:self.count][keep]
+
+        first = int(np.argmin(keep))
+        for handle in self.handles[first:]:
+            handle.index = -1
+        self.handles = [h for h, k in zip(self.handles, keep) if k]
+        for index in range(first, n):
+            self.handles[index].index = index
+        self.count = n
+        self._recount_selection()
+        return keep
+
+    # --- Topology snapshots ---
+    def capture_params(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        n = self.count
+        return self.mass[:n].copy(), self.damping[:n].copy(), self.use_gravity[:n].copy()
+
+    def load(self, handles, params, state: np.ndarray) -> None:
+        """Replace the store's contents with a previously captured set of handles."""
+        n = len(handles)
+        self.reserve(n)
+        for handle in self.handles:
+            handle.index = -1
+        self.handles = list(handles)
+        for index, handle in enumerate(self.handles):
+            handle.particles = self
+            handle.index = index
+
+        mass, damping, use_gravity = params
+        self.mass[:n] = mass
+        self.damping[:n] = damping
+        self.use_gravity[:n] = use_gravity
+        self.force[:n] = 0
+        self.state[:n] = state
+        self.selected[:n] = False
+        self.count = n
+        self.selected_count = 0
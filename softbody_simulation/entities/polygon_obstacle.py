@@ -1,4 +1,5 @@
 import pygame
+import numpy as np
 
 from .game_object import GameObject
 from softbody_simulation.consts import *
@@ -7,26 +8,61 @@ from softbody_simulation.utils import *
 
 class PolygonObstacle(GameObject):
     color = WHITE
-    size = WIN_SIZE
 
-    def __init__(self, points, color=color):
-        self.pos = 0, 0
+    def __init__(self, points, color=color, dtype=np.float64):
         self.points = points
         self.color = color
 
-        self.surface = pygame.Surface(self.size, pygame.SRCALPHA)
-        pygame.draw.polygon(self.surface, self.color, self.points)
-
-        self.mask = pygame.mask.from_surface(self.surface)
-        self.rect = self.surface.get_rect()
-        self.selected = False
-
-    def draw(self, win: pygame.Surface):
-        win.blit(self.surface, self.pos)
+        # Rasterize into a surface cropped to the polygon's bounding box
+        points = np.asarray(points, dtype=np.float64)
+        top_left = np.floor(points.min(axis=0)).astype(int)
+        bottom_right = np.ceil(points.max(axis=0)).astype(int)
+        self.pos = tuple(top_left)
+        size = tuple(bottom_right - top_left + 1)
+
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.polygon(self.surface, self.color, (points - top_left).tolist())
+
+        # Edge i runs from points[i] to points[i + 1], wrapping around; the
+        # collision arrays use the world's dtype
+        edges = points.astype(dtype, copy=False)
+        self.edge_starts = edges
+        self.edge_ends = np.roll(edges, -1, axis=0)
+        self.bounds = edges.min(axis=0), edges.max(axis=0)
+
+        self._mask = None
+        self.rect = self.surface.get_rect(topleft=self.pos)
+        # Set when added to an ObstacleStore, which holds the selection
+        self.store = None
+        self.index = -1
+
+    @property
+    def selected(self) -> bool:
+        return self.index >= 0 and bool(self.store.selected[self.index])
+
+    @selected.setter
+    def selected(self, value: bool) -> None:
+        self.store.set_selected(self.index, value)
+
+    @property
+    def mask(self) -> pygame.mask.Mask:
+        # Built on first use; only pixel collision needs it
+        if self._mask is None:
+            self._mask = pygame.mask.from_surface(self.surface)
+        return self._mask
+
+    def draw(self, win: pygame.Surface, camera=None):
+        if camera is None:
+            win.blit(self.surface, self.pos)
+            points = self.points
+        else:
+            # Zoomed views draw the outline directly instead of the cached raster
+            points = camera.to_screen(self.points)
+            pygame.draw.polygon(win, self.color, points.tolist())
 
         if self.selected:
-            if len(self.points) > 0:
-                tuple_points = [tuple(v) for v in self.points]
+            if len(points) > 0:
+                tuple_points = [tuple(v) for v in points]
                 pygame.draw.lines(win, (255, 255, 0), True, tuple_points, 3)
                 for point in tuple_points:
                     pygame.draw.circle(win, (255, 255, 0), point, 5)
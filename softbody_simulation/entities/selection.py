@@ -0,0 +1,43 @@
+import numpy as np
+
+
+class SelectionMask:
+    """Selection kept as a `selected` bool column next to a store's other arrays.
+
+    The number of selected rows is tracked as rows change state, so counting
+    is O(1) and clearing is a single array write.
+    """
+
+    selected_count = 0
+
+    @property
+    def selection_mask(self) -> np.ndarray:
+        return self.selected[:self.count]
+
+    @property
+    def selected_rows(self) -> np.ndarray:
+        if self.selected_count == 0:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self.selection_mask)
+
+    def set_selected(self, rows, value: bool = True) -> None:
+        if np.isscalar(rows):
+            if self.selected[rows] != value:
+                self.selected[rows] = value
+                self.selected_count += 1 if value else -1
+            return
+        rows = np.asarray(rows, dtype=np.intp)
+        self.selected[rows] = value
+        self._recount_selection()
+
+    def select_all(self) -> None:
+        self.selected[:self.count] = True
+        self.selected_count = self.count
+
+    def clear_selection(self) -> None:
+        if self.selected_count:
+            self.selected[:self.count] = False
+            self.selected_count = 0
+
+    def _recount_selection(self) -> None:
+        self.selected_count = int(np.count_nonzero(self.selection_mask))
@@ -2,17 +2,79 @@ import pygame
 import numpy as np
 
 from .game_object import GameObject
+from .spring_store import SpringStore
 from softbody_simulation.consts import *
 from softbody_simulation.utils import *
 
 
 class Spring(GameObject):
-    def __init__(self, mass_points, stiffness, damping, rest_length=None):
-        self.a, self.b = mass_points
-        self.stiffness = stiffness
-        self.rest_length = rest_length or np.linalg.norm(self.a.pos - self.b.pos)
-        self.damping = damping
-        self.selected = False
+    def __init__(self, mass_points, stiffness, damping, rest_length=None,
+                 springs: SpringStore | None = None):
+        a, b = mass_points
+        # Springs join rows of one particle store; a row from another store is a different point
+        if a.particles is not b.particles:
+            raise ValueError("Spring ends must share a particle store")
+        if springs is not None and springs.particles is not a.particles:
+            raise ValueError("Spring store and its ends must share a particle store")
+        self.springs = springs if springs is not None else SpringStore(a.particles, capacity=1)
+        (self.index,) = self.springs.add(
+            a.index, b.index, stiffness, damping,
+            rest_length or np.linalg.norm(a.pos - b.pos),
+        )
+        self.springs.handles.append(self)
+
+    @classmethod
+    def spawn_many(cls, springs: SpringStore, indices: np.ndarray, stiffness, damping,
+                   rest_length=None) -> list["Spring"]:
+        """Create one spring per `(a, b)` row of particle rows with a single store write."""
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1, 2)
+        rows = springs.add(indices[:, 0], indices[:, 1], stiffness, damping, rest_length)
+        handles = [cls.__new__(cls) for _ in rows]
+        for handle, index in zip(handles, rows):
+            handle.__dict__.update(springs=springs, index=index)
+        springs.handles.extend(handles)
+        return handles
+
+    # --- Views into the spring store ---
+    @property
+    def a(self):
+        return self.springs.particles.handles[self.springs.a[self.index]]
+
+    @property
+    def b(self):
+        return self.springs.particles.handles[self.springs.b[self.index]]
+
+    @property
+    def stiffness(self) -> float:
+        return float(self.springs.stiffness[self.index])
+
+    @stiffness.setter
+    def stiffness(self, value: float) -> None:
+        self.springs.stiffness[self.index] = value
+
+    @property
+    def rest_length(self) -> float:
+        return float(self.springs.rest_length[self.index])
+
+    @rest_length.setter
+    def rest_length(self, value: float) -> None:
+        self.springs.rest_length[self.index] = value
+
+    @property
+    def damping(self) -> float:
+        return float(self.springs.damping[self.index])
+
+    @damping.setter
+    def damping(self, value: float) -> None:
+        self.springs.damping[self.index] = value
+
+    @property
+    def selected(self) -> bool:
+        return bool(self.springs.selected[self.index])
+
+    @selected.setter
+    def selected(self, value: bool) -> None:
+        self.springs.set_selected(self.index, value)
 
     def update(self, delta_time: float):
         pos_delta = self.b.pos - self.a.pos
@@ -0,0 +1,212 @@
+import numpy as np
+
+from .incidence import IncidenceMatrix
+from .particle_store import ParticleStore
+from .selection import SelectionMask
+
+
+def pair_keys(a, b) -> np.ndarray:
+    """Order-independent int64 key of each `(a, b)` particle pair."""
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    return (np.minimum(a, b) << 32) | np.maximum(a, b)
+
+
+class SpringStore(SelectionMask):
+    """Structure-of-arrays storage for springs between points of one ParticleStore.
+
+    Endpoints are particle rows; `Spring` objects are handles holding an index
+    into these arrays.
+
+    An adjacency index (pair key -> spring) and the springs x points
+    incidence matrix are built on first query. Swap-removal updates both in
+    place; other topology changes drop them until the next query.
+    """
+
+    COLUMNS = ("a", "b", "stiffness", "rest_length", "damping")
+    FIELDS = COLUMNS + ("selected",)
+
+    def __init__(self, particles: ParticleStore, capacity: int = 64):
+        self.particles = particles
+        self.dtype = particles.dtype
+        self.count = 0
+        self.handles: list = []
+        self._pairs: dict | None = None
+        self._incidence: IncidenceMatrix | None = None
+        self._allocate(max(capacity, 1))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _allocate(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.a = np.zeros(capacity, dtype=np.intp)
+        self.b = np.zeros(capacity, dtype=np.intp)
+        self.stiffness = np.zeros(capacity, dtype=self.dtype)
+        self.rest_length = np.zeros(capacity, dtype=self.dtype)
+        self.damping = np.zeros(capacity, dtype=self.dtype)
+        self.selected = np.zeros(capacity, dtype=bool)
+
+    def reserve(self, count: int) -> None:
+        if count <= self.capacity:
+            return
+        old = {name: getattr(self, name) for name in self.FIELDS}
+        self._allocate(max(count, 2 * self.capacity))
+        for name, array in old.items():
+            getattr(self, name)[:self.count] = array[:self.count]
+
+    # --- Live views over the used rows ---
+    @property
+    def indices(self) -> np.ndarray:
+        """(S, 2) particle rows of both endpoints."""
+        return np.stack((self.a[:self.count], self.b[:self.count]), axis=1)
+
+    def columns(self) -> tuple[np.ndarray, ...]:
+        n = self.count
+        return tuple(getattr(self, name)[:n] for name in self.COLUMNS)
+
+    # --- Allocation ---
+    def add(self, a, b, stiffness, damping, rest_length=None) -> range:
+        a = np.asarray(a, dtype=np.intp).ravel()
+        b = np.asarray(b, dtype=np.intp).ravel()
+        if rest_length is None:
+            d = self.particles.state[b, 0:2] - self.particles.state[a, 0:2]
+            rest_length = np.sqrt(np.einsum("ij,ij->i", d, d))
+
+        start, n = self.count, len(a)
+        self.reserve(start + n)
+        stop = start + n
+
+        self.a[start:stop] = a
+        self.b[start:stop] = b
+        self.stiffness[start:stop] = stiffness
+        self.rest_length[start:stop] = rest_length
+        self.damping[start:stop] = damping
+        self.selected[start:stop] = False
+        self.count = stop
+
+        if self._pairs is not None:
+            self._pairs.update(zip(pair_keys(a, b).tolist(), range(start, stop)))
+        self._incidence = None
+        return range(start, stop)
+
+    def remove(self, indices) -> np.ndarray:
+        """Drop the given springs by mask compaction; returns the keep mask."""
+        keep = np.ones(self.count, dtype=bool)
+        keep[np.asarray(indices, dtype=np.intp)] = False
+        self.compact(keep)
+        return keep
+
+    def compact(self, keep: np.ndarray) -> None:
+        if keep.all():
+            return
+
+        n = int(keep.sum())
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[:n] = array[:self.count][keep]
+
+        first = int(np.argmin(keep))
+        for handle in self.handles[first:]:
+            handle.index = -1
+        self.handles = [h for h, k in zip(self.handles, keep) if k]
+        for index in range(first, n):
+            self.handles[index].index = index
+        self.count = n
+        self._recount_selection()
+        self._invalidate_adjacency()
+
+    def swap_remove(self, indices) -> None:
+        """Drop the given springs by moving springs from the end into their rows.
+
+        Costs O(len(indices)) rather than a full compaction; the pair index and
+        incidence matrix follow the moves instead of being rebuilt.
+        """
+        removed = np.unique(np.asarray(indices, dtype=np.intp))
+        if len(removed) == 0:
+            return
+        n = self.count - len(removed)
+        holes = removed[removed < n]
+        tail = np.arange(n, self.count)
+        sources = tail[~np.isin(tail, removed)]
+
+        if self._pairs is not None:
+            for key in pair_keys(self.a[removed], self.b[removed]).tolist():
+                self._pairs.pop(key, None)
+            self._pairs.update(zip(pair_keys(self.a[sources], self.b[sources]).tolist(), holes.tolist()))
+        self.selected_count -= int(np.count_nonzero(self.selected[removed]))
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[holes] = array[sources]
+
+        for index in removed:
+            self.handles[index].index = -1
+        for hole, source in zip(holes.tolist(), sources.tolist()):
+            self.handles[hole] = self.handles[source]
+            self.handles[hole].index = hole
+        del self.handles[n:]
+        self.count = n
+
+        if self._incidence is not None:
+            self._incidence.swap_remove(holes, sources, n)
+
+    def remap_points(self, keep_points: np.ndarray) -> None:
+        """Follow a particle compaction: drop springs on removed points, renumber the rest."""
+        a, b = self.a[:self.count], self.b[:self.count]
+        self.compact(keep_points[a] & keep_points[b])
+
+        remap = np.cumsum(keep_points) - 1
+        self.a[:self.count] = remap[self.a[:self.count]]
+        self.b[:self.count] = remap[self.b[:self.count]]
+        self._invalidate_adjacency()
+
+    # --- Adjacency ---
+    def _invalidate_adjacency(self) -> None:
+        self._pairs = None
+        self._incidence = None
+
+    @property
+    def pairs(self) -> dict:
+        """Pair key (see `pair_keys`) -> spring index."""
+        if self._pairs is None:
+            keys = pair_keys(self.a[:self.count], self.b[:self.count])
+            self._pairs = dict(zip(keys.tolist(), range(self.count)))
+        return self._pairs
+
+    def find(self, a: int, b: int) -> int | None:
+        """Index of a spring joining particle rows `a` and `b`, if there is one."""
+        return self.pairs.get(int(pair_keys(a, b)))
+
+    @property
+    def incidence(self) -> IncidenceMatrix:
+        """Springs x points incidence matrix over the store's particles."""
+        # Points added without springs widen the matrix, so its width is checked too
+        if self._incidence is None or self._incidence.shape[1] != self.particles.count:
+            n = self.count
+            self._incidence = IncidenceMatrix(self.a[:n], self.b[:n], self.particles.count)
+        return self._incidence
+
+    def incident(self, point: int) -> np.ndarray:
+        """Indices of the springs attached to particle row `point`."""
+        return self.incidence.incident(point)
+
+    # --- Topology snapshots ---
+    def capture(self) -> tuple[np.ndarray, ...]:
+        return tuple(column.copy() for column in self.columns())
+
+    def load(self, handles, columns) -> None:
+        n = len(handles)
+        self.reserve(n)
+        for handle in self.handles:
+            handle.index = -1
+        self.handles = list(handles)
+        for index, handle in enumerate(self.handles):
+            handle.springs = self
+            handle.index = index
+
+        for name, column in zip(self.COLUMNS, columns):
+            getattr(self, name)[:n] = column
+        self.selected[:n] = False
+        self.count = n
+        self.selected_count = 0
+        self._invalidate_adjacency()
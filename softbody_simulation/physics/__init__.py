@@ -0,0 +1,9 @@
+from .mesh import *
+from .kernels import *
+from .templates import *
+from .spatial import *
+from .collision import *
+from .contacts import *
+from .fields import *
+from .modal import *
+from .backends import *
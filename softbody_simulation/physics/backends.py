@@ -0,0 +1,182 @@
+import logging
+from functools import cache
+
+import numpy as np
+
+from softbody_simulation.consts import BACKEND_TOLERANCE, COMPUTE_BACKEND, GRAVITY, WIN_SIZE
+from softbody_simulation.entities import MassPoint, ParticleStore, PolygonObstacle
+from . import jit
+from .contacts import ContactCache
+from .kernels import integrate, spring_forces
+from .mesh import grid_mesh, rest_lengths
+from .spatial import CELL_LIMIT, cell_keys
+
+logger = logging.getLogger(__name__)
+
+
+class NumpyBackend:
+    """Reference implementation of the hot kernels, built from the vectorized NumPy kernels."""
+
+    name = "numpy"
+
+    def spring_forces(self, pos: np.ndarray, vel: np.ndarray, a: np.ndarray, b: np.ndarray,
+                      rest_length, stiffness, damping, incidence=None) -> np.ndarray:
+        return spring_forces(pos, vel, a, b, rest_length, stiffness, damping, incidence)
+
+    def integrate(self, particles: ParticleStore, delta_time: float, obstacles=(),
+                  radius: float = MassPoint.RADIUS, bounciness: float = MassPoint.BOUNCINESS,
+                  bounds=WIN_SIZE, contacts=None, rows=None) -> None:
+        integrate(particles, delta_time, obstacles, radius, bounciness, bounds, contacts, rows)
+
+    def cell_keys(self, positions: np.ndarray, cell_size: float) -> np.ndarray:
+        return cell_keys(positions, cell_size)
+
+
+class NumbaBackend(NumpyBackend):
+    """Fused loop kernels from `jit`, compiled by Numba.
+
+    Each kernel makes one pass over its rows without the temporaries the
+    NumPy versions allocate per operation.
+    """
+
+    name = "numba"
+
+    def spring_forces(self, pos, vel, a, b, rest_length, stiffness, damping,
+                      incidence=None) -> np.ndarray:
+        if pos.ndim != 2:
+            # Batched instances stay on the NumPy path
+            return super().spring_forces(pos, vel, a, b, rest_length, stiffness, damping)
+        # Accumulate in float64 even for float32 stores
+        out = np.empty(pos.shape)
+        jit.spring_forces_loop(
+            pos, vel, a, b,
+            *(np.ascontiguousarray(np.broadcast_to(x, a.shape), dtype=pos.dtype)
+              for x in (rest_length, stiffness, damping)),
+            out,
+        )
+        return out
+
+    def integrate(self, particles, delta_time, obstacles=(), radius=MassPoint.RADIUS,
+                  bounciness=MassPoint.BOUNCINESS, bounds=WIN_SIZE, contacts=None, rows=None) -> None:
+        # The loops run over views of the store, or over copies of `rows`
+        every = slice(0, particles.count) if rows is None else rows
+        state, force = particles.state[every], particles.force[every]
+        # With a contact cache, obstacles are resolved through it between the
+        # velocity and position passes, as in the NumPy kernel
+        packed = self._pack_obstacles(() if contacts is not None else obstacles)
+        jit.accelerate_loop(
+            state, force, particles.mass[every], particles.damping[every], particles.use_gravity[every],
+            GRAVITY, delta_time, radius, bounciness, float(bounds[0]), float(bounds[1]), *packed,
+        )
+        if contacts is not None:
+            if rows is not None:
+                particles.state[rows] = state
+            contacts.resolve(particles, obstacles, radius, bounciness, rows)
+            if rows is not None:
+                state = particles.state[rows]
+        jit.advance_loop(state, force, delta_time)
+        if rows is not None:
+            particles.state[rows] = state
+            particles.force[rows] = 0
+
+    def cell_keys(self, positions, cell_size) -> np.ndarray:
+        positions = np.asarray(positions, dtype=np.float64)
+        out = np.empty(len(positions), dtype=np.int64)
+        jit.cell_keys_loop(positions, float(cell_size), CELL_LIMIT, out)
+        return out
+
+    @staticmethod
+    def _pack_obstacles(obstacles) -> tuple[np.ndarray, ...]:
+        """Every obstacle's edges in one array, with per-obstacle offsets and bounds."""
+        edges = [len(obstacle.edge_starts) for obstacle in obstacles]
+        offsets = np.zeros(len(edges) + 1, dtype=np.intp)
+        np.cumsum(edges, out=offsets[1:])
+        if not edges:
+            empty = np.empty((0, 2))
+            return empty, empty, offsets, np.empty((0, 2, 2))
+        starts = np.concatenate([obstacle.edge_starts for obstacle in obstacles]).astype(np.float64)
+        ends = np.concatenate([obstacle.edge_ends for obstacle in obstacles]).astype(np.float64)
+        bounds = np.array([obstacle.bounds for obstacle in obstacles], dtype=np.float64)
+        return starts, ends, offsets, bounds
+
+
+BACKENDS = {backend.name: backend for backend in (NumpyBackend, NumbaBackend)}
+
+
+def _validation_scene(dtype=np.float64) -> tuple[ParticleStore, np.ndarray, list]:
+    """A small jittered grid falling onto a slope, the same on every call."""
+    rng = np.random.default_rng(0)
+    points, springs = grid_mesh((100, 100), (8, 8), 20)
+    points = points + rng.uniform(-3, 3, points.shape)
+    particles = ParticleStore(capacity=len(points), dtype=dtype)
+    particles.add(points, mass=rng.uniform(0.5, 2, len(points)), damping=0.1,
+                  velocity=rng.uniform(-50, 50, points.shape))
+    obstacles = [PolygonObstacle(np.array([(60, 200), (300, 240), (300, 320), (60, 320)]))]
+    return particles, springs, obstacles
+
+
+def validate_backend(backend, reference=None, steps: int = 30,
+                     tolerance: float = BACKEND_TOLERANCE) -> bool:
+    """Whether `backend` matches `reference` to `tolerance` over a short run."""
+    reference = reference or NumpyBackend()
+    runs = []
+    for candidate in (backend, reference):
+        particles, springs, obstacles = _validation_scene()
+        contacts = ContactCache()
+        a, b = springs[:, 0], springs[:, 1]
+        rest = rest_lengths(particles.positions, springs) * 0.9
+        forces = candidate.spring_forces(
+            particles.positions, particles.velocities, a, b, rest, 200.0, 1.0
+        )
+        for step in range(steps):
+            particles.forces[:] += candidate.spring_forces(
+                particles.positions, particles.velocities, a, b, rest, 200.0, 1.0
+            )
+            # The second half goes through a contact cache, as the scenes do
+            cache = contacts if 2 * step >= steps else None
+            candidate.integrate(particles, 1 / 60, obstacles, contacts=cache)
+        keys = candidate.cell_keys(particles.positions, 16)
+        runs.append((forces, particles.state[:particles.count].copy(), keys))
+
+    (forces, state, keys), (ref_forces, ref_state, ref_keys) = runs
+    scale = max(np.abs(ref_state).max(), 1.0)
+    return (
+        np.allclose(forces, ref_forces, rtol=tolerance, atol=tolerance * np.abs(ref_forces).max())
+        and np.allclose(state, ref_state, rtol=tolerance, atol=tolerance * scale)
+        and np.array_equal(keys, ref_keys)
+    )
+
+
+def select_backend(name: str = COMPUTE_BACKEND):
+    """The backend for `name` ("numpy", "numba" or "auto"), falling back to NumPy.
+
+    A compiled backend is only used if it is installed and agrees with the
+    NumPy reference on a validation run.
+    """
+    reference = NumpyBackend()
+    if name == "numpy":
+        return reference
+    if name not in ("auto", *BACKENDS):
+        raise ValueError(f"Unknown compute backend: {name}")
+
+    if not jit.NUMBA_AVAILABLE:
+        if name == "numba":
+            logger.warning("Numba is not installed; using the NumPy backend")
+        return reference
+
+    backend = NumbaBackend()
+    try:
+        valid = validate_backend(backend, reference)
+    except Exception:
+        logger.exception("Numba backend failed to run; using the NumPy backend")
+        return reference
+    if not valid:
+        logger.warning("Numba backend disagrees with the NumPy reference; using the NumPy backend")
+        return reference
+    return backend
+
+
+@cache
+def default_backend():
+    """The backend picked once per process from `COMPUTE_BACKEND`."""
+    return select_backend()
@@ -0,0 +1,314 @@
+import numpy as np
+
+from softbody_simulation.consts import BODY_RESTITUTION
+from softbody_simulation.entities import IncidenceMatrix, MassPoint, ParticleStore, SpringStore, pair_keys
+
+
+def _runs(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenated `arange(start, start + count)` for every run."""
+    total = int(counts.sum())
+    return np.arange(total) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+
+
+def boundary_springs(springs: SpringStore, positions: np.ndarray,
+                     rows: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Mask of the springs on the outline of their mesh, and the side their body is on.
+
+    A spring is interior when its mesh has triangles (a point joined to both
+    ends) on both of its sides; outline springs have them on one side at
+    most. Works for triangulated and sheared-grid meshes alike. The side is
+    +1 when the triangles lie left of `a -> b`, -1 right, 0 for bare chains.
+    `rows` restricts the test to those springs; both results follow it.
+    """
+    n = springs.count
+    a, b = springs.a[:n], springs.b[:n]
+    rows = np.arange(n) if rows is None else np.asarray(rows, dtype=np.intp)
+    if len(rows) == 0:
+        return np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int8)
+    indptr, incident = springs.incidence.transpose
+    if len(rows) == n:
+        keys = np.sort(pair_keys(a, b))
+    else:
+        # A triangle's third side is attached to the tested spring's `b` end
+        ends = np.unique(b[rows])
+        near = incident[_runs(indptr[ends], indptr[ends + 1] - indptr[ends])]
+        keys = np.sort(pair_keys(a[near], b[near]))
+
+    # Every (spring, spring sharing its `a` end) combination
+    counts = indptr[a[rows] + 1] - indptr[a[rows]]
+    row = np.repeat(np.arange(len(rows)), counts)
+    spring = rows[row]
+    other = incident[_runs(indptr[a[rows]], counts)]
+    apex = np.where(a[other] == a[spring], b[other], a[other])
+
+    # ...whose far end is also joined to the spring's `b` end
+    wanted = pair_keys(b[spring], apex)
+    found = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+    triangle = (keys[found] == wanted) & (other != spring) & (apex != b[spring])
+    row, spring, apex = row[triangle], spring[triangle], apex[triangle]
+
+    edge = positions[b[spring]] - positions[a[spring]]
+    rel = positions[apex] - positions[a[spring]]
+    side = edge[:, 0] * rel[:, 1] - edge[:, 1] * rel[:, 0]
+    left = np.bincount(row[side > 0], minlength=len(rows)) > 0
+    right = np.bincount(row[side < 0], minlength=len(rows)) > 0
+    return ~(left & right), left.astype(np.int8) - right.astype(np.int8)
+
+
+def _share_neighbour(indptr: np.ndarray, incident: np.ndarray, rows: tuple[np.ndarray, np.ndarray],
+                     a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Per pair `a[i], b[i]`: is some point joined to both, in the graph `indptr, incident`."""
+    def neighbours(points):
+        counts = indptr[points + 1] - indptr[points]
+        pair = np.repeat(np.arange(len(points)), counts)
+        other = incident[_runs(indptr[points], counts)]
+        return pair * len(indptr) + np.where(rows[0][other] == points[pair], rows[1][other], rows[0][other])
+
+    shared = neighbours(a)
+    shared = shared[np.isin(shared, neighbours(b))]
+    return np.bincount(shared // len(indptr), minlength=len(a)) > 0
+
+
+def sweep_and_prune(low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """(P, 2) pairs `i < j` of the boxes `low[i]..high[i]` that overlap."""
+    order = np.argsort(low[:, 0], kind="stable")
+    sorted_low = low[order, 0]
+    # Along x, box order[k] can only overlap the later boxes starting before it ends
+    stop = np.searchsorted(sorted_low, high[order, 0], side="right")
+    counts = np.maximum(stop - np.arange(len(order)) - 1, 0)
+    first = np.repeat(np.arange(len(order)), counts)
+    second = _runs(np.arange(len(order)) + 1, counts)
+    i, j = order[first], order[second]
+
+    overlap = (low[i, 1] <= high[j, 1]) & (low[j, 1] <= high[i, 1])
+    pairs = np.stack((np.minimum(i, j), np.maximum(i, j)), axis=1)[overlap]
+    return pairs
+
+
+def closest_on_segments(points: np.ndarray, starts: np.ndarray,
+                        ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Row-wise parameter `t` of the closest point on each segment and its squared distance."""
+    d = ends - starts
+    rel = points - starts
+    length_sq = np.einsum("ij,ij->i", d, d)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(length_sq > 0, np.einsum("ij,ij->i", rel, d) / length_sq, 0)
+    np.clip(t, 0, 1, out=t)
+    diff = rel - t[:, None] * d
+    return t, np.einsum("ij,ij->i", diff, diff)
+
+
+def ray_crossings(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Row-wise: does the ray from each point towards +x cross its segment."""
+    py = points[:, 1]
+    y0, y1 = starts[:, 1], ends[:, 1]
+    straddle = (y0 > py) != (y1 > py)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = starts[:, 0] + (py - y0) * (ends[:, 0] - starts[:, 0]) / (y1 - y0)
+    return straddle & (points[:, 0] < x)
+
+
+class BodyCollider:
+    """Collisions between the separate soft bodies of one particle store.
+
+    Bodies are the connected components (islands) of the spring graph. Their
+    outline springs are extracted once per topology; each step then bounds
+    every island, pairs overlapping bounds by sweep and prune, and tests the
+    points of one body of each pair against the outline of the other. Only
+    bodies whose bounds overlap reach the narrowphase.
+    """
+
+    def __init__(self, radius: float = MassPoint.RADIUS, restitution: float = BODY_RESTITUTION):
+        self.radius = radius
+        self.restitution = restitution
+        self.topology_key = None
+        self.roots = np.empty(0, dtype=np.intp)
+        self.point_order = np.empty(0, dtype=np.intp)
+        self.point_starts = np.empty(0, dtype=np.intp)
+        self.edges = np.empty((0, 2), dtype=np.intp)
+        self.edge_sides = np.empty(0, dtype=np.int8)
+        self.edge_starts = np.zeros(1, dtype=np.intp)
+
+    @property
+    def island_count(self) -> int:
+        return len(self.point_starts) - 1
+
+    def refresh(self, springs: SpringStore, topology_key) -> None:
+        """Re-extract islands and outlines when `topology_key` changes."""
+        if topology_key == self.topology_key:
+            return
+        self.topology_key = topology_key
+
+        n = springs.count
+        outline, sides = boundary_springs(springs, springs.particles.positions)
+        outline = np.flatnonzero(outline)
+        edges = np.stack((springs.a[:n][outline], springs.b[:n][outline]), axis=1)
+        self._index(springs.incidence.components(), edges, sides[outline])
+
+    def tear(self, springs: SpringStore, a: np.ndarray, b: np.ndarray,
+             previous_key, topology_key) -> None:
+        """Follow the removal of the springs `a[i] -> b[i]` from `springs`.
+
+        Only the outline springs around the torn ones are re-tested, and only
+        islands a tear may have split are relabelled: a torn spring whose ends
+        still share a neighbour leaves its island whole. Ends up where a
+        `refresh` under `topology_key` would; does nothing unless the
+        islands were current for `previous_key`.
+        """
+        if self.topology_key != previous_key:
+            return
+        self.topology_key = topology_key
+        indptr, incident = springs.incidence.transpose
+        rows = springs.a[:springs.count], springs.b[:springs.count]
+
+        roots = self.roots.copy()
+        split = ~_share_neighbour(indptr, incident, rows, a, b)
+        if split.any():
+            islands = np.isin(roots, roots[a[split]])
+            points = np.flatnonzero(islands)
+            local = np.cumsum(islands) - 1
+            inside = islands[rows[0]]
+            sub = IncidenceMatrix(local[rows[0][inside]], local[rows[1][inside]], len(points))
+            roots[points] = points[sub.components()]
+
+        # Springs sharing a triangle with a torn one all touch one of its ends
+        ends = np.unique(np.concatenate((a, b)))
+        near = np.unique(incident[_runs(indptr[ends], indptr[ends + 1] - indptr[ends])])
+        outline, sides = boundary_springs(springs, springs.particles.positions, near)
+        retested = np.concatenate((pair_keys(a, b), pair_keys(rows[0][near], rows[1][near])))
+        keep = ~np.isin(pair_keys(self.edges[:, 0], self.edges[:, 1]), retested)
+        near = near[outline]
+        edges = np.concatenate((self.edges[keep], np.stack((rows[0][near], rows[1][near]), axis=1)))
+        self._index(roots, edges, np.concatenate((self.edge_sides[keep], sides[outline])))
+
+    def _index(self, roots: np.ndarray, edges: np.ndarray, sides: np.ndarray) -> None:
+        """Group points and outline edges by island, islands ordered by their root."""
+        self.roots = roots
+        _, labels = np.unique(roots, return_inverse=True)
+        count = int(labels.max(initial=-1)) + 1
+        self.point_order = np.argsort(labels, kind="stable")
+        self.point_starts = np.zeros(count + 1, dtype=np.intp)
+        np.cumsum(np.bincount(labels, minlength=count), out=self.point_starts[1:])
+
+        # Edges by pair within their island, however they were gathered
+        edge_labels = labels[edges[:, 0]]
+        order = np.lexsort((pair_keys(edges[:, 0], edges[:, 1]), edge_labels))
+        self.edges = edges[order]
+        self.edge_sides = sides[order]
+        self.edge_starts = np.zeros(count + 1, dtype=np.intp)
+        np.cumsum(np.bincount(edge_labels, minlength=count), out=self.edge_starts[1:])
+
+    def island_bounds(self, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Per-island bounding boxes, grown by the contact radius."""
+        if self.island_count == 0:
+            return np.empty((0, 2)), np.empty((0, 2))
+        grouped = positions[self.point_order]
+        starts = self.point_starts[:-1]
+        low = np.minimum.reduceat(grouped, starts, axis=0) - self.radius
+        high = np.maximum.reduceat(grouped, starts, axis=0) + self.radius
+        return low, high
+
+    def find_contacts(self, positions: np.ndarray) -> tuple[np.ndarray, ...]:
+        """Point-vs-outline contacts as `(point, edge, t, distance)` arrays.
+
+        A point touches another body when it is within the contact radius of
+        its outline, or inside it by even-odd parity if it slipped deeper;
+        distances of inside points are negative. All overlapping pairs are
+        tested in one batch of (point, edge) rows.
+        """
+        low, high = self.island_bounds(positions)
+        pairs = sweep_and_prune(low, high)
+        # Both ways round: points of `body` against the outline of `other`
+        body = np.concatenate((pairs[:, 0], pairs[:, 1]))
+        other = np.concatenate((pairs[:, 1], pairs[:, 0]))
+        box_low = np.maximum(low[body], low[other])
+        box_high = np.minimum(high[body], high[other])
+
+        # Points of each body inside the overlap of the two boxes
+        counts = self.point_starts[body + 1] - self.point_starts[body]
+        test = np.repeat(np.arange(len(body)), counts)
+        points = self.point_order[_runs(self.point_starts[body], counts)]
+        p = positions[points]
+        inside = ((p >= box_low[test]) & (p <= box_high[test])).all(axis=1)
+        counts = (self.edge_starts[other + 1] - self.edge_starts[other])[test]
+        inside &= counts > 0
+        test, points, counts = test[inside], points[inside], counts[inside]
+        if len(points) == 0:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty, np.empty(0), np.empty(0)
+
+        # ...each against every outline edge of the other body
+        row = np.repeat(np.arange(len(points)), counts)
+        edges = _runs(self.edge_starts[other[test]], counts)
+        p = positions[points][row]
+        starts, ends = positions[self.edges[edges, 0]], positions[self.edges[edges, 1]]
+        t, distance_sq = closest_on_segments(p, starts, ends)
+
+        # Nearest edge per point: the first row reaching the point's minimum.
+        # Points with non-finite distances match no row and drop out.
+        first = np.zeros(len(points), dtype=np.intp)
+        np.cumsum(counts[:-1], out=first[1:])
+        hits = np.flatnonzero(distance_sq == np.minimum.reduceat(distance_sq, first)[row])
+        best = hits[np.diff(row[hits], prepend=-1) != 0]
+
+        closed = self.edge_sides[edges] != 0
+        crossed = ray_crossings(p[closed], starts[closed], ends[closed])
+        odd = np.bincount(row[closed][crossed], minlength=len(points)) % 2 == 1
+        inside = odd[row[best]]
+        touching = (distance_sq[best] < self.radius * self.radius) | inside
+        best = best[touching]
+        distance = np.sqrt(distance_sq[best])
+        distance[inside[touching]] *= -1
+        return points[row[best]], edges[best], t[best], distance
+
+    def collide(self, particles: ParticleStore) -> int:
+        """Push touching points out of other bodies' outlines and exchange impulses.
+
+        Returns the number of contacts.
+        """
+        pos, vel = particles.positions, particles.velocities
+        point, edge, t, distance = self.find_contacts(pos)
+        if len(point) == 0:
+            return 0
+        a, b = self.edges[edge, 0], self.edges[edge, 1]
+        d = pos[b] - pos[a]
+        diff = pos[point] - (pos[a] + t[:, None] * d)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Points outside are pushed straight away from the closest point,
+            # so a point beside a corner is not kicked along the edge normal.
+            # Points that slipped inside go back out through their nearest
+            # outline edge.
+            side = self.edge_sides[edge][:, None]
+            outward = -side * np.stack((-d[:, 1], d[:, 0]), axis=1) / np.linalg.norm(d, axis=1)[:, None]
+            away = diff / distance[:, None]
+            fallback = np.where((side != 0) & np.isfinite(outward), outward, (0.0, -1.0))
+            normal = np.where((distance[:, None] > 0) & np.isfinite(away), away, fallback)
+        gap = np.einsum("ij,ij->i", diff, normal)
+        # An inside point's gap along the edge normal is negative
+        gap = np.where(distance < 0, np.minimum(gap, distance), gap)
+
+        inv_mass = 1 / particles.masses
+        wa, wb = 1 - t, t
+        inv_point = inv_mass[point]
+        inv_edge = wa * wa * inv_mass[a] + wb * wb * inv_mass[b]
+        inv_total = inv_point + inv_edge
+
+        # Each particle's share of every contact it is part of: the point and
+        # both edge ends, weighted by inverse mass and split across the edge by
+        # `t`. Touching surfaces produce contacts both ways, so particles
+        # average their contacts rather than summing them.
+        rows = np.concatenate((point, a, b))
+        share = np.concatenate((inv_point, -wa * inv_mass[a], -wb * inv_mass[b]))
+        share /= np.bincount(rows, minlength=len(pos))[rows]
+        share = share[:, None] * np.tile(normal, (3, 1))
+
+        # Positions: remove the penetration
+        push = (self.radius - gap) / inv_total
+        np.add.at(pos, rows, np.tile(push, 3)[:, None] * share)
+
+        # Velocities: cancel (and partly reverse) the approaching normal speed
+        edge_vel = wa[:, None] * vel[a] + wb[:, None] * vel[b]
+        approach = np.einsum("ij,ij->i", vel[point] - edge_vel, normal)
+        impulse = np.where(approach < 0, -(1 + self.restitution) * approach / inv_total, 0)
+        np.add.at(vel, rows, np.tile(impulse, 3)[:, None] * share)
+        return len(point)
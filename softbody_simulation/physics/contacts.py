@@ -0,0 +1,185 @@
+import numpy as np
+
+from softbody_simulation.consts import CONTACT_ITERATIONS, CONTACT_RESTING_SPEED, CONTACT_SKIN
+from softbody_simulation.entities import ParticleStore
+from softbody_simulation.utils import segment_distances
+from .collision import closest_on_segments
+
+
+class ContactCache:
+    """Point-vs-obstacle contacts kept from step to step.
+
+    Contacts are keyed by (point, obstacle edge) and carry the edge normal and
+    the normal impulse accumulated on them. A point that stays within `skin`
+    of where its contact was found keeps it without a narrowphase; contacts
+    that are found again pick up their previous impulse. Each step a
+    projected Gauss-Seidel solve starts from those impulses (warm-starting),
+    so points wedged between edges settle in a few sweeps, and slow approaches
+    are brought to rest instead of reflected, so resting points stop bouncing
+    on the spot.
+
+    The cache follows the obstacle list by identity and must be cleared when
+    particle rows are renumbered.
+    """
+
+    def __init__(self, skin: float = CONTACT_SKIN, resting_speed: float = CONTACT_RESTING_SPEED,
+                 iterations: int = CONTACT_ITERATIONS):
+        self.skin = skin
+        self.resting_speed = resting_speed
+        self.iterations = iterations
+        self.obstacles = []
+        self._pack_obstacles()
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self.point)
+
+    def clear(self) -> None:
+        self.point = np.empty(0, dtype=np.intp)
+        self.edge = np.empty(0, dtype=np.intp)
+        self.impulse = np.empty(0)
+        self.anchor = np.empty((0, 2))
+
+    def _pack_obstacles(self) -> None:
+        """Every obstacle's edges in one array, indexed by the contacts' `edge`."""
+        obstacles = self.obstacles
+        self.offsets = np.zeros(len(obstacles) + 1, dtype=np.intp)
+        np.cumsum([len(obstacle.edge_starts) for obstacle in obstacles], out=self.offsets[1:])
+        if not obstacles:
+            self.starts = self.ends = self.normals = np.empty((0, 2))
+            self.bounds = np.empty((0, 2, 2))
+            return
+        self.starts = np.concatenate([obstacle.edge_starts for obstacle in obstacles]).astype(np.float64)
+        self.ends = np.concatenate([obstacle.edge_ends for obstacle in obstacles]).astype(np.float64)
+        self.bounds = np.array([obstacle.bounds for obstacle in obstacles], dtype=np.float64)
+        d = self.ends - self.starts
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # NaN for zero-length edges, which are never picked
+            self.normals = np.stack((d[:, 1], -d[:, 0]), axis=1) / np.linalg.norm(d, axis=1)[:, None]
+
+    def _sync(self, obstacles, count: int) -> None:
+        if len(obstacles) != len(self.obstacles) or any(
+            new is not old for new, old in zip(obstacles, self.obstacles)
+        ):
+            self.obstacles = list(obstacles)
+            self._pack_obstacles()
+            self.clear()
+            return
+        valid = self.point < count
+        if not valid.all():
+            self.point, self.edge = self.point[valid], self.edge[valid]
+            self.impulse, self.anchor = self.impulse[valid], self.anchor[valid]
+
+    def _keys(self, point: np.ndarray, edge: np.ndarray) -> np.ndarray:
+        return point.astype(np.int64) * len(self.starts) + edge
+
+    def _detect(self, pos: np.ndarray, skip: np.ndarray, reach: float) -> tuple[np.ndarray, np.ndarray]:
+        """Nearest edge of each obstacle within `reach` of the points not in `skip`."""
+        points, edges = [], []
+        for index, (low, high) in enumerate(self.bounds):
+            near = ((pos >= low - reach) & (pos <= high + reach)).all(axis=1) & ~skip
+            near = np.flatnonzero(near)
+            if len(near) == 0:
+                continue
+            first, last = self.offsets[index], self.offsets[index + 1]
+            distances = segment_distances(pos[near], self.starts[first:last], self.ends[first:last])
+            distances[:, np.isnan(self.normals[first:last, 0])] = np.inf
+            nearest = np.argmin(distances, axis=1)
+            hit = distances[np.arange(len(near)), nearest] <= reach
+            points.append(near[hit])
+            edges.append(first + nearest[hit])
+        if not points:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        return np.concatenate(points), np.concatenate(edges)
+
+    def update(self, pos: np.ndarray, obstacles, radius: float, rows=None) -> None:
+        """Bring the contact set up to date with the current positions.
+
+        Only the points in `rows`, when given, are in contact.
+        """
+        self._sync(obstacles, len(pos))
+        excluded = np.zeros(len(pos), dtype=bool)
+        if rows is not None:
+            excluded[:] = True
+            excluded[rows] = False
+        offset = pos[self.point] - self.anchor
+        with np.errstate(invalid="ignore"):
+            settled = np.einsum("ij,ij->i", offset, offset) <= self.skin * self.skin
+        settled &= ~excluded[self.point]
+
+        # Everything else goes through the narrowphase; contacts found again
+        # keep their impulse
+        old_keys = self._keys(self.point, self.edge)
+        order = np.argsort(old_keys)
+        old_keys, old_impulse = old_keys[order], self.impulse[order]
+
+        skip = excluded
+        skip[self.point[settled]] = True
+        point, edge = self._detect(pos, skip, radius + self.skin)
+        keys = self._keys(point, edge)
+        found = np.minimum(np.searchsorted(old_keys, keys), max(len(old_keys) - 1, 0))
+        impulse = np.zeros(len(point))
+        if len(old_keys):
+            impulse = np.where(old_keys[found] == keys, old_impulse[found], 0.0)
+
+        self.point = np.concatenate((self.point[settled], point))
+        self.edge = np.concatenate((self.edge[settled], edge))
+        self.impulse = np.concatenate((self.impulse[settled], impulse))
+        self.anchor = np.concatenate((self.anchor[settled], pos[point]))
+
+    def resolve(self, particles: ParticleStore, obstacles, radius: float, bounciness: float,
+                rows=None) -> None:
+        """Push touching points out of the obstacles and solve their normal velocities.
+
+        Approaches faster than `resting_speed` bounce with `bounciness`; slower
+        ones are brought to rest against the edge. `rows` limits the solve to
+        those points.
+        """
+        pos, vel, mass = particles.positions, particles.velocities, particles.masses
+        self.update(pos, obstacles, radius, rows)
+        if len(self.point) == 0:
+            return
+        point, edge = self.point, self.edge
+        normal = self.normals[edge]
+        starts, ends = self.starts[edge], self.ends[edge]
+        _, distance_sq = closest_on_segments(pos[point], starts, ends)
+        distance = np.sqrt(distance_sq)
+        # Contacts kept within the skin but not touching carry no impulse
+        active = distance <= radius
+        impulse = np.where(active, self.impulse, 0.0)
+
+        penetration = radius - distance
+        push = np.where(active & (penetration > 0), penetration + 1e-3, 0.0)
+        np.add.at(pos, point, normal * push[:, None])
+
+        inv_mass = 1 / mass[point]
+        approach = np.einsum("ij,ij->i", vel[point], normal)
+        impact = active & (approach < -self.resting_speed)
+        target = np.where(impact, -bounciness * approach, 0.0)
+
+        # Warm start from last step's impulses, then sweep the contacts towards
+        # their target normal speeds; the accumulated impulse can only push.
+        # A point's contacts go in separate rounds, so every round updates
+        # each point at most once and the sweep stays vectorized.
+        np.add.at(vel, point, (impulse * inv_mass)[:, None] * normal)
+        order = np.argsort(point, kind="stable")
+        first = np.flatnonzero(np.diff(point[order], prepend=-1))
+        rank = np.empty(len(point), dtype=np.intp)
+        rank[order] = np.arange(len(point)) - np.repeat(first, np.diff(first, append=len(point)))
+        rounds = [np.flatnonzero(rank == r) for r in range(rank.max() + 1)]
+        # One sweep is exact when no point has a second contact
+        for _ in range(self.iterations if len(rounds) > 1 else 1):
+            for rows in rounds:
+                p, n = point[rows], normal[rows]
+                speed = np.einsum("ij,ij->i", vel[p], n)
+                accumulated = np.maximum(impulse[rows] + (target[rows] - speed) / inv_mass[rows], 0)
+                accumulated = np.where(active[rows], accumulated, 0.0)
+                vel[p] += ((accumulated - impulse[rows]) * inv_mass[rows])[:, None] * n
+                impulse[rows] = accumulated
+        self.impulse = impulse
+
+        # Bounces keep `bounciness` of their tangential speed too
+        if bounciness != 1 and impact.any():
+            rows, n = point[impact], normal[impact]
+            tangential = vel[rows] - np.einsum("ij,ij->i", vel[rows], n)[:, None] * n
+            vel[rows] -= (1 - bounciness) * tangential
@@ -0,0 +1,256 @@
+from dataclasses import asdict, dataclass, fields as dataclass_fields
+from typing import ClassVar
+
+import numpy as np
+
+from softbody_simulation.consts import FIELD_RADIUS, FIELD_SOFTENING
+
+
+def _box(low, high) -> tuple[np.ndarray, np.ndarray]:
+    low = np.full(2, -np.inf) if low is None else np.asarray(low, dtype=np.float64)
+    high = np.full(2, np.inf) if high is None else np.asarray(high, dtype=np.float64)
+    return low, high
+
+
+@dataclass(frozen=True)
+class UniformField:
+    """Constant acceleration, limited to the box `low..high` when one is given."""
+
+    kind: ClassVar[str] = "uniform"
+    acceleration: tuple
+    low: tuple | None = None
+    high: tuple | None = None
+
+    @property
+    def bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        return _box(self.low, self.high)
+
+
+@dataclass(frozen=True)
+class RadialField:
+    """Softened inverse-square pull towards `center` within `radius`.
+
+    A negative strength pushes away instead, so the same field serves as an
+    attractor, a repulsor or a gravity well.
+    """
+
+    kind: ClassVar[str] = "radial"
+    center: tuple
+    strength: float
+    radius: float = FIELD_RADIUS
+    softening: float = FIELD_SOFTENING
+
+    @property
+    def bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        center = np.asarray(self.center, dtype=np.float64)
+        return center - self.radius, center + self.radius
+
+
+@dataclass(frozen=True)
+class DragRegion:
+    """Drag towards the velocity `flow` at `rate` per second inside the box `low..high`.
+
+    With a non-zero flow the region is a wind.
+    """
+
+    kind: ClassVar[str] = "drag"
+    low: tuple
+    high: tuple
+    rate: float
+    flow: tuple = (0.0, 0.0)
+
+    @property
+    def bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        return _box(self.low, self.high)
+
+
+@dataclass(frozen=True, eq=False)
+class VectorGrid:
+    """Acceleration sampled bilinearly from `vectors`, a (rows, columns, 2) grid.
+
+    Node `(i, j)` sits at `origin + (j, i) * cell_size`; there is no force
+    outside the grid.
+    """
+
+    kind: ClassVar[str] = "grid"
+    origin: tuple
+    cell_size: float
+    vectors: np.ndarray
+
+    def __post_init__(self):
+        object.__setattr__(self, "vectors", np.asarray(self.vectors, dtype=np.float64))
+
+    @property
+    def bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        origin = np.asarray(self.origin, dtype=np.float64)
+        rows, columns = self.vectors.shape[:2]
+        return origin, origin + (np.array([columns, rows]) - 1) * self.cell_size
+
+    def sample(self, pos: np.ndarray) -> np.ndarray:
+        rows, columns = self.vectors.shape[:2]
+        cell = (pos - np.asarray(self.origin, dtype=np.float64)) / self.cell_size
+        inside = ((cell >= 0) & (cell <= (columns - 1, rows - 1))).all(axis=1)
+        cell = np.where(inside[:, None], cell, 0)
+        # Clamp the base node so points on the far edges interpolate the last cell
+        base = np.minimum(cell.astype(np.intp), (max(columns - 2, 0), max(rows - 2, 0)))
+        fx, fy = (cell - base).T
+        x0, y0 = base.T
+        x1, y1 = np.minimum(x0 + 1, columns - 1), np.minimum(y0 + 1, rows - 1)
+        v = self.vectors
+        top = v[y0, x0] * (1 - fx)[:, None] + v[y0, x1] * fx[:, None]
+        bottom = v[y1, x0] * (1 - fx)[:, None] + v[y1, x1] * fx[:, None]
+        return np.where(inside[:, None], top * (1 - fy)[:, None] + bottom * fy[:, None], 0)
+
+
+FIELD_TYPES = {field.kind: field for field in (UniformField, RadialField, DragRegion, VectorGrid)}
+
+
+def field_to_dict(field) -> dict:
+    """JSON-ready description of `field`, the inverse of `field_from_dict`."""
+    data = {"kind": field.kind}
+    for name, value in asdict(field).items():
+        data[name] = value.tolist() if isinstance(value, np.ndarray) else value
+    return data
+
+
+def field_from_dict(data: dict):
+    data = dict(data)
+    field_type = FIELD_TYPES.get(data.pop("kind", None))
+    if field_type is None:
+        raise ValueError(f"Unknown force field: {data}")
+    names = {f.name for f in dataclass_fields(field_type)}
+    return field_type(**{
+        name: tuple(value) if isinstance(value, list) and name != "vectors" else value
+        for name, value in data.items() if name in names
+    })
+
+
+class ForceFields:
+    """The external force fields of a world, layered on top of gravity.
+
+    Fields of one kind are packed into parameter arrays and evaluated together
+    as one (points x fields) operation, so the cost depends on how many
+    fields there are, not on how many overlap any given point. Vector grids
+    each have their own nodes and are sampled one after another.
+    """
+
+    def __init__(self, fields=()):
+        self.fields = list(fields)
+        self._packed = None
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def add(self, field) -> None:
+        self.fields.append(field)
+        self._packed = None
+
+    def replace(self, fields) -> None:
+        self.fields = list(fields)
+        self._packed = None
+
+    def clear(self) -> None:
+        self.replace(())
+
+    def _pack(self) -> dict:
+        if self._packed is not None:
+            return self._packed
+        by_kind = {kind: [f for f in self.fields if f.kind == kind] for kind in FIELD_TYPES}
+        packed = {"grids": by_kind["grid"]}
+
+        def boxes(fields):
+            bounds = [f.bounds for f in fields]
+            return (np.array([low for low, _ in bounds]).reshape(-1, 2),
+                    np.array([high for _, high in bounds]).reshape(-1, 2))
+
+        if by_kind["uniform"]:
+            uniform = by_kind["uniform"]
+            acceleration = np.array([f.acceleration for f in uniform], dtype=np.float64)
+            packed["uniform"] = (*boxes(uniform), acceleration)
+        if by_kind["radial"]:
+            radial = by_kind["radial"]
+            packed["radial"] = tuple(
+                np.array(values, dtype=np.float64) for values in (
+                    [f.center for f in radial], [f.strength for f in radial],
+                    [f.radius for f in radial], [f.softening for f in radial],
+                )
+            )
+        if by_kind["drag"]:
+            drag = by_kind["drag"]
+            rate = np.array([f.rate for f in drag], dtype=np.float64)
+            flow = np.array([f.flow for f in drag], dtype=np.float64)
+            packed["drag"] = (*boxes(drag), rate, rate[:, None] * flow)
+        self._packed = packed
+        return packed
+
+    @staticmethod
+    def _inside(pos: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        """(N, F) float mask of the points inside each box."""
+        p = pos[:, None, :]
+        return ((p >= low) & (p <= high)).all(axis=2).astype(np.float64)
+
+    def accelerations(self, pos: np.ndarray, vel: np.ndarray, driven: np.ndarray | None = None) -> np.ndarray:
+        """(N, 2) sum of every field's acceleration at the given points.
+
+        The part from fields without a potential is also added into `driven`
+        when one is given.
+        """
+        packed = self._pack()
+        accel = np.zeros(pos.shape, dtype=np.float64)
+        terms = []
+        if "uniform" in packed:
+            low, high, acceleration = packed["uniform"]
+            terms.append(self._inside(pos, low, high) @ acceleration)
+            accel += terms[-1]
+        if "radial" in packed:
+            center, strength, radius, softening = packed["radial"]
+            rel = center[None, :, :] - pos[:, None, :]
+            distance_sq = np.einsum("nfj,nfj->nf", rel, rel)
+            inverse = 1 / (distance_sq + softening * softening)
+            scale = np.where(distance_sq <= radius * radius, strength * inverse * np.sqrt(inverse), 0)
+            accel += np.einsum("nf,nfj->nj", scale, rel)
+        if "drag" in packed:
+            low, high, rate, pull = packed["drag"]
+            inside = self._inside(pos, low, high)
+            terms.append(inside @ pull - (inside @ rate)[:, None] * vel)
+            accel += terms[-1]
+        for grid in packed["grids"]:
+            terms.append(grid.sample(pos))
+            accel += terms[-1]
+        if driven is not None:
+            for term in terms:
+                driven += term
+        return accel
+
+    def accumulate(self, pos: np.ndarray, vel: np.ndarray, mass: np.ndarray, out: np.ndarray) -> float:
+        """Add the field forces on the given points into `out`.
+
+        Returns the power of the fields without a potential: the rate at
+        which they do work that `potential` does not account for.
+        """
+        if not self.fields:
+            return 0.0
+        driven = np.zeros(pos.shape, dtype=np.float64)
+        out += self.accelerations(pos, vel, driven) * mass[:, None]
+        return float(np.einsum("ij,ij,i->", driven, vel, mass))
+
+    def potential(self, pos: np.ndarray, mass: np.ndarray) -> float:
+        """Potential energy of the radial fields, the conservative ones.
+
+        Measured so it is never negative: from the bottom of each attractor's
+        well and from the edge of each repulsor. Uniform fields limited to a
+        box, drag and grids have no potential and do work instead.
+        """
+        packed = self._pack()
+        if "radial" not in packed:
+            return 0.0
+        center, strength, radius, softening = packed["radial"]
+        rel = center[None, :, :] - pos[:, None, :]
+        distance_sq = np.minimum(np.einsum("nfj,nfj->nf", rel, rel), radius * radius)
+        depth = 1 / softening - 1 / np.sqrt(distance_sq + softening * softening)
+        edge = 1 / softening - 1 / np.sqrt(radius * radius + softening * softening)
+        level = strength * (depth - np.where(strength < 0, edge, 0))
+        return float(np.dot(np.asarray(mass, dtype=np.float64), level.sum(axis=1)))
@@ -0,0 +1,124 @@
+"""Loop kernels for the Numba backend.
+
+Each kernel is the scalar-loop equivalent of a NumPy kernel and writes into
+preallocated arrays. They are compiled with Numba when it is installed and
+stay plain Python otherwise, which keeps them importable (and testable)
+without it.
+"""
+import math
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+
+def _jit(func):
+    return numba.njit(cache=True)(func) if NUMBA_AVAILABLE else func
+
+
+@_jit
+def spring_forces_loop(pos, vel, a, b, rest_length, stiffness, damping, out):
+    out[:] = 0
+    for i in range(len(a)):
+        ia, ib = a[i], b[i]
+        dx = pos[ib, 0] - pos[ia, 0]
+        dy = pos[ib, 1] - pos[ia, 1]
+        length = math.sqrt(dx * dx + dy * dy)
+        if length != 0:
+            dx /= length
+            dy /= length
+        else:
+            dx = dy = 0.0
+
+        proj = (vel[ib, 0] - vel[ia, 0]) * dx + (vel[ib, 1] - vel[ia, 1]) * dy
+        magnitude = stiffness[i] * (length - rest_length[i]) + damping[i] * proj
+        out[ia, 0] += magnitude * dx
+        out[ia, 1] += magnitude * dy
+        out[ib, 0] -= magnitude * dx
+        out[ib, 1] -= magnitude * dy
+
+
+@_jit
+def accelerate_loop(state, force, mass, damping, use_gravity, gravity, delta_time, radius,
+                    bounciness, width, height, edge_starts, edge_ends, edge_offsets,
+                    obstacle_bounds):
+    for p in range(len(mass)):
+        fx = force[p, 0] - damping[p] * state[p, 2]
+        fy = force[p, 1] - damping[p] * state[p, 3]
+        if use_gravity[p]:
+            fy -= gravity * mass[p]
+        vx = state[p, 2] + fx * delta_time / mass[p]
+        vy = state[p, 3] + fy * delta_time / mass[p]
+        x, y = state[p, 0], state[p, 1]
+
+        # Walls
+        if x - radius <= 0:
+            x, vx = radius, -vx
+        elif x + radius >= width:
+            x, vx = width - radius, -vx
+        if y - radius <= 0:
+            y, vy = radius, -vy
+        elif y + radius >= height:
+            y, vy = height - radius, -vy
+
+        # Obstacles: reflect off the first edge within `radius`
+        for o in range(len(edge_offsets) - 1):
+            if (x < obstacle_bounds[o, 0, 0] - radius or x > obstacle_bounds[o, 1, 0] + radius
+                    or y < obstacle_bounds[o, 0, 1] - radius or y > obstacle_bounds[o, 1, 1] + radius):
+                continue
+
+            hit = -1
+            distance = 0.0
+            for e in range(edge_offsets[o], edge_offsets[o + 1]):
+                sx, sy = edge_starts[e, 0], edge_starts[e, 1]
+                ex, ey = edge_ends[e, 0] - sx, edge_ends[e, 1] - sy
+                length_sq = ex * ex + ey * ey
+                t = ((x - sx) * ex + (y - sy) * ey) / length_sq if length_sq > 0 else 0.0
+                t = min(max(t, 0.0), 1.0)
+                cx, cy = x - (sx + t * ex), y - (sy + t * ey)
+                distance = math.sqrt(cx * cx + cy * cy)
+                if distance <= radius:
+                    hit = e
+                    break
+            if hit < 0:
+                continue
+
+            ex = edge_ends[hit, 0] - edge_starts[hit, 0]
+            ey = edge_ends[hit, 1] - edge_starts[hit, 1]
+            norm = math.sqrt(ex * ex + ey * ey)
+            if norm == 0:
+                continue
+            nx, ny = ey / norm, -ex / norm
+            penetration = radius - distance
+            if penetration > 0:
+                x += nx * (penetration + 1e-3)
+                y += ny * (penetration + 1e-3)
+            v_dot_n = vx * nx + vy * ny
+            if v_dot_n < 0:
+                vx = (vx - 2 * v_dot_n * nx) * bounciness
+                vy = (vy - 2 * v_dot_n * ny) * bounciness
+
+        state[p, 0] = x
+        state[p, 1] = y
+        state[p, 2] = vx
+        state[p, 3] = vy
+
+
+@_jit
+def advance_loop(state, force, delta_time):
+    for p in range(len(state)):
+        state[p, 0] += state[p, 2] * delta_time
+        state[p, 1] += state[p, 3] * delta_time
+        force[p, 0] = 0
+        force[p, 1] = 0
+
+
+@_jit
+def cell_keys_loop(positions, cell_size, limit, out):
+    for i in range(len(positions)):
+        cx = min(max(math.floor(positions[i, 0] / cell_size), -limit), limit)
+        cy = min(max(math.floor(positions[i, 1] / cell_size), -limit), limit)
+        out[i] = (int(cx) << 31) + int(cy)
@@ -0,0 +1,180 @@
+import numpy as np
+
+from softbody_simulation.consts import GRAVITY, MAX_SUBSTEPS, STABILITY_SAFETY, WIN_SIZE
+from softbody_simulation.entities import IncidenceMatrix, MassPoint, ParticleStore
+from softbody_simulation.utils import segment_distances
+
+
+def scatter_spring_forces(f: np.ndarray, a: np.ndarray, b: np.ndarray, n: int) -> np.ndarray:
+    """Sum (..., S, 2) spring forces onto (..., n, 2) points: +f on `a`, -f on `b`."""
+    batch = f.shape[:-2]
+    count = int(np.prod(batch, dtype=np.intp))
+    base = (np.arange(count) * n)[:, None]
+    idx_a = (base + a).ravel()
+    idx_b = (base + b).ravel()
+    f = f.reshape(-1, 2)
+
+    forces = np.empty((count * n, 2), dtype=f.dtype)
+    for axis in range(2):
+        forces[:, axis] = (
+            np.bincount(idx_a, weights=f[:, axis], minlength=count * n)
+            - np.bincount(idx_b, weights=f[:, axis], minlength=count * n)
+        )
+    return forces.reshape(*batch, n, 2)
+
+
+def spring_forces(pos: np.ndarray, vel: np.ndarray, a: np.ndarray, b: np.ndarray,
+                  rest_length, stiffness, damping, incidence=None) -> np.ndarray:
+    """Hooke plus damping forces for springs `a[i] <-> b[i]`.
+
+    `pos` and `vel` are `(..., N, 2)`; any leading axes are independent
+    instances that share the same topology and are processed as one batch.
+    With the springs' `IncidenceMatrix`, unbatched forces are accumulated as
+    one `B.T` product.
+    """
+    d = pos[..., b, :] - pos[..., a, :]
+    length = np.sqrt(np.einsum("...i,...i->...", d, d))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        direction = np.where(length[..., None] != 0, d / length[..., None], 0.0)
+
+    dv = vel[..., b, :] - vel[..., a, :]
+    proj = np.einsum("...i,...i->...", dv, direction)
+
+    magnitude = stiffness * (length - rest_length) + damping * proj
+    if incidence is not None and pos.ndim == 2:
+        # B.T puts +f on `b`; the pull on `a` is along +direction
+        np.negative(magnitude, out=magnitude)
+        return incidence.transpose_dot(magnitude[:, None] * direction)
+    return scatter_spring_forces(magnitude[..., None] * direction, a, b, pos.shape[-2])
+
+
+def stable_timestep(mass: np.ndarray, point_damping: np.ndarray, incidence: IncidenceMatrix,
+                    stiffness, damping, safety: float = STABILITY_SAFETY) -> float:
+    """Largest timestep the semi-implicit Euler step stays stable at.
+
+    Bounds the fastest mode per point by Gershgorin's theorem: a point's row
+    of the stiffness Laplacian gives `omega**2 <= 2 * degree(k) / m`, and
+    likewise `gamma <= 2 * degree(c) / m`. The step must stay below
+    `2 / lambda` for the fastest root
+    `lambda = gamma / 2 + sqrt(gamma**2 / 4 + omega**2)`.
+    """
+    if len(mass) == 0:
+        return np.inf
+    total_stiffness = incidence.degree(stiffness)
+    total_damping = incidence.degree(damping)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        omega2 = 2 * total_stiffness / mass
+        gamma = (2 * total_damping + point_damping) / mass
+        rate = np.nanmax(gamma / 2 + np.sqrt(gamma * gamma / 4 + omega2))
+    return safety * 2 / rate if rate > 0 else np.inf
+
+
+def substep_count(delta_time: float, stable_dt: float, max_substeps: int = MAX_SUBSTEPS) -> int:
+    if not delta_time < stable_dt * max_substeps:
+        return max_substeps
+    return max(1, int(np.ceil(delta_time / stable_dt)))
+
+
+def system_energy(particles: ParticleStore, a: np.ndarray, b: np.ndarray, rest_length,
+                  stiffness, floor: float) -> float:
+    """Total kinetic, spring-potential and gravitational energy of the store.
+
+    Gravitational energy is measured up from `floor`, the bottom wall, so the
+    total is non-negative while every point is inside the world. A non-finite
+    result means some position or velocity is no longer finite. The sums are
+    taken in float64 whatever the store's dtype.
+    """
+    pos, vel, mass = (
+        np.asarray(x, dtype=np.float64)
+        for x in (particles.positions, particles.velocities, particles.masses)
+    )
+    with np.errstate(over="ignore", invalid="ignore"):
+        kinetic = 0.5 * np.dot(mass, np.einsum("ij,ij->i", vel, vel))
+        d = pos[b] - pos[a]
+        stretch = np.sqrt(np.einsum("ij,ij->i", d, d)) - rest_length
+        potential = 0.5 * np.dot(np.broadcast_to(stiffness, stretch.shape), stretch * stretch)
+        height = np.where(particles.gravity_mask, floor - pos[:, 1], 0)
+        gravitational = -GRAVITY * np.dot(mass, height)
+        return float(kinetic + potential + gravitational)
+
+
+def boundary_collision(pos: np.ndarray, vel: np.ndarray, radius: float, bounds=WIN_SIZE) -> None:
+    for axis in range(2):
+        low = pos[:, axis] - radius <= 0
+        high = ~low & (pos[:, axis] + radius >= bounds[axis])
+        pos[low, axis] = radius
+        pos[high, axis] = bounds[axis] - radius
+        hit = low | high
+        vel[hit, axis] = -vel[hit, axis]
+
+
+def obstacle_collision(pos: np.ndarray, vel: np.ndarray, obstacle, radius: float,
+                       bounciness: float) -> None:
+    """Reflect points off the first edge of `obstacle` they are within `radius` of."""
+    starts, ends = obstacle.edge_starts, obstacle.edge_ends
+
+    # Only points within the obstacle's grown bounding box can touch an edge
+    low, high = obstacle.bounds
+    near = np.flatnonzero(((pos >= low - radius) & (pos <= high + radius)).all(axis=1))
+    if len(near) == 0:
+        return
+
+    distances = segment_distances(pos[near], starts, ends)
+    touching = distances <= radius
+    hit = touching.any(axis=1)
+    if not hit.any():
+        return
+
+    edge = np.argmax(touching[hit], axis=1)
+    edge_dir = ends[edge] - starts[edge]
+    norm = np.linalg.norm(edge_dir, axis=1)
+    valid = norm != 0
+    local = np.flatnonzero(hit)[valid]
+    rows = near[local]
+    edge_dir, norm, edge = edge_dir[valid], norm[valid], edge[valid]
+
+    normal = np.stack((edge_dir[:, 1], -edge_dir[:, 0]), axis=1) / norm[:, None]
+    penetration = radius - distances[local, edge]
+    push = np.where(penetration > 0, penetration + 1e-3, 0.0)
+    pos[rows] += normal * push[:, None]
+
+    v_dot_n = np.einsum("ij,ij->i", vel[rows], normal)
+    bounce = v_dot_n < 0
+    rows, normal, v_dot_n = rows[bounce], normal[bounce], v_dot_n[bounce]
+    vel[rows] = (vel[rows] - 2 * v_dot_n[:, None] * normal) * bounciness
+
+
+def integrate(particles: ParticleStore, delta_time: float, obstacles=(),
+              radius: float = MassPoint.RADIUS, bounciness: float = MassPoint.BOUNCINESS,
+              bounds=WIN_SIZE, contacts=None, rows=None) -> None:
+    """Vectorized equivalent of `MassPoint.update` for every point in the store.
+
+    With a `ContactCache`, obstacle contacts go through it instead of being
+    found afresh and reflected. `rows` limits the step to those points; the
+    others are left exactly as they are.
+    """
+    every = slice(None) if rows is None else rows
+    # Views of the whole store, or copies of `rows` written back below
+    pos, vel = particles.positions[every], particles.velocities[every]
+    force, mass = particles.forces[every], particles.masses[every]
+
+    force[:, 1] -= np.where(particles.gravity_mask[every], GRAVITY * mass, 0)
+    force -= particles.dampings[every][:, None] * vel
+    vel += force * delta_time / mass[:, None]
+
+    boundary_collision(pos, vel, radius, bounds)
+    if contacts is not None:
+        if rows is not None:
+            particles.velocities[rows], particles.positions[rows] = vel, pos
+        contacts.resolve(particles, obstacles, radius, bounciness, rows)
+        if rows is not None:
+            pos, vel = particles.positions[rows], particles.velocities[rows]
+    else:
+        for obstacle in obstacles:
+            obstacle_collision(pos, vel, obstacle, radius, bounciness)
+
+    pos += vel * delta_time
+    if rows is not None:
+        particles.velocities[rows], particles.positions[rows] = vel, pos
+    particles.forces[every] = 0
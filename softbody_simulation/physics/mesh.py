@@ -0,0 +1,97 @@
+import numpy as np
+
+from softbody_simulation.utils import points_in_polygon
+
+
+def _grid_springs(size, shear=True, bending=False) -> np.ndarray:
+    """Spring index pairs for a row-major `size[0] x size[1]` lattice.
+
+    Springs are ordered per cell (structural right, structural down, shear
+    diagonal, shear anti-diagonal, then bending), matching the order the
+    original nested loops produced.
+    """
+    nx, ny = size
+    index = np.arange(nx * ny).reshape(ny, nx)
+
+    kinds = [
+        (index[:, :-1], index[:, 1:]),
+        (index[:-1, :], index[1:, :]),
+    ]
+    if shear:
+        kinds.append((index[:-1, :-1], index[1:, 1:]))
+        kinds.append((index[:-1, 1:], index[1:, :-1]))
+    if bending:
+        kinds.append((index[:, :-2], index[:, 2:]))
+        kinds.append((index[:-2, :], index[2:, :]))
+
+    # Anchor each spring on its cell so the result interleaves per cell;
+    # the anti-diagonal starts at the cell's top-right point
+    a = np.concatenate([k[0].ravel() for k in kinds])
+    b = np.concatenate([k[1].ravel() for k in kinds])
+    cell = np.concatenate([
+        (k[0] - 1 if shear and i == 3 else k[0]).ravel() for i, k in enumerate(kinds)
+    ])
+    kind = np.repeat(np.arange(len(kinds)), [k[0].size for k in kinds])
+    order = np.lexsort((kind, cell))
+    return np.stack((a[order], b[order]), axis=1)
+
+
+def grid_mesh(pos, size, spacing, shear=True, bending=False) -> tuple[np.ndarray, np.ndarray]:
+    """Rectangular lattice of points with structural, shear and bending springs.
+
+    Returns `(points, springs)` where `points` is `(N, 2)` and `springs` is an
+    `(S, 2)` array of point indices.
+    """
+    xs = pos[0] + np.arange(size[0]) * spacing
+    ys = pos[1] + np.arange(size[1]) * spacing
+    points = np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 2)
+    return points, _grid_springs(size, shear, bending)
+
+
+def hex_mesh(pos, size, spacing, bending=False) -> tuple[np.ndarray, np.ndarray]:
+    """Hexagonally packed lattice where every point links to its six neighbours."""
+    nx, ny = size
+    index = np.arange(nx * ny).reshape(ny, nx)
+    row_height = spacing * np.sqrt(3) / 2
+
+    xs = np.arange(nx) * float(spacing)
+    ys = np.arange(ny) * row_height
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    grid_x[1::2] += spacing / 2
+    points = np.stack((grid_x + pos[0], grid_y + pos[1]), axis=-1).reshape(-1, 2)
+
+    even, odd = index[0:-1:2], index[1::2]
+    pairs = [
+        (index[:, :-1], index[:, 1:]),
+        (index[:-1, :], index[1:, :]),
+        # Even rows sit left of the next row, odd rows right of it
+        (even[:, 1:], index[1::2][:len(even), :-1]),
+        (odd[:len(index[2::2]), :-1], index[2::2][:, 1:]),
+    ]
+    if bending:
+        pairs.append((index[:, :-2], index[:, 2:]))
+    springs = np.concatenate(
+        [np.stack((a.ravel(), b.ravel()), axis=1) for a, b in pairs]
+    )
+    return points, springs
+
+
+def polygon_mesh(outline, spacing, shear=True, bending=False) -> tuple[np.ndarray, np.ndarray]:
+    """Fill an arbitrary polygon outline with a lattice at the given spacing."""
+    outline = np.asarray(outline, dtype=np.float64)
+    low, high = outline.min(axis=0), outline.max(axis=0)
+    size = tuple((np.floor((high - low) / spacing) + 1).astype(int))
+
+    points, springs = grid_mesh(low, size, spacing, shear, bending)
+    inside = points_in_polygon(points, outline)
+
+    remap = np.full(len(points), -1, dtype=np.intp)
+    remap[inside] = np.arange(inside.sum())
+    springs = remap[springs]
+    springs = springs[(springs >= 0).all(axis=1)]
+    return points[inside], springs
+
+
+def rest_lengths(points: np.ndarray, springs: np.ndarray) -> np.ndarray:
+    d = points[springs[:, 1]] - points[springs[:, 0]]
+    return np.sqrt(np.einsum("ij,ij->i", d, d))
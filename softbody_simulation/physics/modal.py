@@ -0,0 +1,352 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from softbody_simulation.consts import (
+    GRAVITY,
+    MODAL_LATTICE,
+    MODAL_MODES,
+    TEMPLATE_CACHE_SIZE,
+)
+from softbody_simulation.entities import IncidenceMatrix, MassPoint, ParticleStore
+from .collision import closest_on_segments
+from .contacts import ContactCache
+from .templates import BodyTemplate
+
+# Springs assembled per chunk, bounding the coarse assembly's temporaries
+_ASSEMBLY_CHUNK = 4096
+# Added to the contact coupling's diagonal, relative to its mean: keeps it
+# positive definite when contacts outnumber the reduced coordinates
+_CONTACT_COMPLIANCE = 1e-6
+
+
+@dataclass(frozen=True, eq=False)
+class ModalBasis:
+    """Lowest vibration modes of a template at rest, mass-normalized.
+
+    `shapes` is (2N, K) with row `2 * point + axis`; mode `k` has stiffness
+    `eigenvalues[k]` (its angular frequency squared) and damping
+    `damping[k]` per unit modal velocity.
+    """
+
+    rest: np.ndarray  # (N, 2) rest positions about the centre of mass
+    mass: float  # of every point
+    shapes: np.ndarray
+    eigenvalues: np.ndarray
+    damping: np.ndarray
+    inertia: float  # about the centre of mass, at rest
+
+    def __post_init__(self):
+        for array in (self.rest, self.shapes, self.eigenvalues, self.damping):
+            array.setflags(write=False)
+
+    @property
+    def mode_count(self) -> int:
+        return len(self.eigenvalues)
+
+
+def _lattice(points: np.ndarray, nodes_per_side: int) -> tuple[np.ndarray, np.ndarray, int]:
+    """Bilinear interpolation from a coarse lattice over `points`.
+
+    Returns each point's lattice nodes and weights, `(N, w)` each, and the
+    node count. Bodies with no more points than lattice nodes interpolate
+    from themselves.
+    """
+    n = len(points)
+    low = points.min(axis=0)
+    extent = points.max(axis=0) - low
+    cell = max(float(extent.max()), 1e-9) / (nodes_per_side - 1)
+    shape = np.floor(extent / cell).astype(np.intp) + 2
+    if n <= shape.prod():
+        return np.arange(n)[:, None], np.ones((n, 1)), n
+
+    local = (points - low) / cell
+    base = np.minimum(local.astype(np.intp), shape - 2)
+    fx, fy = (local - base).T
+    x, y = base.T
+    nodes = np.stack((y * shape[0] + x, y * shape[0] + x + 1,
+                      (y + 1) * shape[0] + x, (y + 1) * shape[0] + x + 1), axis=1)
+    weights = np.stack(((1 - fx) * (1 - fy), fx * (1 - fy), (1 - fx) * fy, fx * fy), axis=1)
+    # Only nodes some point really interpolates from become unknowns; the
+    # others would have no mass
+    weights[weights < 1e-6] = 0
+    nodes = np.where(weights > 0, nodes, nodes[np.arange(n), weights.argmax(axis=1)][:, None])
+    used, nodes = np.unique(nodes, return_inverse=True)
+    return nodes.reshape(n, 4), weights, len(used)
+
+
+def _assemble_stiffness(template: BodyTemplate, nodes: np.ndarray, weights: np.ndarray,
+                        size: int) -> np.ndarray:
+    """Galerkin stiffness `P.T @ K @ P` of the springs linearized at rest."""
+    points, a, b = template.points, template.springs[:, 0], template.springs[:, 1]
+    d = points[b] - points[a]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        direction = np.nan_to_num(d / np.linalg.norm(d, axis=1)[:, None])
+
+    stiffness = np.zeros((2 * size) ** 2)
+    for start in range(0, len(a), _ASSEMBLY_CHUNK):
+        chunk = slice(start, start + _ASSEMBLY_CHUNK)
+        # Each spring stretches along its direction by (P[b] - P[a]) @ u
+        node = np.concatenate((nodes[b[chunk]], nodes[a[chunk]]), axis=1)
+        weight = np.concatenate((weights[b[chunk]], -weights[a[chunk]]), axis=1)
+        dof = (2 * node[:, :, None] + np.arange(2)).reshape(len(node), -1)
+        row = (weight[:, :, None] * direction[chunk, None, :]).reshape(len(node), -1)
+        entries = template.stiffness[chunk, None, None] * row[:, :, None] * row[:, None, :]
+        keys = dof[:, :, None] * (2 * size) + dof[:, None, :]
+        stiffness += np.bincount(keys.ravel(), entries.ravel(), (2 * size) ** 2)
+    return stiffness.reshape(2 * size, 2 * size)
+
+
+def _assemble_mass(nodes: np.ndarray, weights: np.ndarray, mass: float, size: int) -> np.ndarray:
+    """Galerkin mass `P.T @ M @ P`; both axes share one block."""
+    keys = nodes[:, :, None] * size + nodes[:, None, :]
+    entries = mass * weights[:, :, None] * weights[:, None, :]
+    block = np.bincount(keys.ravel(), entries.ravel(), size * size).reshape(size, size)
+    return np.kron(block, np.eye(2))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def modal_basis(template: BodyTemplate, mode_count: int = MODAL_MODES, mass: float = 1,
+                lattice: int = MODAL_LATTICE) -> ModalBasis:
+    """Compute (or fetch the memoized) lowest modes of `template`'s spring system.
+
+    Large bodies are reduced to a `lattice` x `lattice` bilinear lattice
+    first, so the eigenproblem stays small whatever the point count; the
+    springs are still assembled exactly onto it. Rigid motions and
+    mechanisms (zero-stiffness modes) are left out.
+    """
+    points = template.points
+    rest = points - points.mean(axis=0)
+    nodes, weights, size = _lattice(points, lattice)
+
+    stiffness = _assemble_stiffness(template, nodes, weights, size)
+    cholesky = np.linalg.cholesky(_assemble_mass(nodes, weights, mass, size))
+    inverse = np.linalg.inv(cholesky)
+    eigenvalues, vectors = np.linalg.eigh(inverse @ stiffness @ inverse.T)
+    flexible = eigenvalues > 1e-9 * max(eigenvalues.max(), 1e-300)
+    eigenvalues = eigenvalues[flexible][:mode_count]
+    coarse = (inverse.T @ vectors[:, flexible][:, :mode_count]).reshape(size, 2, -1)
+
+    # Interpolate the coarse shapes onto the points
+    shapes = np.einsum("nw,nwjk->njk", weights, coarse[nodes]).reshape(2 * len(points), -1)
+
+    # Modal damping from the spring dampers, keeping only the diagonal
+    incidence = IncidenceMatrix(template.springs[:, 0], template.springs[:, 1], len(points))
+    d = incidence.dot(points)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        direction = np.nan_to_num(d / np.linalg.norm(d, axis=1)[:, None])
+    stretch = np.einsum("sj,sjk->sk", direction, incidence.dot(shapes.reshape(len(points), 2, -1)))
+    damping = template.damping @ (stretch * stretch)
+
+    inertia = mass * float(np.einsum("ij,ij->", rest, rest))
+    return ModalBasis(rest, float(mass), shapes, eigenvalues, damping, inertia)
+
+
+def _cross(r: np.ndarray, v: np.ndarray) -> np.ndarray:
+    return r[:, 0] * v[:, 1] - r[:, 1] * v[:, 0]
+
+
+def _push_impulses(coupling: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Impulses `x >= 0` minimizing `x @ coupling @ x / 2 - x @ targets`.
+
+    Solved by active set (Lawson-Hanson): the contact furthest short of its
+    target joins the free set, whose impulses come from one small linear
+    solve, and contacts that would have to pull leave it again. The free set
+    starts as every contact with a positive target. For a
+    positive definite `coupling` this ends after a few solves with the exact
+    answer, where Gauss-Seidel needs sweeps over every contact.
+    """
+    n = len(targets)
+    impulses = np.zeros(n)
+    tolerance = 1e-9 * max(float(np.abs(targets).max(initial=0)), 1e-12)
+    # Start from every contact asking for a push, dropping those that pull
+    free = targets > tolerance
+    while free.any():
+        rows = np.flatnonzero(free)
+        solved = np.linalg.solve(coupling[np.ix_(rows, rows)], targets[rows])
+        if (solved > tolerance).all():
+            impulses[rows] = solved
+            break
+        free[rows[solved <= tolerance]] = False
+
+    for _ in range(3 * n):
+        shortfall = np.where(free, -np.inf, targets - coupling @ impulses)
+        if shortfall.max(initial=-np.inf) <= tolerance:
+            break
+        free[np.argmax(shortfall)] = True
+        while True:
+            rows = np.flatnonzero(free)
+            solved = np.linalg.solve(coupling[np.ix_(rows, rows)], targets[rows])
+            if (solved > tolerance).all():
+                impulses[rows] = solved
+                break
+            # Go towards the solution until the first impulse reaches zero
+            current = impulses[rows]
+            low = solved <= tolerance
+            step = np.min(current[low] / (current[low] - solved[low]))
+            impulses[rows] = current + step * (solved - current)
+            out = rows[impulses[rows] <= tolerance]
+            impulses[out] = 0
+            free[out] = False
+    return impulses
+
+
+class ModalBody:
+    """A stiff body stepped as rigid motion plus its lowest vibration modes.
+
+    The body owns particle rows in `particles` so it is drawn and collided
+    like any other, but those rows are written here every step and must not
+    be integrated elsewhere. A step costs O(K) for the reduced coordinates
+    and one (2N, K) product to rebuild the points, whatever the number of
+    springs; the modes are integrated implicitly, so stiffness needs no
+    substeps. Contacts are solved as normal impulses on the reduced
+    coordinates, over the touching points only.
+    """
+
+    def __init__(self, particles: ParticleStore, template: BodyTemplate, offset,
+                 angle: float = 0.0, mass: float = 1, velocity=(0, 0), use_gravity=True,
+                 mode_count: int = MODAL_MODES):
+        self.particles = particles
+        self.template = template
+        self.basis = modal_basis(template, mode_count, float(mass))
+        self.use_gravity = use_gravity
+        self.angle = float(angle)
+
+        # Placed like `BodyInstances.spawn`: rotated about the template origin
+        rotation = self._rotation()
+        origin = template.points.mean(axis=0) @ rotation.T
+        self.center = np.asarray(offset, dtype=np.float64) + origin
+        self.velocity = np.asarray(velocity, dtype=np.float64).copy()
+        self.spin = 0.0
+        self.modes = np.zeros(self.basis.mode_count)
+        self.mode_velocities = np.zeros(self.basis.mode_count)
+        self.contacts = ContactCache()
+
+        positions = self._local() @ rotation.T + self.center
+        handles = MassPoint.spawn_many(particles, positions, mass, velocity, use_gravity)
+        self.rows = np.fromiter((h.index for h in handles), dtype=np.intp, count=len(handles))
+
+    def _rotation(self) -> np.ndarray:
+        c, s = np.cos(self.angle), np.sin(self.angle)
+        return np.array([[c, -s], [s, c]])
+
+    def _local(self) -> np.ndarray:
+        """Body-frame point offsets for the current modal coordinates."""
+        return self.basis.rest + (self.basis.shapes @ self.modes).reshape(-1, 2)
+
+    def _write_back(self) -> None:
+        """Rebuild the particle positions and velocities from the reduced state."""
+        rotation = self._rotation()
+        offsets = self._local() @ rotation.T
+        deform = (self.basis.shapes @ self.mode_velocities).reshape(-1, 2) @ rotation.T
+        spin = self.spin * np.stack((-offsets[:, 1], offsets[:, 0]), axis=1)
+        state = self.particles.state
+        state[self.rows, 0:2] = self.center + offsets
+        state[self.rows, 2:4] = self.velocity + spin + deform
+
+    def _reduce(self, vectors: np.ndarray) -> tuple[np.ndarray, float, np.ndarray]:
+        """Project per-point world vectors onto (translation, rotation, modes)."""
+        rotation = self._rotation()
+        offsets = self.particles.positions[self.rows] - self.center
+        local = vectors @ rotation
+        modal = self.basis.shapes.T @ local.ravel()
+        return vectors.sum(axis=0), float(_cross(offsets, vectors).sum()), modal
+
+    def step(self, delta_time: float, bounds, obstacles=(), radius: float = MassPoint.RADIUS,
+             bounciness: float = MassPoint.BOUNCINESS) -> None:
+        """Advance by `delta_time` under gravity and the forces accumulated on the rows.
+
+        `bounds` is the size of the owner's world, whose walls the body bounces off.
+        """
+        basis, total_mass = self.basis, self.basis.mass * len(self.rows)
+        force, torque, modal = self._reduce(self.particles.force[self.rows])
+        self.particles.force[self.rows] = 0
+        if self.use_gravity:
+            force = force - np.array([0, GRAVITY * total_mass])
+
+        self.velocity += force / total_mass * delta_time
+        self.center += self.velocity * delta_time
+        self.spin += torque / basis.inertia * delta_time
+        self.angle += self.spin * delta_time
+        # Implicit Euler per mode: unconditionally stable for any stiffness
+        self.mode_velocities = (
+            self.mode_velocities + delta_time * (modal - basis.eigenvalues * self.modes)
+        ) / (1 + delta_time * basis.damping + delta_time * delta_time * basis.eigenvalues)
+        self.modes += self.mode_velocities * delta_time
+        self._write_back()
+        self._collide(obstacles, radius, bounciness, bounds)
+
+    def _contacts(self, obstacles, radius: float,
+                  bounds) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Touching points with their outward normals and penetration depths."""
+        pos = self.particles.positions[self.rows]
+        rows, normals, depths = [], [], []
+        for axis in range(2):
+            for side, limit in ((1.0, radius), (-1.0, bounds[axis] - radius)):
+                depth = side * (limit - pos[:, axis])
+                touching = np.flatnonzero(depth >= 0)
+                normal = np.zeros((len(touching), 2))
+                normal[:, axis] = side
+                rows.append(touching)
+                normals.append(normal)
+                depths.append(depth[touching])
+
+        contacts = self.contacts
+        contacts.update(pos, obstacles, radius)
+        _, distance_sq = closest_on_segments(pos[contacts.point], contacts.starts[contacts.edge],
+                                             contacts.ends[contacts.edge])
+        touching = distance_sq <= radius * radius
+        rows.append(contacts.point[touching])
+        normals.append(contacts.normals[contacts.edge[touching]])
+        depths.append(radius - np.sqrt(distance_sq[touching]))
+        return np.concatenate(rows), np.concatenate(normals), np.concatenate(depths)
+
+    def _solve(self, rows: np.ndarray, normals: np.ndarray, targets: np.ndarray,
+               rigid: bool = False) -> np.ndarray:
+        """Smallest reduced-coordinate change moving `rows` by `targets` along `normals`.
+
+        The unknowns are translation, rotation and (unless `rigid`) the modes,
+        weighted by their inverse masses, so a single contact responds the way
+        an impulse on that point would and many contacts are solved together.
+        Returns the change as (x, y, angle, *modes).
+        """
+        basis = self.basis
+        offsets = self.particles.positions[self.rows[rows]] - self.center
+        columns = [normals, _cross(offsets, normals)[:, None]]
+        scale = [np.full(2, 1 / np.sqrt(basis.mass * len(self.rows))), [1 / np.sqrt(basis.inertia)]]
+        if not rigid:
+            shapes = basis.shapes.reshape(-1, 2, basis.mode_count)[rows]
+            columns.append(np.einsum("nj,njm->nm", normals @ self._rotation(), shapes))
+            scale.append(np.ones(basis.mode_count))
+        scale = np.concatenate(scale)
+        columns = np.hstack(columns) * scale
+
+        # Each contact takes the impulse that meets its target given all the
+        # others, never a pulling one
+        coupling = columns @ columns.T
+        coupling[np.diag_indices_from(coupling)] += _CONTACT_COMPLIANCE * np.trace(coupling) / len(rows)
+        return _push_impulses(coupling, targets) @ columns * scale
+
+    def _collide(self, obstacles, radius, bounciness, bounds) -> None:
+        """Push the body out of walls and obstacles and stop or bounce its touching points."""
+        rows, normals, depths = self._contacts(obstacles, radius, bounds)
+        if len(rows) == 0:
+            return
+
+        # Pushing points out through the modes would store elastic energy,
+        # so penetration is corrected rigidly and only impulses deform
+        shift = self._solve(rows, normals, depths + 1e-3, rigid=True)
+        self.center += shift[:2]
+        self.angle += shift[2]
+
+        approach = np.einsum("ij,ij->i", self.particles.velocities[self.rows[rows]], normals)
+        closing = approach < 0
+        if closing.any():
+            approach = approach[closing]
+            bounce = np.where(approach < -self.contacts.resting_speed, bounciness, 0.0)
+            push = self._solve(rows[closing], normals[closing], -(1 + bounce) * approach)
+            self.velocity += push[:2]
+            self.spin += push[2]
+            self.mode_velocities += push[3:]
+        self._write_back()
@@ -0,0 +1,157 @@
+import numpy as np
+
+from softbody_simulation.consts import SPATIAL_CELL_SIZE
+from softbody_simulation.utils import segment_distances
+
+# Cell coordinates are clamped so the packed int64 key cannot overflow
+CELL_LIMIT = 2**29
+# Segments reaching further than this many cells from their midpoint are
+# kept in an always-checked list
+_MAX_SEGMENT_REACH = 4
+
+
+def _cell_keys(cells: np.ndarray) -> np.ndarray:
+    cells = np.clip(cells, -CELL_LIMIT, CELL_LIMIT).astype(np.int64)
+    return (cells[..., 0] << 31) + cells[..., 1]
+
+
+def cell_keys(positions: np.ndarray, cell_size: float) -> np.ndarray:
+    """Packed int64 key of the grid cell holding each (N, 2) position."""
+    return _cell_keys(np.floor(np.asarray(positions) / cell_size).astype(np.int64))
+
+
+class SpatialHash:
+    """Uniform grid over items, stored as items sorted by cell key.
+
+    Each item sits in exactly one cell; each lookup is a binary search over
+    the sorted keys.
+    """
+
+    def __init__(self, cell_size: float = SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.keys = np.empty(0, dtype=np.int64)
+        self.items = np.empty(0, dtype=np.intp)
+
+    def cell_of(self, positions: np.ndarray) -> np.ndarray:
+        return np.floor(np.asarray(positions) / self.cell_size).astype(np.int64)
+
+    def build(self, keys: np.ndarray, items: np.ndarray) -> None:
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.items = items[order]
+
+    def query_box(self, low, high) -> np.ndarray:
+        """Items registered in any cell overlapping the box `low..high`."""
+        (x0, y0), (x1, y1) = self.cell_of(low), self.cell_of(high)
+        # Keys sort by column first, so each column of the box is one run
+        xs = np.arange(x0, x1 + 1)
+        starts = np.searchsorted(self.keys, _cell_keys(np.stack((xs, np.full_like(xs, y0)), axis=1)))
+        stops = np.searchsorted(
+            self.keys, _cell_keys(np.stack((xs, np.full_like(xs, y1)), axis=1)), side="right"
+        )
+        lengths = stops - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.intp)
+        positions = np.arange(total) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return self.items[positions]
+
+
+class SpatialIndex:
+    """Picking index over particles, springs and obstacles.
+
+    Rebuilt from the store arrays at most once per frame via `refresh`; cell
+    keys come from `backend` when one is given.
+    """
+
+    def __init__(self, cell_size: float = SPATIAL_CELL_SIZE, backend=None):
+        self.cell_keys = backend.cell_keys if backend is not None else cell_keys
+        self.points = SpatialHash(cell_size)
+        self.segments = SpatialHash(cell_size)
+        self.oversized_segments = np.empty(0, dtype=np.intp)
+        self.segment_reach = 0.0
+        self.positions = np.empty((0, 2))
+        self.springs = np.empty((0, 2), dtype=np.intp)
+        self.obstacles = []
+        self.obstacle_bounds = np.empty((0, 2, 2))
+
+    def refresh(self, positions: np.ndarray, springs: np.ndarray, obstacles) -> None:
+        self.positions = positions.copy()
+        self.springs = springs
+        self.obstacles = list(obstacles)
+
+        finite = np.flatnonzero(np.isfinite(self.positions[:, 0] + self.positions[:, 1]))
+        self.points.build(self.cell_keys(self.positions[finite], self.points.cell_size), finite)
+        self._build_segments()
+
+        self.obstacle_bounds = np.array(
+            [obstacle.bounds for obstacle in self.obstacles],
+            dtype=np.float64,
+        ).reshape(-1, 2, 2)
+
+    def _build_segments(self) -> None:
+        # Segments are filed under their midpoint's cell; queries grow the box
+        # by the largest half-extent so every overlapping segment is found
+        starts = self.positions[self.springs[:, 0]]
+        ends = self.positions[self.springs[:, 1]]
+        extent = np.abs(ends - starts)
+        # NaN for segments with a non-finite end, which then match neither test
+        reach = np.maximum(extent[:, 0], extent[:, 1]) / 2
+        limit = _MAX_SEGMENT_REACH * self.segments.cell_size
+        self.oversized_segments = np.flatnonzero(reach > limit)
+        ids = np.flatnonzero(reach <= limit)
+        self.segment_reach = float(reach[ids].max(initial=0))
+
+        midpoints = (starts[ids] + ends[ids]) / 2
+        self.segments.build(self.cell_keys(midpoints, self.segments.cell_size), ids)
+
+    # --- Queries ---
+    def nearest_point(self, pos, radius: float) -> int | None:
+        pos = np.asarray(pos, dtype=np.float64)
+        candidates = self.points.query_box(pos - radius, pos + radius)
+        if len(candidates) == 0:
+            return None
+        distances = np.linalg.norm(self.positions[candidates] - pos, axis=1)
+        best = np.argmin(distances)
+        return int(candidates[best]) if distances[best] <= radius else None
+
+    def nearest_segment(self, pos, threshold: float) -> int | None:
+        pos = np.asarray(pos, dtype=np.float64)
+        reach = threshold + self.segment_reach
+        candidates = np.union1d(
+            self.segments.query_box(pos - reach, pos + reach), self.oversized_segments
+        )
+        if len(candidates) == 0:
+            return None
+        springs = self.springs[candidates]
+        distances = segment_distances(
+            pos[None, :], self.positions[springs[:, 0]], self.positions[springs[:, 1]]
+        )[0]
+        best = np.argmin(distances)
+        return int(candidates[best]) if distances[best] <= threshold else None
+
+    def points_in_box(self, low, high) -> np.ndarray:
+        """Rows of the points inside the box `low..high`."""
+        low, high = np.asarray(low, dtype=np.float64), np.asarray(high, dtype=np.float64)
+        candidates = self.points.query_box(low, high)
+        positions = self.positions[candidates]
+        return candidates[((positions >= low) & (positions <= high)).all(axis=1)]
+
+    def segments_in_box(self, low, high) -> np.ndarray:
+        """Springs that may cross the box `low..high`, checked at cell granularity."""
+        low = np.asarray(low, dtype=np.float64) - self.segment_reach
+        high = np.asarray(high, dtype=np.float64) + self.segment_reach
+        # The hashed and oversized sets are disjoint
+        return np.concatenate((self.segments.query_box(low, high), self.oversized_segments))
+
+    def obstacles_in_box(self, low, high) -> np.ndarray:
+        """Obstacles whose bounding box overlaps the box `low..high`."""
+        overlap = (self.obstacle_bounds[:, 0] <= high) & (self.obstacle_bounds[:, 1] >= low)
+        return np.flatnonzero(overlap.all(axis=1))
+
+    def obstacles_near(self, pos, threshold: float) -> np.ndarray:
+        """Obstacles whose bounding box, grown by `threshold`, contains `pos`."""
+        pos = np.asarray(pos, dtype=np.float64)
+        low, high = self.obstacle_bounds[:, 0], self.obstacle_bounds[:, 1]
+        inside = ((pos >= low - threshold) & (pos <= high + threshold)).all(axis=1)
+        return np.flatnonzero(inside)
@@ -0,0 +1,213 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+from softbody_simulation.consts import FIXED_DELTA_TIME, TEMPLATE_CACHE_SIZE
+from softbody_simulation.entities import IncidenceMatrix, MassPoint, ParticleStore
+from .kernels import spring_forces, stable_timestep, substep_count
+from .mesh import grid_mesh, hex_mesh, polygon_mesh, rest_lengths
+
+
+@dataclass(frozen=True, eq=False)
+class BodyTemplate:
+    """Topology and spring parameters shared by every instance of a body."""
+
+    points: np.ndarray  # (N, 2) rest positions relative to the body origin
+    springs: np.ndarray  # (S, 2) point indices
+    rest_length: np.ndarray
+    stiffness: np.ndarray
+    damping: np.ndarray
+
+    def __post_init__(self):
+        for array in (self.points, self.springs, self.rest_length, self.stiffness, self.damping):
+            array.setflags(write=False)
+
+    @property
+    def point_count(self) -> int:
+        return len(self.points)
+
+    def substeps(self, mass: float = 1, damping: float = 0, delta_time: float = FIXED_DELTA_TIME) -> int:
+        """Explicit substeps per `delta_time` these springs need at `mass`, capped like the sandbox's."""
+        n = self.point_count
+        incidence = IncidenceMatrix(self.springs[:, 0], self.springs[:, 1], n)
+        stable_dt = stable_timestep(
+            np.full(n, float(mass)), np.full(n, float(damping)), incidence, self.stiffness, self.damping
+        )
+        return substep_count(delta_time, stable_dt)
+
+
+def _frozen(value):
+    """`value` with lists and arrays turned into nested tuples, so it can key the cache."""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_frozen(item) for item in value)
+    return value
+
+
+def body_template(shape: str = "grid", size=(3, 3), spacing: float = 100,
+                  stiffness: float = 200, damping: float = 1, shear: bool = True,
+                  bending: bool = False, outline: tuple | None = None) -> BodyTemplate:
+    """Build (or fetch the memoized) template for the given generation parameters.
+
+    `size` and `outline` may be any sequences; equal values share one template.
+    """
+    return _body_template(shape, _frozen(size), spacing, stiffness, damping, shear,
+                          bending, _frozen(outline))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _body_template(shape, size, spacing, stiffness, damping, shear, bending, outline) -> BodyTemplate:
+    if shape == "grid":
+        points, springs = grid_mesh((0, 0), size, spacing, shear, bending)
+    elif shape == "hex":
+        points, springs = hex_mesh((0, 0), size, spacing, bending)
+    elif shape == "polygon":
+        points, springs = polygon_mesh(np.array(outline), spacing, shear, bending)
+    else:
+        raise ValueError(f"Unknown body shape: {shape}")
+
+    points = points.astype(np.float64)
+    count = len(springs)
+    return BodyTemplate(
+        points=points,
+        springs=springs,
+        rest_length=rest_lengths(points, springs),
+        stiffness=np.full(count, stiffness, dtype=np.float64),
+        damping=np.full(count, damping, dtype=np.float64),
+    )
+
+
+@dataclass
+class BodyInstance:
+    """One copy of a template: its particle rows and the transform it was placed with."""
+
+    template: BodyTemplate
+    rows: np.ndarray  # particle store index of each template point
+    offset: np.ndarray
+    angle: float = 0.0
+
+
+@dataclass
+class InstanceGroup:
+    """Every instance of one template, stepped as a single spring batch."""
+
+    template: BodyTemplate
+    instances: list[BodyInstance] = field(default_factory=list)
+    _rows: np.ndarray | None = None
+
+    def add(self, instance: BodyInstance) -> None:
+        self.instances.append(instance)
+        self._rows = None
+
+    @property
+    def rows(self) -> np.ndarray:
+        """(I, N) particle rows of all instances."""
+        if self._rows is None:
+            self._rows = np.stack([i.rows for i in self.instances])
+        return self._rows
+
+    def accumulate_forces(self, particles: ParticleStore) -> None:
+        t, rows = self.template, self.rows
+        state = particles.state[rows]
+        forces = spring_forces(
+            state[..., 0:2], state[..., 2:4],
+            t.springs[:, 0], t.springs[:, 1],
+            t.rest_length, t.stiffness, t.damping,
+        )
+        particles.force[rows] += forces
+
+    def spring_indices(self) -> np.ndarray:
+        """Springs of all instances as (I * S, 2) particle rows."""
+        return self.rows[:, self.template.springs].reshape(-1, 2)
+
+
+class BodyInstances:
+    """Bodies placed from templates; topology is stored once per template.
+
+    Instance rows index into the particle store, so points spawned here must
+    not be removed from it individually. Bodies spawned with `modal=True` are
+    `ModalBody`s, which step themselves; `step` leaves their rows out of the
+    shared integration.
+    """
+
+    def __init__(self, particles: ParticleStore):
+        self.particles = particles
+        self.groups: dict[BodyTemplate, InstanceGroup] = {}
+        self.modal = []
+        self._free_rows: np.ndarray | None = None
+
+    def spawn(self, template: BodyTemplate, offset, angle: float = 0.0, mass: float = 1,
+              velocity=(0, 0), use_gravity=True, damping=0, modal: bool = False):
+        """Place `template` at `offset`, rotated by `angle` about its origin.
+
+        `modal` places it as a `ModalBody`, for templates too stiff to
+        integrate explicitly (see `BodyTemplate.substeps`). Modal bodies
+        ignore `damping` and are damped by their springs' modal damping instead.
+        """
+        self._free_rows = None
+        if modal:
+            # Imported here: modal bodies are built on templates
+            from .modal import ModalBody
+
+            body = ModalBody(self.particles, template, offset, angle, mass, velocity, use_gravity)
+            self.modal.append(body)
+            return body
+
+        c, s = np.cos(angle), np.sin(angle)
+        rotation = np.array([[c, -s], [s, c]])
+        positions = template.points @ rotation.T + np.asarray(offset, dtype=np.float64)
+
+        handles = MassPoint.spawn_many(
+            self.particles, positions, mass, velocity, use_gravity, damping
+        )
+        rows = np.fromiter((h.index for h in handles), dtype=np.intp, count=len(handles))
+        instance = BodyInstance(template, rows, np.asarray(offset), angle)
+
+        group = self.groups.setdefault(template, InstanceGroup(template))
+        group.add(instance)
+        return instance
+
+    @property
+    def free_rows(self) -> np.ndarray | None:
+        """Particle rows outside every modal body; None when there are no modal bodies."""
+        if not self.modal:
+            return None
+        if self._free_rows is None or self._free_rows[1] != self.particles.count:
+            free = np.ones(self.particles.count, dtype=bool)
+            for body in self.modal:
+                free[body.rows] = False
+            self._free_rows = np.flatnonzero(free), self.particles.count
+        return self._free_rows[0]
+
+    def accumulate_forces(self) -> None:
+        for group in self.groups.values():
+            group.accumulate_forces(self.particles)
+
+    def step(self, backend, delta_time: float, bounds, obstacles=(), contacts=None) -> None:
+        """Step the modal bodies, then integrate every other row with `backend`.
+
+        `bounds` is the size of the world the bodies are kept inside.
+        """
+        for body in self.modal:
+            body.step(delta_time, bounds, obstacles)
+        backend.integrate(
+            self.particles, delta_time, obstacles, bounds=bounds, contacts=contacts,
+            rows=self.free_rows,
+        )
+
+    def bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        """(I, 2) world bounding boxes of every instance, as `low` and `high`."""
+        pos = self.particles.positions
+        # (I, N, 2) per template group, (1, N, 2) per modal body
+        positions = [pos[g.rows] for g in self.groups.values()] + [pos[b.rows][None] for b in self.modal]
+        if not positions:
+            return np.empty((0, 2)), np.empty((0, 2))
+        return (np.concatenate([p.min(axis=1) for p in positions]),
+                np.concatenate([p.max(axis=1) for p in positions]))
+
+    def spring_indices(self) -> np.ndarray:
+        springs = [g.spring_indices() for g in self.groups.values()]
+        springs += [b.rows[b.template.springs] for b in self.modal]
+        if not springs:
+            return np.empty((0, 2), dtype=np.intp)
+        return np.concatenate(springs)
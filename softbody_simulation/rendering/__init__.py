@@ -0,0 +1,3 @@
+from .camera import *
+from .layers import *
+from .batch import *
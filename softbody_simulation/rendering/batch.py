@@ -0,0 +1,215 @@
+from enum import Enum
+
+import pygame
+import numpy as np
+
+from softbody_simulation.consts import *
+from softbody_simulation.entities import MassPoint, ParticleStore, circle_sprite
+from .camera import Camera
+from .layers import bounding_rect, bounding_rects
+
+
+def clip_segments(starts: np.ndarray, ends: np.ndarray, size) -> tuple[np.ndarray, np.ndarray]:
+    """Liang-Barsky clip of (S, 2) segments against the rectangle [0, size)."""
+    d = ends - starts
+    t0 = np.zeros(len(starts))
+    t1 = np.ones(len(starts))
+    keep = np.isfinite(starts[:, 0] + starts[:, 1] + ends[:, 0] + ends[:, 1])
+
+    for axis in range(2):
+        lo, hi = 0.0, size[axis] - 1.0
+        for p, q in ((-d[:, axis], starts[:, axis] - lo), (d[:, axis], hi - starts[:, axis])):
+            parallel = p == 0
+            keep &= ~(parallel & (q < 0))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                r = q / p
+            entering = ~parallel & (p < 0)
+            leaving = ~parallel & (p > 0)
+            t0 = np.where(entering, np.maximum(t0, r), t0)
+            t1 = np.where(leaving, np.minimum(t1, r), t1)
+
+    keep &= t0 <= t1
+    starts, d, t0, t1 = starts[keep], d[keep], t0[keep], t1[keep]
+    return starts + d * t0[:, None], starts + d * t1[:, None]
+
+
+def rasterize_segments(surface: pygame.Surface, starts: np.ndarray, ends: np.ndarray, color) -> None:
+    """Draw 1px segments straight into the surface's pixel buffer."""
+    starts, ends = clip_segments(starts, ends, surface.get_size())
+    if len(starts) == 0:
+        return
+
+    d = ends - starts
+    steps = np.ceil(np.abs(d).max(axis=1)).astype(np.intp) + 1
+    segment = np.repeat(np.arange(len(steps)), steps)
+    first = np.repeat(np.cumsum(steps) - steps, steps)
+    t = (np.arange(len(segment)) - first) / np.maximum(steps - 1, 1)[segment]
+
+    xy = np.rint(starts[segment] + d[segment] * t[:, None]).astype(np.intp)
+
+    pixels = pygame.surfarray.pixels2d(surface)
+    pixels[xy[:, 0], xy[:, 1]] = surface.map_rgb(color)
+    del pixels
+
+
+def shortest_incident(lengths: np.ndarray, springs: np.ndarray, count: int) -> np.ndarray:
+    """Length of the shortest spring attached to each of `count` points."""
+    shortest = np.full(count, np.inf)
+    np.minimum.at(shortest, springs[:, 0], lengths)
+    np.minimum.at(shortest, springs[:, 1], lengths)
+    return shortest
+
+
+class Lod(Enum):
+    FULL = "full"
+    STRUCTURAL = "structural"
+    SILHOUETTE = "silhouette"
+
+
+class BatchRenderer:
+    SPRING_COLOR = WHITE
+    HIGHLIGHT_COLOR = (255, 255, 0)
+    HIGHLIGHT_RADIUS = 14
+    # Below this many springs individual draw.line calls beat the numpy setup
+    RASTERIZE_THRESHOLD = 256
+    # Past this many separate bodies one rect around all of them is pushed instead
+    MAX_DIRTY_RECTS = 64
+
+    # Level of detail is picked from the typical on-screen spring length
+    FULL_DETAIL_SPACING = 6
+    STRUCTURAL_SPACING = 2
+    SPACING_SAMPLES = 1024
+    # Springs within this factor of the shortest one at an endpoint count as structural
+    STRUCTURAL_TOLERANCE = 1.2
+    SILHOUETTE_CELL = 3
+
+    def __init__(self, radius: int = MassPoint.RADIUS, color=MassPoint.COLOR):
+        self.radius = radius
+        self.color = color
+        self.sprite, _ = circle_sprite(radius, color)
+        self.lod = Lod.FULL
+
+    def highlight_radius(self, zoom: float = 1.0) -> int:
+        """Screen reach of a point's highlight ring, and so of anything drawn for it.
+
+        The ring keeps its gap around the point sprite as the sprite scales
+        with the zoom.
+        """
+        radius = max(1, round(self.radius * zoom))
+        return max(self.HIGHLIGHT_RADIUS, radius + self.HIGHLIGHT_RADIUS - self.radius)
+
+    def draw(self, surface: pygame.Surface, particles: ParticleStore, springs: np.ndarray,
+             selected_springs: np.ndarray | None = None, points: np.ndarray | None = None,
+             camera: Camera | None = None, regions=None) -> list[pygame.Rect]:
+        """Draw everything that moves and return the screen rects it covers.
+
+        `springs` is an (S, 2) array of particle rows. `points` optionally
+        limits the drawn points to the given rows, and `camera` maps world
+        positions to the screen. `regions`, the `(low, high)` world boxes of
+        the separate bodies, gets one rect per body back instead of one
+        around everything.
+        """
+        positions = particles.positions
+        selected_points = particles.selection_mask
+        starts = positions[springs[:, 0]]
+        ends = positions[springs[:, 1]]
+        if points is not None:
+            positions, selected_points = positions[points], selected_points[points]
+
+        radius, sprite = self.radius, self.sprite
+        margin = self.HIGHLIGHT_RADIUS
+        if camera is not None and not camera.is_identity:
+            positions, starts, ends = (camera.to_screen(p) for p in (positions, starts, ends))
+            radius = max(1, round(self.radius * camera.zoom))
+            sprite, _ = circle_sprite(radius, self.color)
+            margin = self.highlight_radius(camera.zoom)
+
+        if selected_springs is None:
+            selected_springs = np.zeros(len(springs), dtype=bool)
+
+        span = np.abs(ends - starts)
+        lengths = np.maximum(span[:, 0], span[:, 1])
+        self.lod = self.pick_lod(lengths)
+
+        if self.lod == Lod.SILHOUETTE and surface.get_bytesize() in (1, 2, 4):
+            self.draw_silhouette(surface, positions)
+        else:
+            # Springs shorter than a pixel would only repaint their endpoints
+            drawn = lengths >= 1
+            if self.lod == Lod.STRUCTURAL:
+                shortest = shortest_incident(lengths, springs, particles.count)
+                reach = np.maximum(shortest[springs[:, 0]], shortest[springs[:, 1]])
+                drawn &= lengths <= reach * self.STRUCTURAL_TOLERANCE
+            self.draw_springs(surface, starts[drawn], ends[drawn])
+            if self.lod == Lod.FULL:
+                self.draw_points(surface, positions, sprite, radius)
+
+        self.draw_highlights(
+            surface,
+            starts[selected_springs],
+            ends[selected_springs],
+            positions[selected_points],
+            margin,
+        )
+
+        if regions is not None and 0 < len(regions[0]) <= self.MAX_DIRTY_RECTS:
+            low, high = regions
+            if camera is not None and not camera.is_identity:
+                low, high = camera.to_screen(low), camera.to_screen(high)
+            return bounding_rects(low, high, margin)
+
+        # Culled springs can reach points outside the drawn set
+        extent = positions if points is None else np.concatenate((positions, starts, ends))
+        rect = bounding_rect(extent, margin)
+        return [rect] if rect else []
+
+    def pick_lod(self, lengths: np.ndarray) -> Lod:
+        """Detail level for springs with the given on-screen lengths, in pixels."""
+        if len(lengths) == 0:
+            return Lod.FULL
+        step = max(1, len(lengths) // self.SPACING_SAMPLES)
+        spacing = np.median(lengths[::step])
+        if spacing >= self.FULL_DETAIL_SPACING:
+            return Lod.FULL
+        if spacing >= self.STRUCTURAL_SPACING:
+            return Lod.STRUCTURAL
+        return Lod.SILHOUETTE
+
+    def draw_silhouette(self, surface: pygame.Surface, positions: np.ndarray) -> None:
+        """Fill the screen cells covered by points, closing the gaps between neighbours."""
+        cell = self.SILHOUETTE_CELL
+        width, height = surface.get_size()
+        grid = np.zeros((-(-width // cell) + 2, -(-height // cell) + 2), dtype=bool)
+
+        positions = positions[np.isfinite(positions[:, 0] + positions[:, 1])]
+        cells = np.floor(positions / cell).astype(np.intp) + 1
+        inside = (cells[:, 0] >= 0) & (cells[:, 0] < grid.shape[0]) & \
+            (cells[:, 1] >= 0) & (cells[:, 1] < grid.shape[1])
+        grid[cells[inside, 0], cells[inside, 1]] = True
+        grid[1:-1, 1:-1] |= grid[:-2, 1:-1] | grid[2:, 1:-1] | grid[1:-1, :-2] | grid[1:-1, 2:]
+
+        covered = grid[1:-1, 1:-1].repeat(cell, axis=0).repeat(cell, axis=1)[:width, :height]
+        pixels = pygame.surfarray.pixels2d(surface)
+        pixels[covered] = surface.map_rgb(self.color)
+        del pixels
+
+    def draw_springs(self, surface: pygame.Surface, starts: np.ndarray, ends: np.ndarray) -> None:
+        if len(starts) >= self.RASTERIZE_THRESHOLD and surface.get_bytesize() in (1, 2, 4):
+            rasterize_segments(surface, starts, ends, self.SPRING_COLOR)
+            return
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            pygame.draw.line(surface, self.SPRING_COLOR, start, end)
+
+    def draw_points(self, surface: pygame.Surface, positions: np.ndarray,
+                    sprite: pygame.Surface | None = None, radius: int | None = None) -> None:
+        sprite = sprite or self.sprite
+        corners = (positions - (radius or self.radius)).tolist()
+        surface.blits([(sprite, corner) for corner in corners], doreturn=False)
+
+    def draw_highlights(self, surface: pygame.Surface, starts: np.ndarray, ends: np.ndarray,
+                        positions: np.ndarray, reach: int | None = None) -> None:
+        reach = reach or self.HIGHLIGHT_RADIUS
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            pygame.draw.line(surface, self.HIGHLIGHT_COLOR, start, end, 4)
+        for pos in positions.tolist():
+            pygame.draw.circle(surface, self.HIGHLIGHT_COLOR, pos, reach - 2, 2)
@@ -0,0 +1,64 @@
+import numpy as np
+
+from softbody_simulation.consts import *
+
+
+class Camera:
+    """Pan and zoom view onto a world that may be larger than the window.
+
+    World points map to the screen as `(point - offset) * zoom`.
+    """
+
+    def __init__(self, view_size=WIN_SIZE, world_size=WORLD_SIZE, max_zoom=CAMERA_MAX_ZOOM):
+        self.view_size = np.asarray(view_size, dtype=np.float64)
+        self.world_size = np.asarray(world_size, dtype=np.float64)
+        # Zooming out stops once the whole world fits in the window
+        self.min_zoom = min(1.0, float((self.view_size / self.world_size).min()))
+        self.max_zoom = max_zoom
+        self.reset()
+
+    def reset(self) -> None:
+        self.offset = np.zeros(2)
+        self.zoom = 1.0
+        self._clamp()
+
+    @property
+    def key(self) -> tuple:
+        return (*self.offset.tolist(), self.zoom)
+
+    @property
+    def is_identity(self) -> bool:
+        return self.zoom == 1 and not self.offset.any()
+
+    @property
+    def view_bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        """World-space corners of the area on screen."""
+        return self.offset.copy(), self.offset + self.view_size / self.zoom
+
+    def covers(self, low, high) -> bool:
+        view_low, view_high = self.view_bounds
+        return bool((view_low <= low).all() and (view_high >= high).all())
+
+    # --- Transforms ---
+    def to_screen(self, points) -> np.ndarray:
+        return (np.asarray(points, dtype=np.float64) - self.offset) * self.zoom
+
+    def to_world(self, pos) -> tuple[float, float]:
+        return tuple((np.asarray(pos, dtype=np.float64) / self.zoom + self.offset).tolist())
+
+    # --- Movement ---
+    def pan(self, screen_delta) -> None:
+        self.offset -= np.asarray(screen_delta, dtype=np.float64) / self.zoom
+        self._clamp()
+
+    def zoom_at(self, screen_pos, factor: float) -> None:
+        """Zoom by `factor`, keeping the world point under `screen_pos` in place."""
+        anchor = np.array(self.to_world(screen_pos))
+        self.zoom = float(np.clip(self.zoom * factor, self.min_zoom, self.max_zoom))
+        self.offset = anchor - np.asarray(screen_pos, dtype=np.float64) / self.zoom
+        self._clamp()
+
+    def _clamp(self) -> None:
+        # Keep the view inside the world, centring it on axes where the world is smaller
+        slack = self.world_size - self.view_size / self.zoom
+        self.offset = np.where(slack >= 0, np.clip(self.offset, 0, np.maximum(slack, 0)), slack / 2)
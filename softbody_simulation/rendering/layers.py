@@ -0,0 +1,138 @@
+import pygame
+import numpy as np
+
+from softbody_simulation.consts import *
+
+
+def bounding_rect(positions: np.ndarray, margin: float) -> pygame.Rect | None:
+    """Screen rect enclosing all finite positions, grown by `margin` pixels."""
+    positions = positions[np.isfinite(positions[:, 0] + positions[:, 1])]
+    if len(positions) == 0:
+        return None
+    # Clamp before converting so runaway points cannot overflow the int rect
+    limit = 4 * max(WIN_SIZE)
+    (min_x, min_y) = np.clip(positions.min(axis=0) - margin, -limit, limit)
+    (max_x, max_y) = np.clip(positions.max(axis=0) + margin, -limit, limit)
+    return pygame.Rect(
+        int(min_x), int(min_y), int(max_x - min_x) + 2, int(max_y - min_y) + 2
+    )
+
+
+def bounding_rects(low: np.ndarray, high: np.ndarray, margin: float) -> list[pygame.Rect]:
+    """Screen rects of the boxes `low[i]..high[i]`, grown by `margin`; non-finite boxes are skipped."""
+    finite = np.isfinite(low).all(axis=1) & np.isfinite(high).all(axis=1)
+    limit = 4 * max(WIN_SIZE)
+    low = np.clip(low[finite] - margin, -limit, limit).astype(np.intp)
+    size = np.clip(high[finite] + margin, -limit, limit).astype(np.intp) - low + 2
+    return [pygame.Rect(x, y, w, h) for (x, y), (w, h) in zip(low.tolist(), size.tolist())]
+
+
+class StaticLayer:
+    """Background, obstacles and fixed UI panels, composited once and rebuilt only when they change."""
+
+    def __init__(self, size, background_color=BG_COLOR):
+        self.surface = pygame.Surface(size)
+        self.background_color = background_color
+        self.key = None
+
+    def refresh(self, obstacles, camera=None, panels=()) -> bool:
+        if camera is not None and camera.is_identity:
+            camera = None
+        key = (
+            camera.key if camera else None,
+            tuple((id(o), o.selected) for o in obstacles),
+            tuple(tuple(panel.rect) for panel in panels),
+        )
+        if key == self.key:
+            return False
+
+        self.surface.fill(self.background_color)
+        for obstacle in obstacles:
+            obstacle.draw(self.surface, camera)
+        for panel in panels:
+            panel.draw(self.surface)
+        self.key = key
+        return True
+
+    def redraw_panels(self, obstacles, panels, camera=None) -> list[pygame.Rect]:
+        """Repaint only the panels' areas after their content changed; returns them."""
+        if camera is not None and camera.is_identity:
+            camera = None
+        rects = [panel.rect.copy() for panel in panels]
+        for rect, panel in zip(rects, panels):
+            self.surface.set_clip(rect)
+            self.surface.fill(self.background_color)
+            for obstacle in obstacles:
+                obstacle.draw(self.surface, camera)
+            panel.draw(self.surface)
+        self.surface.set_clip(None)
+        return rects
+
+
+class DirtyRectCompositor:
+    """Restores and pushes only the screen areas touched by moving content.
+
+    Panels are cached in the static layer with the obstacles and only
+    repainted when `panels_changed` says their content did; other UI
+    elements are drawn over the scene whenever moving content touches them.
+    """
+
+    def __init__(self, screen: pygame.Surface, background_color=BG_COLOR):
+        self.screen = screen
+        self.static = StaticLayer(screen.get_size(), background_color)
+        self.previous_rects: list[pygame.Rect] = []
+        self.panels = []
+        self.panel_rects: list[pygame.Rect] = []
+        self.ui_key = None
+        self.full_redraw = True
+
+    def invalidate(self) -> None:
+        self.full_redraw = True
+
+    def begin(self, obstacles, ui_elements, camera=None, panels=(),
+              panels_changed: bool = False) -> None:
+        self.panels = list(panels)
+        self.panel_rects = []
+        if self.static.refresh(obstacles, camera, self.panels):
+            self.full_redraw = True
+        elif panels_changed:
+            self.panel_rects = self.static.redraw_panels(obstacles, self.panels, camera)
+
+        # UI elements paint their whole rect, so they can be redrawn in place
+        # unless their layout moved
+        ui_key = tuple(tuple(e.rect) for e in ui_elements)
+        if ui_key != self.ui_key:
+            self.ui_key = ui_key
+            self.full_redraw = True
+
+        if self.full_redraw:
+            self.screen.blit(self.static.surface, (0, 0))
+        else:
+            for rect in self.previous_rects + self.panel_rects:
+                self.screen.blit(self.static.surface, rect, rect)
+
+    def finish(self, rects: list[pygame.Rect], ui_elements, ui_changed: bool = False) -> None:
+        screen_rect = self.screen.get_rect()
+        rects = [r.clip(screen_rect) for r in rects if r.colliderect(screen_rect)]
+
+        # Moving content stays under the panels: cover it again from the cache
+        for panel in self.panels:
+            for rect in rects:
+                overlap = rect.clip(panel.rect)
+                if overlap:
+                    self.screen.blit(self.static.surface, overlap, overlap)
+
+        touched = self.previous_rects + rects
+        ui_rects = []
+        for element in ui_elements:
+            if self.full_redraw or ui_changed or element.rect.collidelist(touched) != -1:
+                element.draw(self.screen)
+                ui_rects.append(element.rect)
+
+        if self.full_redraw:
+            pygame.display.update()
+        else:
+            pygame.display.update(touched + ui_rects + self.panel_rects)
+
+        self.previous_rects = rects
+        self.full_redraw = False
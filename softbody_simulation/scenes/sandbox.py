@@ -1,27 +1,40 @@
 import pygame
 from softbody_simulation.consts import (
     BG_COLOR,
-    WIN_SIZE,
     FONT,
     FONT_COLOR,
     TRANSPARENT_COLOR,
     TRANSPARENT_HOVER_COLOR,
+    REPLAY_LOG_PATH,
+    CAMERA_ZOOM_STEP,
+    STATE_DTYPE,
+    FIELD_STRENGTH,
+    WIND_RATE,
+    WIND_REGION_SIZE,
+    WIND_VELOCITY,
 )
 import numpy as np
+from softbody_simulation.physics import DragRegion, RadialField, field_to_dict
 from softbody_simulation.scenes.scene import UIScene
 from softbody_simulation.scenes.scene_manager import SceneManager
 from softbody_simulation.scripts.sandbox import Sandbox as SandboxScript, Mode
+from softbody_simulation.scripts.replay import ActionLog, ActionRecorder
 from softbody_simulation.ui import Button, SandboxPanel
+from softbody_simulation.rendering import BatchRenderer, Camera, DirtyRectCompositor
 
 class Sandbox(UIScene):
     def __init__(self, screen: pygame.Surface):
         super().__init__(screen, background_color=BG_COLOR)
-        self.script = SandboxScript(
+        script_kwargs = dict(
             default_mass=100,
             default_stiffness=100,
             default_rest_length=50,
             default_damping=10,
+            dtype=STATE_DTYPE,
         )
+        self.script = SandboxScript(**script_kwargs)
+        # Every action dispatched into the script goes through the recorder
+        self.actions = ActionRecorder(self.script, ActionLog(script_kwargs))
 
         # Create back button
         self.back_button = Button(
@@ -37,11 +50,21 @@ class Sandbox(UIScene):
         )
 
         self.ui_panel = SandboxPanel(
-            script=self.script,
+            script=self.actions,
         )
         
         self.ui_elements = [self.back_button, self.ui_panel]
 
+        self.renderer = BatchRenderer()
+        self.compositor = DirtyRectCompositor(self.screen, BG_COLOR)
+        self.ui_changed = True
+        self.pointer_over_ui = False
+        self.ui_pressed = False
+
+        # The script works in world coordinates; input and drawing go through the camera
+        self.camera = Camera(self.screen.get_size(), self.script.world_size)
+        self.panning = False
+
         self.last_click_time = 0
 
     def go_back(self):
@@ -51,11 +74,27 @@ class Sandbox(UIScene):
     def _is_in_ui_panel(self, pos):
         return self.ui_panel.contains_point(pos)
 
+    def _changes_ui(self, event) -> bool:
+        """Whether `event` can change how the UI looks: pointer input over it or dragging from it."""
+        if not hasattr(event, "pos"):
+            return False
+        over = any(element.rect.collidepoint(event.pos) for element in self.ui_elements)
+        # Leaving an element clears its hover, and slider drags may leave the panel
+        changed = over or self.pointer_over_ui or self.ui_pressed
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            self.ui_pressed = over
+        elif event.type == pygame.MOUSEBUTTONUP:
+            self.ui_pressed = False
+        self.pointer_over_ui = over
+        return changed
+
     def handle_events(self) -> bool:
         events = pygame.event.get()
+        self.ui_changed = False
         for event in events:
             if event.type == pygame.QUIT:
                 return False
+            self.ui_changed |= self._changes_ui(event)
 
             for element in self.ui_elements:
                 element.handle_event(event)
@@ -64,45 +103,93 @@ class Sandbox(UIScene):
                 current_time = pygame.time.get_ticks()
 
                 if not self._is_in_ui_panel(event.pos):
-                    if event.button == 1 and pygame.key.get_mods() & pygame.KMOD_CTRL:
-                        self.script.handle_ctrl_left_click(event.pos)
+                    world_pos = self.camera.to_world(event.pos)
+                    mods = pygame.key.get_mods()
+                    if event.button == 1 and mods & pygame.KMOD_SHIFT and \
+                            self.script.mode == Mode.PHYSICS:
+                        self.actions.start_region_select(world_pos, bool(mods & pygame.KMOD_ALT))
+                    elif event.button == 1 and mods & pygame.KMOD_CTRL:
+                        self.actions.handle_ctrl_click(world_pos)
                     elif event.button == 1:
                         if current_time - self.last_click_time < 200:
-                            self.script.handle_double_click(event.pos)
+                            self.actions.handle_double_click(world_pos)
                         else:
-                            self.script.handle_left_click(event.pos)
+                            self.actions.handle_left_mouse_down(world_pos)
+                    elif event.button == 2:
+                        self.panning = True
                     elif event.button == 3:
-                        self.script.handle_right_click(event.pos)
+                        self.actions.handle_right_mouse_click(world_pos)
 
                 self.last_click_time = current_time
 
             elif event.type == pygame.MOUSEBUTTONUP:
-                if not self._is_in_ui_panel(event.pos):
+                if event.button == 2:
+                    self.panning = False
+                elif not self._is_in_ui_panel(event.pos):
                     if event.button == 1:
-                        self.script.handle_left_click_release(event.pos)
+                        self.actions.handle_left_mouse_up(self.camera.to_world(event.pos))
+
+            elif event.type == pygame.MOUSEMOTION and self.panning:
+                self.camera.pan(event.rel)
+
+            elif event.type == pygame.MOUSEWHEEL:
+                mouse_pos = pygame.mouse.get_pos()
+                if not self._is_in_ui_panel(mouse_pos):
+                    self.camera.zoom_at(mouse_pos, CAMERA_ZOOM_STEP ** event.y)
+
+            elif event.type == pygame.KEYDOWN and event.mod & pygame.KMOD_CTRL:
+                if event.key == pygame.K_c:
+                    self.actions.copy_selection()
+                elif event.key == pygame.K_v:
+                    self.actions.paste_clipboard(self.camera.to_world(pygame.mouse.get_pos()))
+                elif event.key == pygame.K_d:
+                    self.actions.duplicate_selection()
 
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    self.script.handle_escape_keydown()
+                    self.actions.handle_escape()
                 elif event.key == pygame.K_SPACE:
-                    self.script.toggle_pause()
+                    self.actions.toggle_pause()
                 elif event.key == pygame.K_RIGHT:
-                    self.script.perform_single_step()
+                    self.actions.perform_single_step()
+                elif event.key == pygame.K_LEFT:
+                    self.actions.perform_step_back()
                 elif event.key == pygame.K_DELETE:
-                    self.script.handle_delete_keydown()
+                    self.actions.handle_delete()
                 elif event.key == pygame.K_TAB:
-                    self.script.switch_mode(
+                    self.actions.switch_mode(
                         Mode.PHYSICS 
                         if self.script.mode == Mode.OBSTACLE 
                         else Mode.OBSTACLE
                     )
                 elif event.key == pygame.K_r:
-                    self.script.reset_simulation()
+                    self.actions.reset_simulation()
                 elif event.key == pygame.K_g:
-                    self.script.toggle_gravity()
+                    self.actions.toggle_gravity()
+                elif event.key == pygame.K_t:
+                    self.actions.toggle_tearing()
+                elif event.key == pygame.K_a:
+                    # Shift places a repulsor instead
+                    strength = -FIELD_STRENGTH if event.mod & pygame.KMOD_SHIFT else FIELD_STRENGTH
+                    center = self.camera.to_world(pygame.mouse.get_pos())
+                    self.actions.add_force_field(field_to_dict(RadialField(center, strength)))
+                elif event.key == pygame.K_w:
+                    center = np.array(self.camera.to_world(pygame.mouse.get_pos()))
+                    half = np.array(WIND_REGION_SIZE) / 2
+                    wind = DragRegion(
+                        tuple((center - half).tolist()), tuple((center + half).tolist()),
+                        WIND_RATE, tuple(WIND_VELOCITY),
+                    )
+                    self.actions.add_force_field(field_to_dict(wind))
+                elif event.key == pygame.K_x:
+                    self.actions.clear_force_fields()
+                elif event.key == pygame.K_F5:
+                    self.actions.save(REPLAY_LOG_PATH)
+                elif event.key == pygame.K_HOME:
+                    self.camera.reset()
 
         if pygame.mouse.get_pressed()[0]:
-            self.script.handle_left_click_hold(pygame.mouse.get_pos())
+            self.actions.handle_mouse_drag(self.camera.to_world(pygame.mouse.get_pos()))
 
 
         return True
@@ -113,38 +200,77 @@ class Sandbox(UIScene):
             element.update()
 
     def render(self) -> None:
-        self.screen.fill(BG_COLOR)
+        springs, selected_springs = self.script.spring_index_array()
+        obstacles, points = self.script.obstacles, None
 
-        # Draw springs
-        for spring in self.script.springs:
-            spring.draw(self.screen)
+        # Unless the whole world is on screen, only draw what the spatial index
+        # finds inside the view
+        if not self.camera.covers((0, 0), self.script.world_size):
+            low, high = self.camera.view_bounds
+            margin = self.renderer.highlight_radius(self.camera.zoom) / self.camera.zoom
+            points, visible, obstacles = self.script.visible_in(low - margin, high + margin)
+            springs, selected_springs = springs[visible], selected_springs[visible]
 
-        # Draw mass points
-        for point in self.script.mass_points:
-            point.draw(self.screen)
+        # The panel is cached in the static layer; only the back button is drawn live
+        live_elements = [self.back_button]
+        self.compositor.begin(
+            obstacles, live_elements, self.camera, panels=[self.ui_panel],
+            panels_changed=self.ui_changed or self.ui_panel.changed,
+        )
+
+        # Draw springs and mass points in batches, one dirty rect per body
+        dirty_rects = self.renderer.draw(
+            self.screen, self.script.particles, springs, selected_springs, points, self.camera,
+            regions=self.script.island_bounds(),
+        )
 
-        # Draw obstacles
-        for obstacle in self.script.obstacles:
-            obstacle.draw(self.screen)
+        # Draw force field outlines
+        for field in self.script.fields:
+            low, high = field.bounds
+            if not (np.isfinite(low).all() and np.isfinite(high).all()):
+                continue
+            low, high = self.camera.to_screen(np.stack((low, high)))
+            if isinstance(field, RadialField):
+                color = (100, 200, 255) if field.strength > 0 else (255, 150, 100)
+                dirty_rects.append(pygame.draw.circle(
+                    self.screen, color, tuple((low + high) / 2), (high[0] - low[0]) / 2, 1
+                ))
+            else:
+                dirty_rects.append(pygame.draw.rect(
+                    self.screen, (150, 255, 150), pygame.Rect(*low, *(high - low)), 1
+                ))
 
         # Draw in-progress obstacle
         drawing_obstacle, obstacle_points = self.script.drawing_obstacle, self.script.drawing_obstacle_points
         if drawing_obstacle and len(obstacle_points) > 0:
-            tuple_points = [tuple(p) for p in obstacle_points]
+            tuple_points = [tuple(p) for p in self.camera.to_screen(obstacle_points).tolist()]
             if len(tuple_points) > 1:
-                pygame.draw.lines(self.screen, (255, 100, 100), False, tuple_points, 2)
+                dirty_rects.append(
+                    pygame.draw.lines(self.screen, (255, 100, 100), False, tuple_points, 2)
+                )
 
             for point in tuple_points:
-                pygame.draw.circle(self.screen, (255, 100, 100), point, 5)
+                dirty_rects.append(pygame.draw.circle(self.screen, (255, 100, 100), point, 5))
 
             mouse_pos = pygame.mouse.get_pos()
             if not self._is_in_ui_panel(mouse_pos):
-                pygame.draw.line(
+                dirty_rects.append(pygame.draw.line(
                     self.screen, (255, 100, 100), tuple_points[-1], mouse_pos, 1
-                )
+                ))
 
-        # Draw all UI elements
-        for element in self.ui_elements:
-            element.draw(self.screen)
+        # Draw region selection
+        region = self.script.region_points
+        if region is not None and len(region) > 1:
+            region = [tuple(p) for p in self.camera.to_screen(region).tolist()]
+            if self.script.region_lasso:
+                rect = pygame.draw.lines(self.screen, (255, 255, 0), True, region, 1)
+            else:
+                (x0, y0), (x1, y1) = region[0], region[-1]
+                rect = pygame.draw.rect(
+                    self.screen, (255, 255, 0),
+                    pygame.Rect(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1), 1,
+                )
+            dirty_rects.append(rect)
 
-        pygame.display.update()
+        # Obstacles live in the cached static layer; UI is redrawn where touched
+        self.compositor.finish(dirty_rects, live_elements, self.ui_changed)
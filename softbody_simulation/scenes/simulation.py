@@ -10,6 +10,7 @@ from softbody_simulation.scenes.scene import UIScene
 from softbody_simulation.scenes.scene_manager import SceneManager
 from softbody_simulation.scripts.simulation import Simulation as SimulationScript
 from softbody_simulation.ui import Button
+from softbody_simulation.rendering import BatchRenderer, DirtyRectCompositor
 
 
 class Simulation(UIScene):
@@ -17,6 +18,9 @@ class Simulation(UIScene):
         super().__init__(screen, background_color=BG_COLOR)
 
         self.script = SimulationScript()
+        self.renderer = BatchRenderer()
+        self.compositor = DirtyRectCompositor(self.screen, BG_COLOR)
+        self.ui_changed = True
 
         back_button = Button(
             pos=(10, 10),
@@ -38,6 +42,7 @@ class Simulation(UIScene):
 
     def handle_events(self) -> bool:
         events = pygame.event.get()
+        self.ui_changed = bool(events)
         for event in events:
             if event.type == pygame.QUIT:
                 return False
@@ -58,15 +63,9 @@ class Simulation(UIScene):
             element.update()
 
     def render(self) -> None:
-        self.screen.fill(BG_COLOR)
-
-        for spring in self.script.springs:
-            spring.draw(self.screen)
-        for mass_point in self.script.mass_points:
-            mass_point.draw(self.screen)
-        for obstacle in self.script.obstacles:
-            obstacle.draw(self.screen)
-
-        for element in self.ui_elements:
-            element.draw(self.screen)
-        pygame.display.update()
+        self.compositor.begin(self.script.obstacles, self.ui_elements)
+        dirty_rects = self.renderer.draw(
+            self.screen, self.script.particles, self.script.springs,
+            regions=self.script.bodies.bounds(),
+        )
+        self.compositor.finish(dirty_rects, self.ui_elements, self.ui_changed)
@@ -0,0 +1,63 @@
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class Snapshot:
+    tick: int
+    particles: np.ndarray
+    topology: tuple
+    topology_version: int
+    watchdog: tuple = ()
+
+
+class SnapshotBuffer:
+    """Fixed-size ring buffer of world snapshots taken every `interval` ticks.
+
+    Only the particle state is copied; the topology tuple is shared with the
+    previous snapshot until its version changes.
+    """
+
+    def __init__(self, capacity: int, interval: int):
+        self.capacity = capacity
+        self.interval = interval
+        self.snapshots: deque[Snapshot] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self.snapshots)
+
+    def clear(self) -> None:
+        self.snapshots.clear()
+
+    def is_due(self, tick: int) -> bool:
+        return tick % self.interval == 0
+
+    def capture(self, tick: int, particles: np.ndarray, topology_version: int,
+                topology_factory, watchdog: tuple = ()) -> Snapshot:
+        self.truncate_after(tick - 1)
+
+        last = self.snapshots[-1] if self.snapshots else None
+        if last is not None and last.topology_version == topology_version:
+            topology = last.topology
+        else:
+            topology = topology_factory()
+
+        snapshot = Snapshot(tick, particles.copy(), topology, topology_version, watchdog)
+        self.snapshots.append(snapshot)
+        return snapshot
+
+    def nearest(self, tick: int) -> Snapshot | None:
+        for snapshot in reversed(self.snapshots):
+            if snapshot.tick <= tick:
+                return snapshot
+        return self.snapshots[0] if self.snapshots else None
+
+    def truncate_after(self, tick: int) -> None:
+        while self.snapshots and self.snapshots[-1].tick > tick:
+            self.snapshots.pop()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(s.particles.nbytes for s in self.snapshots)
@@ -0,0 +1,147 @@
+import json
+import sys
+import time
+from enum import Enum
+
+from softbody_simulation.scripts.sandbox import Sandbox, Mode
+
+
+ACTIONS = frozenset({
+    "handle_left_mouse_down",
+    "handle_left_mouse_up",
+    "handle_mouse_drag",
+    "handle_double_click",
+    "handle_ctrl_click",
+    "handle_right_mouse_click",
+    "handle_escape",
+    "handle_delete",
+    "toggle_pause",
+    "toggle_gravity",
+    "toggle_tearing",
+    "add_force_field",
+    "clear_force_fields",
+    "perform_single_step",
+    "perform_step_back",
+    "switch_mode",
+    "reset_simulation",
+    "update_mass",
+    "update_stiffness",
+    "update_rest_length",
+    "update_damping",
+    "start_region_select",
+    "copy_selection",
+    "paste_clipboard",
+    "duplicate_selection",
+})
+
+_DECODERS = {
+    "switch_mode": lambda mode: (Mode(mode),),
+}
+
+
+def _encode(arg):
+    if isinstance(arg, Enum):
+        return arg.value
+    if isinstance(arg, (tuple, list)):
+        return [_encode(a) for a in arg]
+    return arg
+
+
+def _decode(name, args):
+    if name in _DECODERS:
+        return _DECODERS[name](*args)
+    return tuple(tuple(a) if isinstance(a, list) else a for a in args)
+
+
+class ActionLog:
+    """Compact log of sandbox actions as `[tick, time_ms, action, args]` rows."""
+
+    def __init__(self, script_kwargs: dict, entries=None, end_tick: int = 0):
+        self.script_kwargs = script_kwargs
+        self.entries: list[list] = entries if entries is not None else []
+        self.end_tick = end_tick
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def record(self, tick: int, time_ms: int, action: str, args) -> None:
+        self.entries.append([tick, time_ms, action, _encode(list(args))])
+
+    def save(self, path) -> None:
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "script_kwargs": self.script_kwargs,
+                    "end_tick": self.end_tick,
+                    "entries": self.entries,
+                },
+                f,
+                separators=(",", ":"),
+            )
+
+    @classmethod
+    def load(cls, path) -> "ActionLog":
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["script_kwargs"], data["entries"], data["end_tick"])
+
+
+class ActionRecorder:
+    """Stands in for the sandbox script, logging every dispatched action."""
+
+    def __init__(self, script: Sandbox, log: ActionLog):
+        self.script = script
+        self.log = log
+
+    def __getattr__(self, name):
+        attr = getattr(self.script, name)
+        if name not in ACTIONS:
+            return attr
+
+        def record(*args):
+            self.log.record(self.script.tick, self.script.get_ticks(), name, args)
+            return attr(*args)
+
+        return record
+
+    def save(self, path) -> None:
+        self.log.end_tick = self.script.tick
+        self.log.save(path)
+
+
+def _advance(script: Sandbox, tick: int) -> None:
+    stepped = False
+    while script.tick < tick:
+        script._step()
+        stepped = True
+    if stepped and script.paused:
+        script.single_step = False
+
+
+def replay(log: ActionLog, script: Sandbox | None = None) -> Sandbox:
+    script = script or Sandbox(**log.script_kwargs)
+    now = 0
+    script.get_ticks = lambda: now
+
+    for tick, time_ms, name, args in log.entries:
+        _advance(script, tick)
+        now = time_ms
+        getattr(script, name)(*_decode(name, args))
+    _advance(script, log.end_tick)
+    return script
+
+
+def main():
+    log = ActionLog.load(sys.argv[1])
+    start = time.perf_counter()
+    script = replay(log)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Replayed {len(log)} actions over {script.tick} ticks in {elapsed:.3f}s: "
+        f"{len(script.mass_points)} mass points, {len(script.springs)} springs, "
+        f"{len(script.obstacles)} obstacles"
+    )
+
+
+if __name__ == "__main__":
+    main()
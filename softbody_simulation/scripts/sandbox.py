@@ -1,9 +1,35 @@
 import pygame
 import numpy as np
 from enum import Enum
-from softbody_simulation.consts import DRAG_THRESHOLD_MS
-from softbody_simulation.entities import MassPoint, Spring, PolygonObstacle
-from softbody_simulation.utils import distance_point_to_line
+from itertools import count
+from softbody_simulation.consts import (
+    DRAG_THRESHOLD_MS,
+    FIXED_DELTA_TIME,
+    MAX_STEPS_PER_FRAME,
+    MAX_SUBSTEPS,
+    SNAPSHOT_CAPACITY,
+    SNAPSHOT_INTERVAL,
+    SPRING_TEAR_STRAIN,
+    STATE_DTYPE,
+    WORLD_SIZE,
+)
+from softbody_simulation.entities import (
+    MassPoint, Spring, PolygonObstacle, ObstacleStore, ParticleStore, SpringStore,
+)
+from softbody_simulation.physics import (
+    BodyCollider,
+    ContactCache,
+    ForceFields,
+    SpatialIndex,
+    default_backend,
+    field_from_dict,
+    stable_timestep,
+    substep_count,
+    system_energy,
+)
+from softbody_simulation.scripts.history import SnapshotBuffer, Snapshot
+from softbody_simulation.scripts.watchdog import EnergyWatchdog
+from softbody_simulation.utils import points_in_polygon
 
 
 class Selection(Enum):
@@ -20,16 +46,24 @@ class Mode(Enum):
 
 class Sandbox:
     def __init__(self, default_mass: float, default_stiffness: float,
-                 default_rest_length: float, default_damping: float):
+                 default_rest_length: float, default_damping: float,
+                 snapshot_capacity: int = SNAPSHOT_CAPACITY,
+                 snapshot_interval: int = SNAPSHOT_INTERVAL,
+                 world_size=WORLD_SIZE, dtype=STATE_DTYPE, backend=None,
+                 tear_strain: float | None = None):
         self.default_mass = default_mass
         self.default_stiffness = default_stiffness
         self.default_rest_length = default_rest_length
         self.default_damping = default_damping
         self.use_gravity = True
+        self.world_size = tuple(world_size)
+        self.backend = backend or default_backend()
+        self.tear_strain = tear_strain
 
-        self.mass_points: list[MassPoint] = []
-        self.springs: list[Spring] = []
-        self.obstacles: list[PolygonObstacle] = []
+        self.particles = ParticleStore(dtype=dtype)
+        self.spring_store = SpringStore(self.particles)
+        self.obstacles = ObstacleStore()
+        self.fields = ForceFields()
 
         self.selection = Selection.NONE
         self.mode = Mode.PHYSICS
@@ -37,22 +71,52 @@ class Sandbox:
         self.paused = False
         self.single_step = False
 
+        self.tick = 0
+        self.time_accumulator = 0.0
+        self.substeps = 1
+        self.watchdog = EnergyWatchdog()
+        self.collider = BodyCollider()
+        self.contacts = ContactCache()
+        self._topology_versions = count()
+        self.topology_version = next(self._topology_versions)
+        self.history = SnapshotBuffer(snapshot_capacity, snapshot_interval)
+        self._capture_snapshot()
+
         self.drawing_obstacle = False
         self.drawing_obstacle_points = []
 
         self.drag_time = None
         self.drag_initial_mouse = None
         self.drag_initial_positions = {}
+        self.get_ticks = pygame.time.get_ticks
 
-    # --- Helper Functions for Selection Operations ---
-    def _deselect_all(self, items: list) -> None:
-        for item in items:
-            item.selected = False
+        self.region_points = None
+        self.region_lasso = False
+        self.clipboard = None
+
+        self.spatial_index = SpatialIndex(backend=self.backend)
+        self.spatial_index_stale = True
+
+    @property
+    def mass_points(self) -> list[MassPoint]:
+        return self.particles.handles
+
+    @property
+    def springs(self) -> list[Spring]:
+        return self.spring_store.handles
+
+    def spring_index_array(self) -> tuple[np.ndarray, np.ndarray]:
+        """Springs as (S, 2) particle rows plus their selection mask."""
+        return self.spring_store.indices, self.spring_store.selection_mask.copy()
+
+    def _selected_point_mask(self) -> np.ndarray:
+        return self.particles.selection_mask.copy()
 
+    # --- Helper Functions for Selection Operations ---
     def _clear_all_selections(self) -> None:
-        self._deselect_all(self.mass_points)
-        self._deselect_all(self.springs)
-        self._deselect_all(self.obstacles)
+        self.particles.clear_selection()
+        self.spring_store.clear_selection()
+        self.obstacles.clear_selection()
         self.selection = Selection.NONE
 
     def _update_defaults_for_item(self, item) -> None:
@@ -69,34 +133,34 @@ class Sandbox:
 
     def _select_item(self, item) -> None:
         if isinstance(item, MassPoint):
-            self._deselect_all(self.springs)
-            self._deselect_all(self.obstacles)
+            self.spring_store.clear_selection()
+            self.obstacles.clear_selection()
         elif isinstance(item, Spring):
-            self._deselect_all(self.mass_points)
-            self._deselect_all(self.obstacles)
+            self.particles.clear_selection()
+            self.obstacles.clear_selection()
         elif isinstance(item, PolygonObstacle):
-            self._deselect_all(self.mass_points)
-            self._deselect_all(self.springs)
+            self.particles.clear_selection()
+            self.spring_store.clear_selection()
         item.selected = True
         self._update_defaults_for_item(item)
 
     def _toggle_item_selection(self, item) -> None:
         if isinstance(item, MassPoint):
-            self._deselect_all(self.springs)
-            self._deselect_all(self.obstacles)
+            self.spring_store.clear_selection()
+            self.obstacles.clear_selection()
         elif isinstance(item, Spring):
-            self._deselect_all(self.mass_points)
-            self._deselect_all(self.obstacles)
+            self.particles.clear_selection()
+            self.obstacles.clear_selection()
         elif isinstance(item, PolygonObstacle):
-            self._deselect_all(self.mass_points)
-            self._deselect_all(self.springs)
+            self.particles.clear_selection()
+            self.spring_store.clear_selection()
         item.selected = not item.selected
         if item.selected:
             self._update_defaults_for_item(item)
     
     # --- Helper Functions for Dragging ---
     def _start_drag(self, mouse_pos) -> None:
-        self.drag_time = pygame.time.get_ticks()
+        self.drag_time = self.get_ticks()
         self.drag_initial_mouse = mouse_pos
         self.drag_initial_positions.clear()
 
@@ -104,12 +168,165 @@ class Sandbox:
         delta = np.array(current_pos) - np.array(self.drag_initial_mouse)
         for item, initial in self.drag_initial_positions.items():
             item.pos = initial + delta
+        self.spatial_index_stale = True
+        self.watchdog.reset()
 
     def _end_drag(self) -> None:
         self.drag_time = None
         self.drag_initial_mouse = None
         self.drag_initial_positions.clear()
 
+    # --- Snapshots and Rewind ---
+    def _capture_topology(self) -> tuple:
+        return (
+            tuple(self.mass_points),
+            self.particles.capture_params(),
+            tuple(self.springs),
+            self.spring_store.capture(),
+            tuple(self.obstacles),
+            tuple(self.fields),
+            self.use_gravity,
+        )
+
+    def _capture_snapshot(self) -> Snapshot:
+        return self.history.capture(
+            self.tick,
+            self.particles.state[:self.particles.count],
+            self.topology_version,
+            self._capture_topology,
+            self.watchdog.capture(),
+        )
+
+    def _restore_snapshot(self, snapshot: Snapshot) -> None:
+        if snapshot.topology_version != self.topology_version:
+            mass_points, params, springs, spring_columns, obstacles, fields, use_gravity = snapshot.topology
+            self.particles.load(mass_points, params, snapshot.particles)
+            self.use_gravity = use_gravity
+            self.spring_store.load(springs, spring_columns)
+            self.obstacles.load(obstacles)
+            self.fields.replace(fields)
+            self.topology_version = snapshot.topology_version
+        else:
+            self.particles.state[:self.particles.count] = snapshot.particles
+        self.tick = snapshot.tick
+        self.time_accumulator = 0.0
+        self.spatial_index_stale = True
+        self.contacts.clear()
+        # Re-simulation must see the boost and reference the original run saw
+        self.watchdog.restore(snapshot.watchdog)
+
+    def _topology_changed(self) -> None:
+        # Snapshot the edit (parameter edits included) so stepping back past
+        # it restores the old topology
+        self.topology_version = next(self._topology_versions)
+        self.spatial_index_stale = True
+        self.contacts.clear()
+        self.watchdog.reset()
+        self._capture_snapshot()
+
+    def perform_step_back(self) -> None:
+        self.paused = True
+        target = self.tick - 1
+        snapshot = self.history.nearest(target)
+        if snapshot is None:
+            return
+        target = max(target, snapshot.tick)
+
+        self._end_drag()
+        self.history.truncate_after(target)
+        self._restore_snapshot(snapshot)
+        self._clear_all_selections()
+        while self.tick < target:
+            self._step()
+
+    def _remove_points(self, rows) -> None:
+        keep = self.particles.remove(rows)
+        self.spring_store.remap_points(keep)
+
+    # --- Region Selection ---
+    def start_region_select(self, mouse_pos, lasso: bool = False) -> None:
+        self._end_drag()
+        self.region_points = [tuple(mouse_pos)]
+        self.region_lasso = lasso
+
+    def _extend_region_select(self, mouse_pos) -> None:
+        if self.region_lasso:
+            if tuple(mouse_pos) != self.region_points[-1]:
+                self.region_points.append(tuple(mouse_pos))
+        else:
+            self.region_points[1:] = [tuple(mouse_pos)]
+
+    def _finish_region_select(self) -> None:
+        region, self.region_points = np.array(self.region_points, dtype=np.float64), None
+        positions = self.particles.positions
+        if self.region_lasso:
+            inside = points_in_polygon(positions, region) if len(region) >= 3 else \
+                np.zeros(len(positions), dtype=bool)
+        else:
+            low, high = region.min(axis=0), region.max(axis=0)
+            inside = ((positions >= low) & (positions <= high)).all(axis=1)
+
+        self._clear_all_selections()
+        self._select_rows(np.flatnonzero(inside))
+
+    def _select_rows(self, rows) -> None:
+        self.particles.set_selected(rows)
+        if len(rows):
+            self.selection = Selection.MASS_POINT
+            self.default_mass = float(self.particles.mass[rows[0]])
+
+    # --- Clipboard ---
+    def copy_selection(self) -> None:
+        """Copy the selected points and the springs between them."""
+        mask = self._selected_point_mask()
+        rows = np.flatnonzero(mask)
+        if len(rows) == 0:
+            return
+
+        remap = np.full(self.particles.count, -1, dtype=np.intp)
+        remap[rows] = np.arange(len(rows))
+        a, b, stiffness, rest_length, damping = self.spring_store.columns()
+        inner = mask[a] & mask[b]
+
+        self.clipboard = {
+            "state": self.particles.state[rows].copy(),
+            "params": tuple(p[rows] for p in self.particles.capture_params()),
+            "springs": np.stack((remap[a[inner]], remap[b[inner]]), axis=1),
+            "spring_params": (stiffness[inner].copy(), rest_length[inner].copy(),
+                              damping[inner].copy()),
+        }
+
+    def paste_clipboard(self, mouse_pos) -> None:
+        """Paste the clipboard centred on `mouse_pos` and select the copy."""
+        if self.clipboard is None:
+            return
+        state = self.clipboard["state"]
+        mass, damping, use_gravity = self.clipboard["params"]
+        positions = state[:, 0:2] - state[:, 0:2].mean(axis=0) + np.asarray(mouse_pos)
+        self._paste(positions, state[:, 2:4], mass, damping, use_gravity)
+
+    def duplicate_selection(self) -> None:
+        self.copy_selection()
+        if self.clipboard is None:
+            return
+        state = self.clipboard["state"]
+        mass, damping, use_gravity = self.clipboard["params"]
+        self._paste(state[:, 0:2] + 20, state[:, 2:4], mass, damping, use_gravity)
+
+    def _paste(self, positions, velocities, mass, damping, use_gravity) -> None:
+        handles = MassPoint.spawn_many(
+            self.particles, positions, mass, velocities, use_gravity, damping
+        )
+        rows = np.arange(handles[0].index, handles[0].index + len(handles))
+
+        springs = self.clipboard["springs"] + rows[0]
+        stiffness, rest_length, spring_damping = self.clipboard["spring_params"]
+        Spring.spawn_many(self.spring_store, springs, stiffness, spring_damping, rest_length)
+
+        self._clear_all_selections()
+        self._select_rows(rows)
+        self._topology_changed()
+
     # --- Mode Switching and Reset ---
     def switch_mode(self, mode: Mode):
         self._clear_all_selections()
@@ -119,34 +336,31 @@ class Sandbox:
 
     def reset_simulation(self) -> None:
         self._clear_all_selections()
-        self.mass_points.clear()
-        self.springs.clear()
+        self._remove_points(np.arange(self.particles.count))
         self.obstacles.clear()
+        self.fields.clear()
+        self._topology_changed()
 
     # --- Slider Callbacks ---
     def update_mass(self, value: float) -> None:
         self.default_mass = value
-        for p in self.mass_points:
-            if p.selected:
-                p.mass = value
+        self.particles.masses[self.particles.selection_mask] = value
+        self._topology_changed()
 
     def update_stiffness(self, value: float) -> None:
         self.default_stiffness = value
-        for s in self.springs:
-            if s.selected:
-                s.stiffness = value
+        self.spring_store.stiffness[:self.spring_store.count][self.spring_store.selection_mask] = value
+        self._topology_changed()
 
     def update_rest_length(self, value: float) -> None:
         self.default_rest_length = value
-        for s in self.springs:
-            if s.selected:
-                s.rest_length = value
+        self.spring_store.rest_length[:self.spring_store.count][self.spring_store.selection_mask] = value
+        self._topology_changed()
 
     def update_damping(self, value: float) -> None:
         self.default_damping = value
-        for s in self.springs:
-            if s.selected:
-                s.damping = value
+        self.spring_store.damping[:self.spring_store.count][self.spring_store.selection_mask] = value
+        self._topology_changed()
 
     def toggle_pause(self) -> None:
         self.paused = not self.paused
@@ -158,27 +372,38 @@ class Sandbox:
     # --- Event Handler Methods ---
     def toggle_gravity(self) -> None:
         self.use_gravity = not self.use_gravity
-        for p in self.mass_points:
-            p.use_gravity = self.use_gravity
+        self.particles.gravity_mask[:] = self.use_gravity
+        self._topology_changed()
+
+    def toggle_tearing(self) -> None:
+        self.tear_strain = None if self.tear_strain is not None else SPRING_TEAR_STRAIN
+
+    def add_force_field(self, spec: dict) -> None:
+        """Add the field described by `spec` (see `field_to_dict`)."""
+        self.fields.add(field_from_dict(spec))
+        self._topology_changed()
+
+    def clear_force_fields(self) -> None:
+        if self.fields:
+            self.fields.clear()
+            self._topology_changed()
 
     def handle_double_click(self, mouse_pos) -> None:
         self._end_drag()
         if self.mode == Mode.PHYSICS:
             mass_point = self._get_mass_point_at(mouse_pos)
             if mass_point:
-                self._deselect_all(self.springs)
-                self._deselect_all(self.obstacles)
-                for p in self.mass_points:
-                    p.selected = True
+                self.spring_store.clear_selection()
+                self.obstacles.clear_selection()
+                self.particles.select_all()
                 self.selection = Selection.MASS_POINT
                 self.default_mass = mass_point.mass
                 return
             spring = self._get_spring_at(mouse_pos)
             if spring:
-                self._deselect_all(self.mass_points)
-                self._deselect_all(self.obstacles)
-                for s in self.springs:
-                    s.selected = True
+                self.particles.clear_selection()
+                self.obstacles.clear_selection()
+                self.spring_store.select_all()
                 self.selection = Selection.SPRING
                 self.default_stiffness = spring.stiffness
                 self.default_rest_length = spring.rest_length
@@ -186,10 +411,9 @@ class Sandbox:
         elif self.mode == Mode.OBSTACLE:
             obstacle = self._get_obstacle_at(mouse_pos)
             if obstacle:
-                self._deselect_all(self.mass_points)
-                self._deselect_all(self.springs)
-                for o in self.obstacles:
-                    o.selected = True
+                self.particles.clear_selection()
+                self.spring_store.clear_selection()
+                self.obstacles.select_all()
                 self.selection = Selection.OBSTACLE
 
     def handle_ctrl_click(self, mouse_pos) -> None:
@@ -216,17 +440,24 @@ class Sandbox:
             self._end_drag()
 
     def handle_left_mouse_up(self, mouse_pos) -> None:
+        if self.region_points is not None:
+            self._extend_region_select(mouse_pos)
+            self._finish_region_select()
+            return
         if self.drag_time is None:
             return
-        current_time = pygame.time.get_ticks()
+        current_time = self.get_ticks()
         if self.mode == Mode.PHYSICS and current_time - self.drag_time < DRAG_THRESHOLD_MS:
             self._process_physics_click(mouse_pos)
         self._end_drag()
 
     def handle_mouse_drag(self, mouse_pos) -> None:
+        if self.region_points is not None:
+            self._extend_region_select(mouse_pos)
+            return
         if self.drag_time is None:
             return
-        current_time = pygame.time.get_ticks()
+        current_time = self.get_ticks()
         if current_time - self.drag_time < DRAG_THRESHOLD_MS:
             return
         if self.drag_initial_mouse is None:
@@ -234,39 +465,37 @@ class Sandbox:
             mass_point = self._get_mass_point_at(mouse_pos)
             if mass_point:
                 self._select_item(mass_point)
-            for p in (p for p in self.mass_points if p.selected):
+            for row in self.particles.selected_rows:
+                p = self.mass_points[row]
                 self.drag_initial_positions[p] = p.pos.copy()
         self._update_drag(mouse_pos)
 
     def handle_right_mouse_click(self, mouse_pos) -> None:
         if self.mode == Mode.PHYSICS:
-            new_point = MassPoint(np.array(mouse_pos), self.default_mass,
-                                  use_gravity=self.use_gravity)
-            new_point.selected = False
-            self.mass_points.append(new_point)
+            MassPoint(np.array(mouse_pos), self.default_mass,
+                      use_gravity=self.use_gravity, particles=self.particles)
+            self._topology_changed()
         elif self.drawing_obstacle and len(self.drawing_obstacle_points) >= 3:
             self.complete_obstacle()
 
     def handle_escape(self) -> None:
+        self.region_points = None
         self.drawing_obstacle = False
         self.drawing_obstacle_points = []
         self._clear_all_selections()
 
     def handle_delete(self) -> None:
-        if self.selection == Selection.MASS_POINT:
-            selected = [p for p in self.mass_points if p.selected]
-            for p in selected:
-                self.mass_points.remove(p)
-            self.springs = [s for s in self.springs if s.a not in selected and s.b not in selected]
-        elif self.selection == Selection.SPRING:
-            for s in [s for s in self.springs if s.selected]:
-                if s in self.springs:
-                    self.springs.remove(s)
-        elif self.selection == Selection.OBSTACLE:
-            for o in [o for o in self.obstacles if o.selected]:
-                if o in self.obstacles:
-                    self.obstacles.remove(o)
+        if self.selection == Selection.MASS_POINT and self.particles.selected_count:
+            self._remove_points(np.flatnonzero(self._selected_point_mask()))
+        elif self.selection == Selection.SPRING and self.spring_store.selected_count:
+            self.spring_store.remove(self.spring_store.selected_rows)
+        elif self.selection == Selection.OBSTACLE and self.obstacles.selected_count:
+            self.obstacles.remove(self.obstacles.selected_rows)
+        else:
+            # Nothing to delete; a new topology version would only cost a snapshot
+            return
         self.selection = Selection.NONE
+        self._topology_changed()
 
     # --- Processing Clicks ---
     def _process_physics_click(self, mouse_pos) -> None:
@@ -281,29 +510,31 @@ class Sandbox:
         self._clear_all_selections()
 
     def _handle_mass_point_click(self, mass_point) -> None:
-        self._deselect_all(self.springs)
-        self._deselect_all(self.obstacles)
-        selected = [p for p in self.mass_points if p.selected]
-        if mass_point.selected and selected:
+        self.spring_store.clear_selection()
+        self.obstacles.clear_selection()
+        selected = self.particles.selected_rows
+        if mass_point.selected and len(selected):
             mass_point.selected = False
-        elif selected:
-            for sel in selected:
-                if not self._spring_exists(mass_point, sel):
-                    self.springs.append(
-                        Spring((mass_point, sel),
-                               stiffness=self.default_stiffness,
-                               damping=self.default_damping,
-                               rest_length=self.default_rest_length)
-                    )
-            self._deselect_all(selected)
+        elif len(selected):
+            for row in selected:
+                if self.spring_store.find(mass_point.index, row) is None:
+                    Spring((mass_point, self.mass_points[row]),
+                           stiffness=self.default_stiffness,
+                           damping=self.default_damping,
+                           rest_length=self.default_rest_length,
+                           springs=self.spring_store)
+            self.particles.clear_selection()
+            self._topology_changed()
         else:
             self._select_item(mass_point)
-        selected = [p for p in self.mass_points if p.selected]
-        self.drag_initial_positions = {p: p.pos.copy() for p in selected}
+        self.drag_initial_positions = {
+            self.mass_points[row]: self.mass_points[row].pos.copy()
+            for row in self.particles.selected_rows
+        }
 
     def _handle_spring_click(self, spring) -> None:
-        self._deselect_all(self.mass_points)
-        self._deselect_all(self.obstacles)
+        self.particles.clear_selection()
+        self.obstacles.clear_selection()
         if spring.selected:
             spring.selected = False
         else:
@@ -327,42 +558,56 @@ class Sandbox:
 
     def complete_obstacle(self):
         if len(self.drawing_obstacle_points) >= 3:
-            new_obs = PolygonObstacle(np.array(self.drawing_obstacle_points))
-            new_obs.selected = True
+            new_obs = PolygonObstacle(
+                np.array(self.drawing_obstacle_points), dtype=self.particles.dtype
+            )
+            self.obstacles.clear_selection()
             self.obstacles.append(new_obs)
-            for obs in self.obstacles:
-                if obs is not new_obs:
-                    obs.selected = False
+            new_obs.selected = True
+            self._topology_changed()
         self.drawing_obstacle = False
         self.drawing_obstacle_points = []
 
     # --- Helper Methods ---
+    def _get_spatial_index(self) -> SpatialIndex:
+        # Rebuilt lazily, so picking refreshes it at most once per step or edit
+        if self.spatial_index_stale:
+            self.spatial_index.refresh(
+                self.particles.positions, self.spring_store.indices, self.obstacles
+            )
+            self.spatial_index_stale = False
+        return self.spatial_index
+
+    def visible_in(self, low, high) -> tuple[np.ndarray, np.ndarray, list[PolygonObstacle]]:
+        """Point rows, spring indices and obstacles inside the world box `low..high`."""
+        index = self._get_spatial_index()
+        return (
+            index.points_in_box(low, high),
+            index.segments_in_box(low, high),
+            [index.obstacles[i] for i in index.obstacles_in_box(low, high)],
+        )
+
+    def island_bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        """World bounding boxes of the separate bodies, so each is redrawn on its own."""
+        self.collider.refresh(self.spring_store, self.topology_version)
+        return self.collider.island_bounds(self.particles.positions)
+
     def _get_mass_point_at(self, pos, radius: int = 10) -> MassPoint | None:
-        pos = np.array(pos)
-        for point in self.mass_points:
-            if np.linalg.norm(point.pos - pos) <= radius:
-                return point
-        return None
+        row = self._get_spatial_index().nearest_point(pos, radius)
+        return self.mass_points[row] if row is not None else None
 
     def _get_spring_at(self, pos, threshold: int = 5) -> Spring | None:
-        pos = np.array(pos)
-        for spring in self.springs:
-            p1, p2 = spring.a.pos, spring.b.pos
-            if distance_point_to_line(pos, (p1, p2)) <= threshold:
-                return spring
-        return None
+        index = self._get_spatial_index().nearest_segment(pos, threshold)
+        return self.springs[index] if index is not None else None
 
     def _get_obstacle_at(self, pos, threshold: int = 10) -> PolygonObstacle | None:
         pos = np.array(pos)
-        for obstacle in self.obstacles:
+        for i in self._get_spatial_index().obstacles_near(pos, threshold):
+            obstacle = self.obstacles[i]
             if obstacle.contains_point(pos) or obstacle.near_boundary(pos, threshold):
                 return obstacle
         return None
 
-    def _spring_exists(self, mass_point_a, mass_point_b) -> bool:
-        return any(mass_point_a in (s.a, s.b) and mass_point_b in (s.a, s.b)
-                   for s in self.springs)
-
     def _reset_drag_state(self):
         self.drag_time = None
         self.drag_initial_mouse = None
@@ -372,14 +617,114 @@ class Sandbox:
     def update(self, delta_time: float) -> None:
         if self.paused:
             if self.single_step:
-                self._update_simulation(delta_time)
+                self._step()
                 self.single_step = False
-        else:
-            self._update_simulation(delta_time)
+            return
+
+        # Fixed-step ticks keep rewind and re-simulation deterministic
+        self.time_accumulator += delta_time
+        steps = 0
+        while self.time_accumulator >= FIXED_DELTA_TIME and steps < MAX_STEPS_PER_FRAME:
+            self._step()
+            self.time_accumulator -= FIXED_DELTA_TIME
+            steps += 1
+        if steps == MAX_STEPS_PER_FRAME:
+            self.time_accumulator = 0.0
+
+    def _step(self) -> None:
+        self._update_simulation(FIXED_DELTA_TIME)
+        self.tick += 1
+        self.spatial_index_stale = True
+        # Before the snapshot check, so a snapshot on this tick holds the torn topology
+        if not self._tear_springs():
+            return
+
+        # Checked every tick so a blow-up is caught before it compounds;
+        # the reference only moves on snapshot ticks
+        energy = self._energy()
+        if not self.watchdog.check(energy, float(self.particles.masses.sum())):
+            self._recover(energy)
+            return
+        if self.history.is_due(self.tick):
+            self.watchdog.reset(energy)
+            self._capture_snapshot()
+
+    def _tear_springs(self) -> bool:
+        """Break every spring strained past `tear_strain` with one swap-remove.
+
+        The new topology is snapshotted with the next scheduled snapshot, and
+        the collider follows the tear rather than re-extracting every island.
+        Returns False if the tick was rolled back instead.
+        """
+        if self.tear_strain is None or self.spring_store.count == 0:
+            return True
+        rest_length = self.spring_store.rest_length[:self.spring_store.count]
+        d = self.spring_store.incidence.dot(self.particles.positions)
+        length = np.sqrt(np.einsum("ij,ij->i", d, d))
+        torn = np.flatnonzero((length > (1 + self.tear_strain) * rest_length) & (rest_length > 0))
+        if len(torn) == 0:
+            return True
+
+        # A blow-up overstretches springs too; roll that back instead of tearing
+        energy = self._energy()
+        if not self.watchdog.check(energy, float(self.particles.masses.sum())):
+            self._recover(energy)
+            return False
+        a, b = self.spring_store.a[torn], self.spring_store.b[torn]
+        self.spring_store.swap_remove(torn)
+        previous, self.topology_version = self.topology_version, next(self._topology_versions)
+        self.collider.tear(self.spring_store, a, b, previous, self.topology_version)
+        self.watchdog.reset(self._energy())
+        return True
+
+    def _energy(self) -> float:
+        a, b, stiffness, rest_length, _ = self.spring_store.columns()
+        return system_energy(
+            self.particles, a, b, rest_length, stiffness, self.world_size[1]
+        ) + self.fields.potential(self.particles.positions, self.particles.masses)
+
+    def _recover(self, energy: float) -> None:
+        """Roll a diverged tick back to the last good snapshot and raise the substeps.
+
+        The tick counter keeps running, so ticks stay monotonic for the
+        replay log and the restored state is snapshotted at the current tick.
+        """
+        tick, accumulator = self.tick, self.time_accumulator
+        self._restore_snapshot(self.history.nearest(tick - 1))
+        self.tick, self.time_accumulator = tick, accumulator
+        if not self.watchdog.escalate(tick, energy):
+            self.paused = True
+        self.watchdog.reset(self._energy())
+        self._capture_snapshot()
 
     def _update_simulation(self, delta_time: float) -> None:
-        for s in self.springs:
-            s.update(delta_time)
-        for p in self.mass_points:
-            others = [other for other in self.mass_points if other is not p]
-            p.update(delta_time, self.obstacles, others)
+        n = self.particles.count
+        if n == 0:
+            return
+        a, b, stiffness, rest_length, damping = self.spring_store.columns()
+        incidence = self.spring_store.incidence
+        self.collider.refresh(self.spring_store, self.topology_version)
+
+        # Split the tick only as far as the stiffest, lightest spring requires
+        stable_dt = stable_timestep(
+            self.particles.masses, self.particles.dampings, incidence, stiffness, damping
+        )
+        # The watchdog's boost tightens the step after a divergence
+        boost = self.watchdog.boost
+        self.substeps = substep_count(delta_time, stable_dt / boost, MAX_SUBSTEPS * boost)
+        delta_time /= self.substeps
+
+        for _ in range(self.substeps):
+            power = self.fields.accumulate(
+                self.particles.positions, self.particles.velocities, self.particles.masses,
+                self.particles.forces,
+            )
+            self.watchdog.add_work(power * delta_time)
+            self.particles.forces[:] += self.backend.spring_forces(
+                self.particles.positions, self.particles.velocities,
+                a, b, rest_length, stiffness, damping, incidence,
+            )
+            self.backend.integrate(
+                self.particles, delta_time, self.obstacles, bounds=self.world_size, contacts=self.contacts
+            )
+            self.collider.collide(self.particles)
@@ -0,0 +1,89 @@
+import logging
+
+import numpy as np
+
+from softbody_simulation.consts import (
+    WATCHDOG_COOLDOWN,
+    WATCHDOG_ENERGY_FLOOR,
+    WATCHDOG_MAX_BOOST,
+    WATCHDOG_SPIKE_FACTOR,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class EnergyWatchdog:
+    """Flags states whose total energy turns non-finite or spikes past the last good level.
+
+    Every divergence doubles `boost`, the factor the sandbox scales its
+    substep count by; after `cooldown` healthy checks it is halved again.
+    Work done by force fields without a potential (winds, drag, grids) is
+    added through `add_work` and taken off before comparing. The reference
+    level is dropped whenever the energy changes for a legitimate reason
+    (edits, drags, slider changes); rewinds restore the state captured with
+    the snapshot instead.
+    """
+
+    def __init__(self, spike_factor: float = WATCHDOG_SPIKE_FACTOR,
+                 energy_floor: float = WATCHDOG_ENERGY_FLOOR,
+                 max_boost: int = WATCHDOG_MAX_BOOST, cooldown: int = WATCHDOG_COOLDOWN):
+        self.spike_factor = spike_factor
+        self.energy_floor = energy_floor
+        self.max_boost = max_boost
+        self.cooldown = cooldown
+
+        self.reference: float | None = None
+        self.work = 0.0
+        self.boost = 1
+        self.healthy_checks = 0
+        self.divergences = 0
+
+    def capture(self) -> tuple:
+        """Everything later checks depend on, for snapshots."""
+        return self.reference, self.work, self.boost, self.healthy_checks
+
+    def restore(self, state: tuple) -> None:
+        self.reference, self.work, self.boost, self.healthy_checks = state
+
+    def reset(self, energy: float | None = None) -> None:
+        """Adopt `energy` as the last good level; None takes the next check's."""
+        self.reference = energy
+        self.work = 0.0
+
+    def add_work(self, work: float) -> None:
+        """Account for energy put in (or taken out) from outside since the reference."""
+        self.work += work
+
+    def check(self, energy: float, total_mass: float) -> bool:
+        """Whether a state at `energy` is healthy."""
+        energy -= self.work
+        if not np.isfinite(energy):
+            return False
+        if self.reference is None:
+            self.reference = energy
+        elif energy > self.spike_factor * self.reference + self.energy_floor * total_mass:
+            return False
+
+        self.healthy_checks += 1
+        if self.boost > 1 and self.healthy_checks >= self.cooldown:
+            self.boost //= 2
+            self.healthy_checks = 0
+        return True
+
+    def escalate(self, tick: int, energy: float) -> bool:
+        """Record a divergence; False if the boost was already at its maximum."""
+        self.divergences += 1
+        self.healthy_checks = 0
+        if self.boost >= self.max_boost:
+            logger.warning(
+                "Simulation diverged at tick %d (energy %.3g) at %dx substeps; "
+                "rolled back and paused", tick, energy, self.boost,
+            )
+            return False
+
+        self.boost = min(2 * self.boost, self.max_boost)
+        logger.warning(
+            "Simulation diverged at tick %d (energy %.3g); rolled back, substeps raised to %dx",
+            tick, energy, self.boost,
+        )
+        return True
@@ -1,3 +1,4 @@
+from .fonts import *
 from .button import *
 from .element import *
 from .panel import *
@@ -1,5 +1,6 @@
 import pygame
 from .element import UIElement
+from .fonts import get_font, render_text
 
 
 class Button(UIElement):
@@ -24,15 +25,12 @@ class Button(UIElement):
 
         # Setup font and text.
         self.font_size = font_size if font_size is not None else int(size[1] * 0.7)
-        if font.endswith((".ttf", ".otf")):
-            self.font = pygame.font.Font(font, self.font_size)
-        else:
-            self.font = pygame.font.SysFont(font, self.font_size)
+        self.font = get_font(font, self.font_size)
         self.font_color = font_color
         self.text = text
         self.text_surface = None
         if self.text:
-            self.text_surface = self.font.render(self.text, True, self.font_color)
+            self.text_surface = render_text(self.text, font, self.font_size, self.font_color)
 
     def handle_event(self, event: pygame.event.Event):
         if event.type == pygame.MOUSEMOTION:
@@ -0,0 +1,25 @@
+from functools import cache, lru_cache
+
+import pygame
+
+from softbody_simulation.consts import TEXT_CACHE_SIZE
+
+
+@cache
+def get_font(font: str, size: int) -> pygame.font.Font:
+    """Process-wide font cache, so each (font, size) is loaded from disk once."""
+    if font.endswith((".ttf", ".otf")):
+        return pygame.font.Font(font, size)
+    return pygame.font.SysFont(font, size)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _render_text(text: str, font: str, size: int, color) -> pygame.Surface:
+    return get_font(font, size).render(text, True, color)
+
+
+def render_text(text: str, font: str, size: int, color) -> pygame.Surface:
+    """Rendered text surface, shared between callers; do not draw onto it."""
+    if not isinstance(color, str):
+        color = tuple(color)
+    return _render_text(text, font, size, color)
@@ -33,11 +33,21 @@ class SandboxPanel(Panel):
             'obstacle_count': 0,
             'mode': None,
         }
+        self._last_layout = None
+        # Whether the last update changed what the panel shows
+        self.changed = True
+        self.summary_text = None
+        self.obstacle_text = None
+        self.sliders = {}
 
         self.build_ui_elements()
 
     def build_ui_elements(self):
         self.clear_elements()
+        self.summary_text = None
+        self.obstacle_text = None
+        self.sliders = {}
+        self._last_layout = self._layout(self._current_state())
         elements = []
 
         base_x = self.rect.centerx
@@ -69,27 +79,9 @@ class SandboxPanel(Panel):
 
     def _build_physics_ui(self, base_x, base_y):
         elements = []
-        ui_configs = []
-
-        selected_mass_points = [p for p in self.script.mass_points if p.selected]
-        selected_springs = [s for s in self.script.springs if s.selected]
-
-        if selected_mass_points or self.script.selection == Selection.MASS_POINT:
-            # If a mass is selected, use its value; otherwise fallback on the sandbox default.
-            mass_value = selected_mass_points[0].mass if selected_mass_points else self.script.default_mass
-            ui_configs.append(("Mass", (1, 200), mass_value, self.script.update_mass))
-
-        if selected_springs or self.script.selection == Selection.SPRING:
-            stiffness = selected_springs[0].stiffness if selected_springs else self.script.default_stiffness
-            rest_length = selected_springs[0].rest_length if selected_springs else self.script.default_rest_length
-            damping = selected_springs[0].damping if selected_springs else self.script.default_damping
-            ui_configs.extend([
-               ("Stiffness", (0, 300), stiffness, self.script.update_stiffness),
-               ("Rest Length", (0, 300), rest_length, self.script.update_rest_length),
-               ("Damping", (0, 100), damping, self.script.update_damping),
-            ])
+        ui_configs = self._slider_configs()
 
-        base_y = self._add_selection_summary(elements, base_x, base_y, selected_mass_points, selected_springs)
+        base_y = self._add_selection_summary(elements, base_x, base_y)
         self._add_sliders(elements, base_x, base_y, ui_configs)
 
         if not ui_configs:
@@ -97,15 +89,36 @@ class SandboxPanel(Panel):
 
         return elements
 
-    def _add_selection_summary(self, elements, base_x, base_y, mass_points, springs):
-        lines = []
-        if mass_points:
-            lines.append(f"Selected masses: {len(mass_points)}")
-        if springs:
-            lines.append(f"Selected springs: {len(springs)}")
+    def _slider_configs(self):
+        configs = []
+        mass_count = self.script.particles.selected_count
+        spring_count = self.script.spring_store.selected_count
+
+        # Selecting an item copies its values into the sandbox defaults
+        if mass_count or self.script.selection == Selection.MASS_POINT:
+            configs.append(("Mass", (1, 200), self.script.default_mass, self.script.update_mass))
+
+        if spring_count or self.script.selection == Selection.SPRING:
+            configs.extend([
+               ("Stiffness", (0, 300), self.script.default_stiffness, self.script.update_stiffness),
+               ("Rest Length", (0, 300), self.script.default_rest_length, self.script.update_rest_length),
+               ("Damping", (0, 100), self.script.default_damping, self.script.update_damping),
+            ])
+        return configs
 
+    def _summary_lines(self):
+        lines = []
+        if self.script.particles.selected_count:
+            lines.append(f"Selected masses: {self.script.particles.selected_count}")
+        if self.script.spring_store.selected_count:
+            lines.append(f"Selected springs: {self.script.spring_store.selected_count}")
+        return lines
+
+    def _add_selection_summary(self, elements, base_x, base_y):
+        lines = self._summary_lines()
         if lines:
-            elements.append(Text(center_pos=(base_x, base_y), text="\n".join(lines), size=16))
+            self.summary_text = Text(center_pos=(base_x, base_y), text="\n".join(lines), size=16)
+            elements.append(self.summary_text)
             base_y += 30 * len(lines)
 
         return base_y
@@ -115,13 +128,14 @@ class SandboxPanel(Panel):
             y_offset = base_y + self.element_gap * idx
 
             elements.append(Text(center_pos=(base_x, y_offset), text=label, size=16))
-            elements.append(Slider(
+            self.sliders[label] = Slider(
                 pos=(base_x - 60, y_offset + self.element_gap / 3),
                 size=(120, 8),
                 vrange=vrange,
                 value=value,
                 callback=callback
-            ))
+            )
+            elements.append(self.sliders[label])
 
     def _add_help_text(self, elements, base_x, base_y):
         elements.append(Text(center_pos=(base_x, base_y), text="Select objects", size=16))
@@ -132,13 +146,22 @@ class SandboxPanel(Panel):
             "Left click - Select",
             "Right click - Create",
             "Ctrl + Left click - Add to selection",
+            "Shift + drag - Box select",
+            "Shift + Alt + drag - Lasso select",
+            "Ctrl + C / V / D - Copy / Paste / Dup",
             "DELETE - Remove selected",
             "Right arrow - Step",
+            "Left arrow - Step back",
             "Space - Pause",
             "ESC - Cancel",
             "TAB - Switch mode",
             "R - Reset simulation",
-            "G - Toggle gravity",
+            "G - Gravity, T - Tearing",
+            "A / Shift + A - Attractor / Repulsor",
+            "W - Wind, X - Clear fields",
+            "F5 - Save replay log",
+            "Middle drag - Pan view",
+            "Wheel - Zoom, Home - Reset view",
         ]
 
         for idx, line in enumerate(controls):
@@ -151,9 +174,8 @@ class SandboxPanel(Panel):
     def _build_obstacle_ui(self, base_x, base_y):
         elements = []
 
-        selected = [obs for obs in self.script.obstacles if obs.selected]
-        obstacle_text = f"Selected: {len(selected)}" if selected else "No obstacles selected"
-        elements.append(Text(center_pos=(base_x, base_y), text=obstacle_text, size=16))
+        self.obstacle_text = Text(center_pos=(base_x, base_y), text=self._obstacle_summary(), size=16)
+        elements.append(self.obstacle_text)
 
         hints = [
             "Controls:",
@@ -162,11 +184,17 @@ class SandboxPanel(Panel):
             "Ctrl + Left Click - Add to selection",
             "DELETE - Remove selected",
             "Right arrow - Step",
+            "Left arrow - Step back",
             "Space - Pause",
             "ESC - Cancel",
             "TAB - Switch mode",
             "R - Reset simulation",
-            "G - Toggle gravity",
+            "G - Gravity, T - Tearing",
+            "A / Shift + A - Attractor / Repulsor",
+            "W - Wind, X - Clear fields",
+            "F5 - Save replay log",
+            "Middle drag - Pan view",
+            "Wheel - Zoom, Home - Reset view",
         ]
 
         for idx, hint in enumerate(hints):
@@ -178,6 +206,10 @@ class SandboxPanel(Panel):
 
         return elements
 
+    def _obstacle_summary(self):
+        count = self.script.obstacles.selected_count
+        return f"Selected: {count}" if count else "No obstacles selected"
+
     def _get_mode_button_text(self):
         return "Physics" if self.script.mode == Mode.PHYSICS else "Obstacle"
 
@@ -185,16 +217,44 @@ class SandboxPanel(Panel):
         new_mode = Mode.PHYSICS if self.script.mode == Mode.OBSTACLE else Mode.OBSTACLE
         self.script.switch_mode(new_mode)
 
+    def _current_state(self):
+        return {
+            'mass_count': self.script.particles.selected_count,
+            'spring_count': self.script.spring_store.selected_count,
+            'obstacle_count': self.script.obstacles.selected_count,
+            'mode': self.script.mode,
+            'selection': self.script.selection,
+        }
+
+    def _layout(self, state):
+        # Everything that decides which elements exist and where they sit;
+        # other state changes are applied to the existing elements in place
+        return (
+            state['mode'],
+            state['selection'],
+            bool(state['mass_count']),
+            bool(state['spring_count']),
+        )
+
+    def _refresh_elements(self):
+        if self.summary_text is not None:
+            self.summary_text.set_text("\n".join(self._summary_lines()))
+        if self.obstacle_text is not None:
+            self.obstacle_text.set_text(self._obstacle_summary())
+        for label, _, value, _ in self._slider_configs():
+            self.sliders[label].set_value(value)
+        self.update_boundary_box()
+
     def update(self):
         super().update()
 
-        current_state = {
-            'mass_count': len([p for p in self.script.mass_points if p.selected]),
-            'spring_count': len([s for s in self.script.springs if s.selected]),
-            'obstacle_count': len([o for o in self.script.obstacles if o.selected]),
-            'mode': self.script.mode,
-        }
+        current_state = self._current_state()
+        self.changed = current_state != self._last_state
+        if not self.changed:
+            return
 
-        if current_state != self._last_state:
+        if self._layout(current_state) != self._last_layout:
             self.build_ui_elements()
-            self._last_state = current_state.copy()
+        else:
+            self._refresh_elements()
+        self._last_state = current_state
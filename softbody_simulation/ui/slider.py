@@ -11,6 +11,10 @@ class Slider(UIElement):
         self.circle_radius = int(self.rect.h * 1.5)
         self.update_circle_position()
 
+    def set_value(self, value):
+        self.value = value if self.vrange[0] <= value <= self.vrange[1] else self.vrange[0]
+        self.update_circle_position()
+
     def update_circle_position(self):
         ratio = (self.value - self.vrange[0]) / (self.vrange[1] - self.vrange[0])
         self.circle_x = self.rect.x + ratio * self.rect.w
@@ -1,5 +1,6 @@
 import pygame
 from .element import UIElement
+from .fonts import get_font, render_text
 
 
 class Text(UIElement):
@@ -8,14 +9,12 @@ class Text(UIElement):
         self.text = text
         self.size = size
         self.color = color
-        if font.endswith((".ttf", ".otf")):
-            self.font = pygame.font.Font(font, self.size)
-        else:
-            self.font = pygame.font.SysFont(font, self.size)
+        self.font_name = font
+        self.font = get_font(font, self.size)
         self.update_text_surface()
 
     def update_text_surface(self):
-        self.surface = self.font.render(self.text, True, self.color)
+        self.surface = render_text(self.text, self.font_name, self.size, self.color)
         self.rect = self.surface.get_rect(center=self.center_pos)
 
     def handle_event(self, event: pygame.event.Event):
@@ -30,5 +29,7 @@ class Text(UIElement):
         screen.blit(self.surface, self.rect)
 
     def set_text(self, new_text):
+        if new_text == self.text:
+            return
         self.text = new_text
         self.update_text_surface()
@@ -42,6 +42,19 @@ def distance_point_to_line(
     return float(np.linalg.norm(point - projection))
 
 
+def segment_distances(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """(N, E) distances from every point to every segment `starts[e] -> ends[e]`."""
+    d = ends - starts
+    length_sq = np.einsum("ij,ij->i", d, d)
+    rel = points[:, None, :] - starts[None, :, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.einsum("nej,ej->ne", rel, d) / length_sq
+    t = np.clip(np.nan_to_num(t), 0, 1)
+    closest = starts[None, :, :] + t[..., None] * d[None, :, :]
+    diff = points[:, None, :] - closest
+    return np.sqrt(np.einsum("nej,nej->ne", diff, diff))
+
+
 class Singleton:
     _instance = None
 
@@ -49,3 +62,18 @@ class Singleton:
         if cls._instance is None:
             cls._instance = super().__new__(cls)  # Fix: No extra arguments
         return cls._instance
+
+
+def points_in_polygon(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """Even-odd test of many (N, 2) points against one polygon at once."""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    polygon = np.asarray(polygon, dtype=np.float64)
+    x, y = points[:, 0:1], points[:, 1:2]
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+
+    straddles = (y1 > y) != (y2 > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_intersect = (y - y1) * (x2 - x1) / (y2 - y1) + x1
+    crossings = straddles & (x < x_intersect)
+    return (crossings.sum(axis=1) % 2) == 1
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from softbody_simulation.physics import (
+    ContactCache, NumbaBackend, NumpyBackend, select_backend, validate_backend,
+)
+from softbody_simulation.physics.backends import _validation_scene
+
+
+def test_loop_kernels_match_numpy():
+    # Without Numba the loop kernels run as plain Python, so this always runs
+    assert validate_backend(NumbaBackend(), NumpyBackend())
+
+
+def test_compiled_backend_matches_numpy():
+    pytest.importorskip("numba")
+    assert validate_backend(NumbaBackend(), NumpyBackend())
+    assert select_backend("numba").name == "numba"
+
+
+def test_select_backend_rejects_unknown_names():
+    assert select_backend("numpy").name == "numpy"
+    with pytest.raises(ValueError):
+        select_backend("cuda")
+
+
+def test_integrating_rows_leaves_the_others_alone():
+    runs = []
+    for backend in (NumbaBackend(), NumpyBackend()):
+        particles, _, obstacles = _validation_scene()
+        particles.forces[:] = np.random.default_rng(1).normal(0, 100, particles.forces.shape)
+        frozen = particles.state[:particles.count:2].copy()
+        contacts = ContactCache()
+        for _ in range(60):
+            backend.integrate(particles, 1 / 60, obstacles, contacts=contacts,
+                              rows=np.arange(1, particles.count, 2))
+        np.testing.assert_array_equal(particles.state[:particles.count:2], frozen)
+        assert len(contacts) and (contacts.point % 2 == 1).all()
+        runs.append(particles.state[:particles.count].copy())
+    np.testing.assert_allclose(runs[0], runs[1], rtol=1e-9, atol=1e-9)
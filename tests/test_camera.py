@@ -0,0 +1,40 @@
+import numpy as np
+
+from softbody_simulation.entities import MassPoint
+from softbody_simulation.rendering import Camera
+
+
+def test_to_world_inverts_to_screen():
+    camera = Camera(view_size=(800, 600), world_size=(2400, 1800))
+    camera.zoom_at((100, 50), 2.5)
+    camera.pan((-300, -120))
+    points = np.random.default_rng(1).uniform(0, 2400, (50, 2))
+    for point in points:
+        np.testing.assert_allclose(camera.to_world(camera.to_screen(point)), point)
+
+
+def test_zoom_at_keeps_the_anchor_and_stays_in_the_world():
+    camera = Camera(view_size=(800, 600), world_size=(2400, 1800), max_zoom=4)
+    anchor = camera.to_world((400, 300))
+    camera.zoom_at((400, 300), 2)
+    assert camera.zoom == 2
+    np.testing.assert_allclose(camera.to_world((400, 300)), anchor)
+
+    camera.zoom_at((400, 300), 100)
+    assert camera.zoom == 4
+    # Zooming out stops at the whole world and the view never leaves it
+    camera.zoom_at((0, 0), 1e-3)
+    assert camera.zoom == camera.min_zoom == 1 / 3
+    low, high = camera.view_bounds
+    assert (low >= 0).all() and (high <= camera.world_size + 1e-9).all()
+
+
+def test_mass_point_bounces_off_the_given_bounds():
+    point = MassPoint(np.array([1500.0, 900.0]), 1, np.array([100.0, 0.0]), use_gravity=False)
+    point.update(1 / 60, bounds=(2400, 1800))
+    # Well inside the world, though outside the window
+    assert point.pos[0] > 1500 and point.velocity[0] > 0
+
+    point.pos = np.array([2395.0, 900.0])
+    point.update(1 / 60, bounds=(2400, 1800))
+    assert point.pos[0] < 2400 and point.velocity[0] < 0
@@ -0,0 +1,35 @@
+import numpy as np
+
+from softbody_simulation.entities import ParticleStore, PolygonObstacle
+from softbody_simulation.physics import ContactCache
+
+
+def _wedged(velocity) -> ParticleStore:
+    particles = ParticleStore()
+    particles.add(np.array([(100.0, 96.0)]), mass=1.0, damping=0, velocity=np.array([velocity]))
+    return particles
+
+
+def test_a_wedged_point_stops_against_both_edges():
+    # Two shallow slopes meeting above the point
+    obstacles = [PolygonObstacle(np.array([(0, 70), (100, 100), (0, 100)])),
+                 PolygonObstacle(np.array([(100, 100), (200, 70), (200, 100)]))]
+    particles = _wedged((10.0, 50.0))
+    contacts = ContactCache()
+    contacts.resolve(particles, obstacles, 5, 0.0)
+
+    assert len(contacts) == 2
+    speeds = contacts.normals[contacts.edge] @ particles.velocities[0]
+    np.testing.assert_allclose(speeds, 0, atol=1e-9)
+    assert (contacts.impulse >= 0).all() and contacts.impulse.sum() > 0
+
+
+def test_contacts_found_again_keep_their_impulse():
+    obstacles = [PolygonObstacle(np.array([(0, 100), (200, 100), (200, 200), (0, 200)]))]
+    particles = _wedged((0.0, 5.0))
+    contacts = ContactCache()
+    contacts.resolve(particles, obstacles, 5, 0.0)
+    impulse = contacts.impulse.copy()
+
+    contacts.update(particles.positions, obstacles, 5)
+    np.testing.assert_array_equal(contacts.impulse, impulse)
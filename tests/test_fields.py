@@ -0,0 +1,63 @@
+import numpy as np
+
+from softbody_simulation.physics import (
+    DragRegion, ForceFields, RadialField, UniformField, VectorGrid, field_from_dict, field_to_dict,
+)
+
+
+def _points(rng, count: int = 200) -> np.ndarray:
+    return rng.uniform(0, 800, (count, 2))
+
+
+def test_radial_forces_are_the_potential_gradient():
+    rng = np.random.default_rng(2)
+    fields = ForceFields([
+        RadialField((300, 300), 2e6, radius=250),
+        RadialField((500, 350), -1e6, radius=200, softening=30),
+    ])
+    pos, mass = _points(rng), rng.uniform(0.5, 2, 200)
+    force = fields.accelerations(pos, np.zeros_like(pos)) * mass[:, None]
+
+    step = 1e-4
+    gradient = np.zeros_like(pos)
+    for i in range(len(pos)):
+        for axis in range(2):
+            offset = np.zeros(2)
+            offset[axis] = step
+            up = fields.potential(pos[i:i + 1] + offset, mass[i:i + 1])
+            down = fields.potential(pos[i:i + 1] - offset, mass[i:i + 1])
+            gradient[i, axis] = (up - down) / (2 * step)
+    # Points right on a field's edge see the cut-off; skip them
+    centers = np.array([(300, 300), (500, 350)])
+    edges = np.abs(np.linalg.norm(pos[:, None] - centers, axis=2) - (250, 200)).min(axis=1) > 1
+    np.testing.assert_allclose(force[edges], -gradient[edges], rtol=1e-5, atol=1e-6)
+    assert fields.potential(pos, mass) >= 0
+
+
+def test_power_counts_only_fields_without_a_potential():
+    rng = np.random.default_rng(5)
+    pos, vel, mass = _points(rng), rng.normal(0, 100, (200, 2)), rng.uniform(0.5, 2, 200)
+    radial = RadialField((400, 400), 3e6)
+    driven = [
+        UniformField((0, 300), low=(0, 0), high=(400, 800)),
+        DragRegion((200, 200), (600, 600), rate=2, flow=(150, 0)),
+        VectorGrid((100, 100), 100, rng.normal(0, 50, (5, 6, 2))),
+    ]
+
+    fields = ForceFields([radial, *driven])
+    out = np.zeros_like(pos)
+    power = fields.accumulate(pos, vel, mass, out)
+    np.testing.assert_allclose(out, fields.accelerations(pos, vel) * mass[:, None])
+
+    driven_force = ForceFields(driven).accelerations(pos, vel) * mass[:, None]
+    np.testing.assert_allclose(power, np.sum(driven_force * vel))
+    assert ForceFields([radial]).accumulate(pos, vel, mass, np.zeros_like(pos)) == 0
+    assert ForceFields().accumulate(pos, vel, mass, out) == 0
+
+
+def test_fields_round_trip_through_dicts():
+    grid = VectorGrid((0, 0), 50, np.ones((2, 3, 2)))
+    for field in (UniformField((0, 10)), RadialField((1, 2), -5.0), DragRegion((0, 0), (5, 5), 1), grid):
+        copy = field_from_dict(field_to_dict(field))
+        assert type(copy) is type(field)
+        assert field_to_dict(copy) == field_to_dict(field)
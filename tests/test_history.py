@@ -0,0 +1,105 @@
+import numpy as np
+
+from softbody_simulation.scripts.history import SnapshotBuffer
+from softbody_simulation.scripts.sandbox import Sandbox, Selection
+
+
+def _sandbox() -> Sandbox:
+    """Three points joined by two springs, with snapshots every 5 ticks."""
+    sandbox = Sandbox(1, 100, 40, 1, snapshot_interval=5)
+    for pos in ((100, 300), (150, 300), (200, 320)):
+        sandbox.handle_right_mouse_click(pos)
+    a, b, c = sandbox.mass_points
+    b.selected = True
+    sandbox._handle_mass_point_click(a)
+    c.selected = True
+    sandbox._handle_mass_point_click(b)
+    return sandbox
+
+
+def test_topology_is_shared_until_its_version_changes():
+    buffer = SnapshotBuffer(capacity=8, interval=5)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return (len(calls),)
+
+    first = buffer.capture(0, np.zeros((2, 4)), 0, factory)
+    second = buffer.capture(5, np.ones((2, 4)), 0, factory)
+    third = buffer.capture(10, np.ones((2, 4)), 1, factory)
+
+    assert len(calls) == 2
+    assert second.topology is first.topology
+    assert third.topology is not first.topology
+    assert buffer.nearest(7) is second
+    buffer.truncate_after(5)
+    assert len(buffer) == 2
+
+
+def test_step_back_restores_state_and_topology_across_an_edit():
+    sandbox = _sandbox()
+    states = {}
+    for _ in range(12):
+        sandbox._step()
+        states[sandbox.tick] = sandbox.particles.state[:sandbox.particles.count].copy()
+
+    sandbox.spring_store.set_selected([0])
+    sandbox.selection = Selection.SPRING
+    sandbox.handle_delete()
+    assert len(sandbox.springs) == 1
+    for _ in range(6):
+        sandbox._step()
+
+    while sandbox.tick > 8:
+        sandbox.perform_step_back()
+    assert len(sandbox.springs) == 2
+    np.testing.assert_array_equal(sandbox.particles.state[:sandbox.particles.count], states[8])
+
+
+def _step_back_across(sandbox: Sandbox, edit, edit_tick: int, target: int) -> None:
+    states = {}
+    while sandbox.tick < edit_tick:
+        sandbox._step()
+        states[sandbox.tick] = sandbox.particles.state[:sandbox.particles.count].copy()
+    edit()
+    for _ in range(6):
+        sandbox._step()
+
+    while sandbox.tick > target:
+        sandbox.perform_step_back()
+    np.testing.assert_array_equal(sandbox.particles.state[:sandbox.particles.count], states[target])
+    # And re-running from there replays the original, unedited run
+    sandbox._step()
+    np.testing.assert_array_equal(
+        sandbox.particles.state[:sandbox.particles.count], states[target + 1]
+    )
+
+
+def test_step_back_undoes_a_gravity_toggle():
+    sandbox = _sandbox()
+    _step_back_across(sandbox, sandbox.toggle_gravity, 12, 8)
+    assert sandbox.use_gravity
+    assert sandbox.particles.gravity_mask[:sandbox.particles.count].all()
+
+
+def test_step_back_undoes_a_mass_edit():
+    sandbox = _sandbox()
+    sandbox.mass_points[0].selected = True
+
+    _step_back_across(sandbox, lambda: sandbox.update_mass(50), 7, 5)
+    np.testing.assert_array_equal(sandbox.particles.masses, 1)
+
+
+def test_step_back_restores_the_watchdog_boost():
+    sandbox = _sandbox()
+    for _ in range(5):
+        sandbox._step()
+    sandbox.watchdog.boost = 4
+    sandbox._capture_snapshot()
+    for _ in range(3):
+        sandbox._step()
+    sandbox.watchdog.boost = 1
+
+    sandbox.perform_step_back()
+    assert sandbox.watchdog.boost == 4
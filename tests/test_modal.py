@@ -0,0 +1,62 @@
+import numpy as np
+
+from softbody_simulation.entities import ParticleStore, PolygonObstacle
+from softbody_simulation.physics import (
+    BodyInstance, BodyInstances, ContactCache, ModalBody, NumpyBackend, body_template,
+)
+from softbody_simulation.physics.modal import _push_impulses
+
+
+def test_push_impulses_meet_the_contact_conditions():
+    rng = np.random.default_rng(3)
+    for _ in range(200):
+        count, coordinates = rng.integers(1, 30), rng.choice([3, 15])
+        columns = rng.normal(size=(count, coordinates))
+        coupling = columns @ columns.T + 1e-6 * np.eye(count)
+        targets = rng.normal(size=count)
+
+        impulses = _push_impulses(coupling, targets)
+        shortfall = targets - coupling @ impulses
+        # Never pulling; pushing contacts meet their target, idle ones need no push
+        assert (impulses >= 0).all()
+        np.testing.assert_allclose(shortfall[impulses > 0], 0, atol=1e-8)
+        assert (shortfall[impulses == 0] <= 1e-8).all()
+
+
+def test_modal_bodies_are_opt_in_and_left_out_of_the_shared_step():
+    soft = body_template("grid", size=(3, 3), spacing=100, stiffness=200, damping=1)
+    stiff = body_template("grid", size=(4, 4), spacing=40, stiffness=20000, damping=2)
+    assert soft.substeps() < stiff.substeps()
+
+    assert isinstance(BodyInstances(ParticleStore()).spawn(stiff, offset=(0, 0)), BodyInstance)
+
+    particles = ParticleStore()
+    bodies = BodyInstances(particles)
+    soft_body = bodies.spawn(soft, offset=(50, 50))
+    assert bodies.free_rows is None
+    body = bodies.spawn(stiff, offset=(450, 100), velocity=(-150, 0), modal=True)
+    assert isinstance(body, ModalBody)
+    free = soft_body.rows
+    np.testing.assert_array_equal(bodies.free_rows, free)
+    assert len(bodies.spring_indices()) == len(soft.springs) + len(stiff.springs)
+
+    # The shared pass integrates the free rows only, forces included
+    bodies.accumulate_forces()
+    particles.forces[body.rows] = 1e9
+    before = particles.state[body.rows].copy()
+    NumpyBackend().integrate(particles, 1 / 60, bounds=(800, 600), rows=bodies.free_rows)
+    np.testing.assert_array_equal(particles.state[body.rows], before)
+    assert (particles.forces[body.rows] == 1e9).all() and not particles.forces[free].any()
+    particles.forces[body.rows] = 0
+
+    contacts = ContactCache()
+    floor = [PolygonObstacle(np.array([(0, 560), (800, 560), (800, 600), (0, 600)]))]
+    for _ in range(300):
+        bodies.accumulate_forces()
+        bodies.step(NumpyBackend(), 1 / 60, (800, 600), floor, contacts)
+    positions = particles.positions[body.rows]
+    assert np.isfinite(particles.state[:particles.count]).all()
+    assert not np.isin(contacts.point, body.rows).any()
+    # Still the same rigid shape, within small vibrations
+    spans = positions.max(axis=0) - positions.min(axis=0)
+    np.testing.assert_allclose(np.sort(spans), [120, 120], rtol=0.1)
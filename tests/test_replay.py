@@ -0,0 +1,54 @@
+import numpy as np
+
+from softbody_simulation.consts import FIXED_DELTA_TIME
+from softbody_simulation.physics import RadialField, field_to_dict
+from softbody_simulation.scripts.replay import ActionLog, ActionRecorder, replay
+from softbody_simulation.scripts.sandbox import Sandbox
+
+
+def _click(actions: ActionRecorder, clock: list, pos) -> None:
+    actions.handle_left_mouse_down(pos)
+    clock[0] += 50
+    actions.handle_left_mouse_up(pos)
+
+
+def _run(script: Sandbox, clock: list, ticks: int) -> None:
+    for _ in range(ticks):
+        clock[0] += 16
+        script.update(FIXED_DELTA_TIME)
+
+
+def test_replay_reproduces_a_session_bit_for_bit(tmp_path):
+    kwargs = {"default_mass": 1, "default_stiffness": 80, "default_rest_length": 40,
+              "default_damping": 1, "snapshot_interval": 5}
+    script = Sandbox(**kwargs)
+    clock = [0]
+    script.get_ticks = lambda: clock[0]
+    actions = ActionRecorder(script, ActionLog(kwargs))
+
+    for pos in ((100, 300), (160, 300), (130, 350)):
+        actions.handle_right_mouse_click(pos)
+    _click(actions, clock, (100, 300))
+    _click(actions, clock, (160, 300))
+    _click(actions, clock, (130, 350))
+    _click(actions, clock, (100, 300))
+    _run(script, clock, 20)
+    actions.add_force_field(field_to_dict(RadialField((300, 300), 2e6)))
+    actions.toggle_gravity()
+    _run(script, clock, 15)
+    actions.perform_step_back()
+    actions.toggle_pause()
+    _run(script, clock, 10)
+
+    path = tmp_path / "replay.json"
+    actions.save(path)
+    replayed = replay(ActionLog.load(path))
+
+    assert len(script.springs) == 2
+    assert replayed.tick == script.tick
+    np.testing.assert_array_equal(
+        replayed.particles.state[:replayed.particles.count],
+        script.particles.state[:script.particles.count],
+    )
+    for ours, theirs in zip(replayed.spring_store.columns(), script.spring_store.columns()):
+        np.testing.assert_array_equal(ours, theirs)
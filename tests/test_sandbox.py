@@ -0,0 +1,56 @@
+import numpy as np
+
+from softbody_simulation.scripts.sandbox import Mode, Sandbox, Selection
+
+
+def test_delete_with_nothing_selected_keeps_the_topology():
+    sandbox = Sandbox(1, 100, 40, 1)
+    for pos in ((100, 300), (150, 300)):
+        sandbox.handle_right_mouse_click(pos)
+    sandbox._clear_all_selections()
+    version, snapshots = sandbox.topology_version, len(sandbox.history)
+
+    for selection in Selection:
+        sandbox.selection = selection
+        sandbox.handle_delete()
+    assert sandbox.topology_version == version
+    assert len(sandbox.history) == snapshots
+    assert len(sandbox.mass_points) == 2
+
+    sandbox.mass_points[0].selected = True
+    sandbox.selection = Selection.MASS_POINT
+    sandbox.handle_delete()
+    assert sandbox.topology_version != version
+    assert len(sandbox.mass_points) == 1
+
+
+def _draw_obstacle(sandbox: Sandbox, corners) -> None:
+    for corner in corners:
+        sandbox._handle_obstacle_click(np.array(corner))
+    sandbox.complete_obstacle()
+
+
+def test_obstacle_selection_is_counted_by_the_store():
+    sandbox = Sandbox(1, 100, 40, 1)
+    sandbox.switch_mode(Mode.OBSTACLE)
+    for x in (100, 300, 500):
+        _draw_obstacle(sandbox, [(x, 400), (x + 100, 400), (x + 100, 500), (x, 500)])
+    obstacles = list(sandbox.obstacles)
+    # A new obstacle is the only one selected
+    assert sandbox.obstacles.selected_count == 1 and obstacles[2].selected
+
+    for _ in range(12):
+        sandbox._step()
+    sandbox.handle_double_click((150, 450))
+    assert sandbox.obstacles.selected_count == 3
+    obstacles[1].selected = False
+    sandbox.handle_delete()
+    assert list(sandbox.obstacles) == [obstacles[1]]
+    assert obstacles[1].index == 0 and obstacles[0].index == -1
+    assert sandbox.obstacles.selected_count == 0 and not obstacles[1].selected
+
+    sandbox.perform_step_back()
+    assert list(sandbox.obstacles) == obstacles
+    assert [o.index for o in obstacles] == [0, 1, 2]
+    sandbox._clear_all_selections()
+    assert not any(o.selected for o in obstacles)
@@ -0,0 +1,57 @@
+import numpy as np
+
+from softbody_simulation.entities import PolygonObstacle
+from softbody_simulation.physics import SpatialIndex
+from softbody_simulation.utils import segment_distances
+
+
+def _index(rng) -> SpatialIndex:
+    positions = rng.uniform(0, 1000, (300, 2))
+    positions[5] = np.nan
+    springs = rng.integers(0, 300, (400, 2))
+    # Short springs between neighbours, plus the random ones reaching across the world
+    springs[:200, 1] = (springs[:200, 0] + 1) % 300
+    index = SpatialIndex(cell_size=20)
+    index.refresh(positions, springs, [])
+    return index
+
+
+def test_queries_match_a_brute_force_scan():
+    rng = np.random.default_rng(7)
+    index = _index(rng)
+    assert len(index.oversized_segments) > 0
+    starts, ends = index.positions[index.springs[:, 0]], index.positions[index.springs[:, 1]]
+
+    for pos in rng.uniform(0, 1000, (200, 2)):
+        distances = np.linalg.norm(index.positions - pos, axis=1)
+        nearest = index.nearest_point(pos, 30)
+        if nearest is None:
+            assert not (distances <= 30).any()
+        else:
+            assert distances[nearest] == np.nanmin(distances)
+
+        distances = segment_distances(pos[None, :], starts, ends)[0]
+        nearest = index.nearest_segment(pos, 15)
+        if nearest is None:
+            assert not (distances <= 15).any()
+        else:
+            assert distances[nearest] == np.nanmin(distances)
+
+        low, high = pos - 60, pos + 60
+        inside = ((index.positions >= low) & (index.positions <= high)).all(axis=1)
+        assert sorted(index.points_in_box(low, high)) == list(np.flatnonzero(inside))
+        # Every finite spring with an end in the box is a candidate, oversized ones included
+        touching = inside[index.springs].any(axis=1) & (index.springs != 5).all(axis=1)
+        assert set(np.flatnonzero(touching)) <= set(index.segments_in_box(low, high))
+
+
+def test_obstacle_queries_use_bounding_boxes():
+    square = PolygonObstacle(np.array([(100, 100), (200, 100), (200, 200), (100, 200)]))
+    wedge = PolygonObstacle(np.array([(400, 100), (500, 300), (300, 300)]))
+    index = SpatialIndex()
+    index.refresh(np.empty((0, 2)), np.empty((0, 2), dtype=np.intp), [square, wedge])
+
+    assert list(index.obstacles_in_box((150, 150), (350, 160))) == [0, 1]
+    assert list(index.obstacles_in_box((210, 0), (290, 400))) == []
+    assert list(index.obstacles_near((205, 150), 10)) == [0]
+    assert list(index.obstacles_near((205, 150), 1)) == []
@@ -0,0 +1,39 @@
+import numpy as np
+
+from softbody_simulation.entities import (
+    IncidenceMatrix, MassPoint, ParticleStore, Spring, SpringStore, pair_keys,
+)
+from softbody_simulation.physics import grid_mesh
+
+
+def test_swap_remove_matches_a_rebuild():
+    rng = np.random.default_rng(0)
+    points, springs = grid_mesh((0, 0), (12, 12), 10)
+    particles = ParticleStore()
+    MassPoint.spawn_many(particles, points, 1)
+    store = SpringStore(particles)
+    Spring.spawn_many(store, springs, 50, 1)
+    store.set_selected(rng.choice(store.count, 40, replace=False))
+    # Build the cached indexes so they have to follow the removals
+    store.pairs, store.incidence.transpose
+
+    for _ in range(10):
+        torn = rng.choice(store.count, 25, replace=False)
+        removed = [store.handles[i] for i in torn]
+        selected = store.selected_count - int(store.selected[torn].sum())
+        store.swap_remove(torn)
+
+        n = store.count
+        assert all(handle.index == -1 for handle in removed)
+        assert [handle.index for handle in store.handles] == list(range(n))
+        assert store.selected_count == selected == int(store.selection_mask.sum())
+        assert store.pairs == dict(zip(pair_keys(store.a[:n], store.b[:n]).tolist(), range(n)))
+
+        fresh = IncidenceMatrix(store.a[:n], store.b[:n], particles.count)
+        np.testing.assert_array_equal(store.incidence.indices, fresh.indices)
+        values = rng.random((n, 2))
+        np.testing.assert_allclose(store.incidence.transpose_dot(values), fresh.transpose_dot(values))
+        indptr, incident = store.incidence.transpose
+        np.testing.assert_array_equal(indptr, fresh.transpose[0])
+        for point in range(particles.count):
+            assert sorted(incident[indptr[point]:indptr[point + 1]]) == sorted(fresh.incident(point))
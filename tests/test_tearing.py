@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from softbody_simulation.entities import MassPoint, ParticleStore, Spring, SpringStore
+from softbody_simulation.physics import BodyCollider, body_template
+from softbody_simulation.scripts.sandbox import Sandbox
+
+
+def _pair(tear_strain, stretch: float) -> Sandbox:
+    """Two resting points whose 40 px spring is stretched by `stretch`."""
+    sandbox = Sandbox(1, 100, 40, 1, tear_strain=tear_strain)
+    a = MassPoint(np.array((100.0, 300.0)), 1, use_gravity=False, particles=sandbox.particles)
+    b = MassPoint(np.array((100.0 + 40 * stretch, 300.0)), 1, use_gravity=False,
+                  particles=sandbox.particles)
+    Spring((a, b), stiffness=100, damping=1, rest_length=40, springs=sandbox.spring_store)
+    sandbox._topology_changed()
+    return sandbox
+
+
+def test_tearing_is_off_by_default():
+    sandbox = _pair(None, 10)
+    assert sandbox.tear_strain is None
+    sandbox._tear_springs()
+    assert len(sandbox.springs) == 1
+
+
+@pytest.mark.parametrize("stretch, torn", [(2.9, False), (3.1, True)])
+def test_springs_tear_past_the_strain(stretch, torn):
+    sandbox = _pair(2.0, stretch)
+    version = sandbox.topology_version
+    sandbox._tear_springs()
+    assert len(sandbox.springs) == (0 if torn else 1)
+    assert (sandbox.topology_version != version) == torn
+
+
+def test_toggle_tearing():
+    sandbox = _pair(None, 3.1)
+    sandbox.toggle_tearing()
+    sandbox._tear_springs()
+    assert len(sandbox.springs) == 0
+
+
+def test_collider_follows_tears_like_a_refresh():
+    rng = np.random.default_rng(1)
+    particles = ParticleStore()
+    springs = SpringStore(particles)
+    template = body_template("grid", size=(10, 8), spacing=5)
+    for offset in (0, 1000):
+        first = particles.count
+        MassPoint.spawn_many(particles, template.points + offset, 1)
+        Spring.spawn_many(springs, template.springs + first, 50, 1)
+    particles.positions[:] += rng.normal(0, 0.3, particles.positions.shape)
+
+    collider = BodyCollider()
+    collider.refresh(springs, 0)
+    for version in range(20):
+        torn = rng.choice(springs.count, 15, replace=False)
+        a, b = springs.a[torn].copy(), springs.b[torn].copy()
+        springs.swap_remove(torn)
+        collider.tear(springs, a, b, version, version + 1)
+
+        fresh = BodyCollider()
+        fresh.refresh(springs, 0)
+        for name in ("roots", "point_order", "point_starts", "edges", "edge_sides", "edge_starts"):
+            np.testing.assert_array_equal(getattr(collider, name), getattr(fresh, name))
+    assert collider.island_count > 2
@@ -0,0 +1,13 @@
+import numpy as np
+
+from softbody_simulation.physics import body_template
+
+
+def test_templates_accept_lists_and_share_the_cache():
+    template = body_template("grid", size=[3, 3], spacing=20)
+    assert body_template("grid", size=(3, 3), spacing=20) is template
+    assert body_template("grid", size=np.array([3, 3]), spacing=20) is template
+
+    square = [[0, 0], [60, 0], [60, 60], [0, 60]]
+    polygon = body_template("polygon", spacing=20, outline=square)
+    assert body_template("polygon", spacing=20, outline=tuple(map(tuple, square))) is polygon
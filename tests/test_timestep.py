@@ -0,0 +1,65 @@
+import numpy as np
+
+from softbody_simulation.entities import IncidenceMatrix
+from softbody_simulation.physics import stable_timestep, substep_count
+
+
+def _chain(count: int, rng):
+    a = np.arange(count - 1)
+    incidence = IncidenceMatrix(a, a + 1, count)
+    mass = rng.uniform(0.5, 2, count)
+    stiffness = rng.uniform(50, 5000, count - 1)
+    return incidence, mass, stiffness
+
+
+def _peak_amplitude(incidence, mass, stiffness, damping, dt: float, steps: int = 4000) -> float:
+    """Semi-implicit Euler on the linearized 1-D chain, from a random kick."""
+    x = np.random.default_rng(0).normal(size=len(mass))
+    v = np.zeros_like(x)
+    with np.errstate(over="ignore", invalid="ignore"):
+        for _ in range(steps):
+            stretch = incidence.dot(x)
+            force = -incidence.transpose_dot(stiffness * stretch + damping * incidence.dot(v))
+            v += force * dt / mass
+            x += v * dt
+    # A blow-up that overflowed to NaN counts as unbounded
+    return float(np.nan_to_num(np.abs(x).max(), nan=np.inf))
+
+
+def test_stable_timestep_is_exact_for_a_lone_spring():
+    incidence = IncidenceMatrix(np.array([0]), np.array([1]), 2)
+    mass, stiffness = np.array([2.0, 2.0]), 800.0
+    # Relative mode: omega**2 = k / m + k / m, stable below 2 / omega
+    limit = 2 / np.sqrt(2 * stiffness / 2.0)
+    dt = stable_timestep(mass, np.zeros(2), incidence, stiffness, 0.0, safety=1.0)
+    np.testing.assert_allclose(dt, limit)
+
+    assert _peak_amplitude(incidence, mass, stiffness, 0.0, 0.99 * dt) < 10
+    assert _peak_amplitude(incidence, mass, stiffness, 0.0, 1.05 * dt) > 1e6
+
+
+def test_stable_timestep_is_conservative_for_chains():
+    rng = np.random.default_rng(4)
+    for _ in range(10):
+        incidence, mass, stiffness = _chain(12, rng)
+        damping = rng.uniform(0, 5, len(stiffness))
+        dt = stable_timestep(mass, np.zeros(len(mass)), incidence, stiffness, damping, safety=1.0)
+        assert _peak_amplitude(incidence, mass, stiffness, damping, dt) < 10
+
+
+def test_stable_timestep_without_springs_or_points():
+    incidence = IncidenceMatrix(np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), 3)
+    assert stable_timestep(np.ones(3), np.zeros(3), incidence, np.empty(0), np.empty(0)) == np.inf
+    empty = IncidenceMatrix(np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), 0)
+    assert stable_timestep(np.empty(0), np.empty(0), empty, np.empty(0), np.empty(0)) == np.inf
+
+
+def test_substep_count():
+    assert substep_count(1 / 60, np.inf) == 1
+    assert substep_count(1 / 60, 1 / 30) == 1
+    assert substep_count(1 / 60, 1 / 200) == 4
+    # Exactly at the limit needs no extra step
+    assert substep_count(0.25, 0.125) == 2
+    assert substep_count(1 / 60, 1e-5, max_substeps=16) == 16
+    assert substep_count(1 / 60, 0.0, max_substeps=8) == 8
+    assert substep_count(1 / 60, np.nan, max_substeps=8) == 8
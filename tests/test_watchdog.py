@@ -0,0 +1,41 @@
+import numpy as np
+
+from softbody_simulation.physics import DragRegion, field_to_dict
+from softbody_simulation.scripts.sandbox import Sandbox
+
+
+def _pair(stiffness: float) -> Sandbox:
+    """Two points joined by one spring, stretched 10 past its rest length."""
+    sandbox = Sandbox(1, stiffness, 40, 0)
+    for pos in ((200, 300), (250, 300)):
+        sandbox.handle_right_mouse_click(pos)
+    a, b = sandbox.mass_points
+    b.selected = True
+    sandbox._handle_mass_point_click(a)
+    sandbox.toggle_gravity()
+    return sandbox
+
+
+def test_a_blow_up_is_rolled_back_with_more_substeps():
+    # Unstable at the 16 substeps the step is capped at, stable at twice that
+    sandbox = _pair(3e6)
+    for _ in range(120):
+        sandbox._step()
+
+    assert sandbox.watchdog.divergences == 1
+    assert sandbox.watchdog.boost == 2 and sandbox.substeps == 32
+    assert not sandbox.paused and sandbox.tick == 120
+    assert np.isfinite(sandbox.particles.state[:2]).all()
+    assert sandbox._energy() < 2 * 0.5 * 3e6 * 10**2
+
+
+def test_wind_work_is_not_a_blow_up():
+    sandbox = _pair(100)
+    wind = DragRegion((0, 0), (2400, 1800), rate=5, flow=(2000, 0))
+    sandbox.add_force_field(field_to_dict(wind))
+    for _ in range(20):
+        sandbox._step()
+
+    assert sandbox.watchdog.divergences == 0
+    # Far more energy than the watchdog tolerates from nothing
+    assert sandbox._energy() > sandbox.watchdog.energy_floor * 2